@@ -3,15 +3,30 @@
 Master script to extract all seven tables from 'FY2022 Asset Reports.pdf'
 into separate CSV files by combining the logic of all individual parsers.
 """
+import os
 import re
 import csv
-import subprocess
+import time
 import pandas as pd
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from functools import partial
 from pathlib import Path
-from typing import List, Dict, Optional, Tuple, Set
+from typing import Callable, List, Dict, Optional, Tuple, Set
 from datetime import datetime, timedelta
 import numpy as np # Added for numpy functions used in parser 3
 
+import line_matcher
+import num_tokens
+import page_index
+import page_manifest
+import pdftext_cache
+import text_document
+from text_document import TextDocument, TextSource
+
+# Part of every page-manifest key: editing this script or the line store invalidates saved rows
+CODE_VERSION = page_manifest.source_version(Path(__file__), Path(text_document.__file__),
+                                            Path(line_matcher.__file__), Path(num_tokens.__file__))
+
 # ============================= CONFIGURATION =============================
 from pathlib import Path
 
@@ -41,6 +56,36 @@ RE_MONTH_WORD = re.compile(
     r"(Assets|EGMs)\s+by\s+Region,?\s*Service\s+for month of\s+([A-Za-z]+\s+\d{4})",
     re.IGNORECASE,
 )
+
+# Section boundaries shared by the parsers and the single-pass dispatcher
+RE_FO_NEXT_SECTION = re.compile(r"^\s*(Installed\s+Assets|EGMs\s+by\s+Region|REGION\s+FONUM|Years\s+in\s+Storage|Site\s+Operational\s+Status)\b", re.I)
+RE_DETAIL_HEADER = re.compile(
+    r"^\s*REGION\s+FONUM\s+FOSHORT\s+Loc\s+LNAME\s+Asset\s+Class\s+Desc\s+Type\s+"
+    r"Aquire\s+Effective\s+SerialNum\s+PLACE\s+Age\s+Years\s+in\s+Storage\s+Months",
+    re.I
+)
+RE_DETAIL_STOP = re.compile(r"^\s*Loc\s+PLACE\s+REGION\s+SVC", re.I)
+RE_SITE_HDR = re.compile(
+    r"^\s*Loc\s+LNAME\s+PLACE\s+Open\s+Closed\s+KSI\s+CmtyNum\s+SVC\s+FONUM\s+FOSHORT\s+FOM\s+EMAIL\s+REGNUM\s+Region\s+",
+    re.I,
+)
+# Titles that end the Site Operational Status block, compiled into one matcher (line_matcher.py)
+SITE_END_MARKERS = line_matcher.LineMatcher(patterns={
+    "region_title":     re.compile(r"^EGMs\s+by\s+Region", re.I),
+    "fo_title":         re.compile(r"^EGMs\s+by\s+Field\s+Office", re.I),
+    "assets_title":     re.compile(r"^Installed\s+Assets\s+by\s+Location", re.I),
+    "details_header":   re.compile(r"^REGION\s+FONUM\s+FOSHORT", re.I),
+    "storage_title":    re.compile(r"^EGM[s]?\s+Years\s+in\s+Storage", re.I),
+    "by_age":           re.compile(r"\bby\s+Age\b", re.I),
+})
+
+# Installed Assets block lines, read by parse_installed_assets and by the dispatcher's "assets_stop" marker
+ASSET_REGIONS = ("Europe", "Japan", "Korea")
+ASSET_SERVICES = ("Army", "Navy", "Air Force", "Marine Corps", "Marine", "Airforce")
+ASSETS_NEXT_SECTIONS = ("EGMs by Region", "Installed Assets by Location", "Years in Storage",
+                        "Site Operational Status")
+RE_SUBTOTAL_COUNT = re.compile(r"\d+|-")
+
 MONTH_MAP = {
     'January': 'Jan', 'February': 'Feb', 'March': 'Mar', 'April': 'Apr',
     'May': 'May', 'June': 'Jun', 'July': 'Jul', 'August': 'Aug', 'September': 'Sep',
@@ -56,17 +101,63 @@ MONTH_NAME_TO_ABBR = { # Added for Parser 3
 
 
 # =============================== COMMON/SHARED HELPERS ==============================
-def load_text_from_pdf(pdf_path: Path) -> str:
-    """Run pdftotext in layout mode and return the normalized text."""
+def normalize_spaces(line: str) -> str:
+    return re.sub(r"\s+", " ", line.strip())
+
+
+def split_subtotal_line(norm: str) -> Optional[Tuple[str, str]]:
+    """(group, counts) of an Installed Assets subtotal line: "<group> Subtotal <counts>", or group words then only counts."""
+    if "Subtotal" in norm:
+        parts = norm.split("Subtotal")
+        return parts[0].strip(), parts[1].strip()
+
+    # Heuristic: group name (non-numeric tokens) followed by numbers
+    group_tokens = []
+    rest_tokens = []
+    for t in norm.split():
+        if RE_SUBTOTAL_COUNT.fullmatch(t):
+            rest_tokens.append(t)
+        else:
+            if rest_tokens:  # Found a non-numeric token AFTER the first number
+                return None
+            group_tokens.append(t)
+
+    if not group_tokens or not rest_tokens:
+        return None
+    return " ".join(group_tokens), " ".join(rest_tokens)
+
+
+def assets_line_kind(norm: str) -> Optional[str]:
+    """
+    How parse_assets_block reads one normalized Installed Assets line, in its order of tests:
+    "region" header, "armp" total, "skip" (Converted Subtotal / Location Count), "subtotal",
+    "site" (names a service), "stop" (a next-section title, ends the block after ARMP Total), else None.
+    """
+    if "FO #" in norm and any(norm.startswith(region + " ") for region in ASSET_REGIONS):
+        return "region"
+    if norm.startswith("ARMP Total"):
+        return "armp"
+    if ("Converted" in norm and "Subtotal" in norm) or "Location Count" in norm:
+        return "skip"
+    if split_subtotal_line(norm) is not None:
+        return "subtotal"
+    if any(svc in norm for svc in ASSET_SERVICES):
+        return "site"
+    if any(title in norm for title in ASSETS_NEXT_SECTIONS):
+        return "stop"
+    return None
+
+
+def load_text_from_pdf(pdf_path: Path, workers: Optional[int] = None) -> str:
+    """Run pdftotext in layout mode and return the normalized text.
+
+    `workers` > 1 converts cache misses as parallel page-range shards
+    (None → PDFTEXT_WORKERS, 0 → one per CPU core).
+    """
     print(f"🔍 Extracting text from {pdf_path.name}...")
     try:
-        # Use an in-memory output for the full text extraction
-        raw = subprocess.check_output(
-            ["pdftotext", "-layout", str(pdf_path), "-"],
-            universal_newlines=True,
-            errors="ignore",
-            stderr=subprocess.STDOUT
-        )
+        # Pages come from the shared on-disk cache; pdftotext only runs on a miss
+        raw = pdftext_cache.extract_text(pdf_path, mode="layout", workers=workers)
         return raw.replace("\r", "")
     except FileNotFoundError:
         print("🚨 Error: 'pdftotext' command not found. Ensure Poppler is installed and on your PATH.")
@@ -75,9 +166,9 @@ def load_text_from_pdf(pdf_path: Path) -> str:
         print(f"🚨 Error during PDF text extraction: {e}")
         raise
 
-def load_pages_from_pdf(pdf_path: str) -> List[str]:
+def load_pages_from_pdf(pdf_path: str, workers: Optional[int] = None) -> List[str]:
     """Extract text from PDF, split by form-feed character to get pages."""
-    text = subprocess.check_output(['pdftotext', '-layout', pdf_path, '-'], text=True)
+    text = pdftext_cache.extract_text(Path(pdf_path), mode="layout", workers=workers)
     return text.split('\f')
 
 def fmt_month(mon: str, yr: str) -> str:
@@ -102,27 +193,6 @@ def month_labels_from_report_date(s: str) -> Tuple[Optional[str], Optional[str]]
     except Exception:
         return None, None
 
-def detect_month_map(pages: List[str]) -> Dict[int, str]:
-    """Detects the month for each page, skipping duplicates/repeats."""
-    month_start_pages: List[tuple[int, str]] = []
-    seen_months: List[str] = []
-    for i, page in enumerate(pages, start=1):
-        m = RE_MONTH_WORD.search(page)
-        if m:
-            month = m.group(2).strip()
-            if month not in seen_months:
-                month_start_pages.append((i, month))
-                seen_months.append(month)
-    
-    month_map: Dict[int, str] = {}
-    last_end = len(pages)
-    for idx, (start, month) in reversed(list(enumerate(month_start_pages))):
-        end = last_end
-        last_end = start - 1
-        for p in range(start, end + 1):
-            month_map[p] = month
-    return month_map
-
 
 # =============================== PARSER 1: EGMs by Region, Service ===============================
 def parse_region_line(region, tail):
@@ -149,7 +219,7 @@ def parse_region_line(region, tail):
         "Airforce": air, "Total": total, "Percent": percent
     }
 
-def extract_egms_by_region_service(text: str) -> pd.DataFrame:
+def extract_egms_by_region_service(text: TextSource) -> pd.DataFrame:
     print("Parsing [1/7] 'EGMs by Region, Service'...")
     RE_T1_HDR = re.compile(r"^EGMs\s+by\s+Region,\s*Service", re.I)
     RE_T2_HDR = re.compile(r"^EGMs\s+by\s+Field\s+Office", re.I)
@@ -159,7 +229,7 @@ def extract_egms_by_region_service(text: str) -> pd.DataFrame:
         m = RE_MONTH.search(line)
         return fmt_month(m.group(1), m.group(2)) if m else None
 
-    lines = [ln.strip() for ln in text.splitlines() if ln.strip()]
+    lines = [ln.strip() for ln in text_document.as_lines(text) if ln.strip()]
     rows = []
     block = []
     current_month = ""
@@ -224,7 +294,7 @@ def extract_egms_by_region_service(text: str) -> pd.DataFrame:
 
 
 # =============================== PARSER 2: EGMs by Field Office ===============================
-def parse_egm_by_field_office(all_text: str) -> pd.DataFrame:
+def parse_egm_by_field_office(all_text: TextSource) -> pd.DataFrame:
     print("Parsing [2/7] 'EGMs by Field Office'...")
     RE_EGM_FO_HDR = re.compile(r"^\s*EGMs\s+by\s+Field\s+Office\b", re.I)
     RE_MONTH_LINE = re.compile(r"for\s+month\s+of\s+([A-Za-z]+)\s+(\d{4})", re.I)
@@ -235,9 +305,8 @@ def parse_egm_by_field_office(all_text: str) -> pd.DataFrame:
     RE_REGION_TOTAL = re.compile(r"^\s*(Europe|Japan|Korea)\s+Total\s+(\d{1,5})\s+(\d{1,5})\s+(\d{1,5})\s+(\d{1,5})\s+(\d{1,5})\s*$", re.I)
     RE_PCT_LINE = re.compile(r"^\s*(\d{1,3})%\s+(\d{1,3})%\s+(\d{1,3})%\s+(\d{1,3})%\s+(\d{1,3})%\s*$")
     RE_ARMP_TOTAL = re.compile(r"^\s*ARMP\s+Total\s+(\d{1,5})\s+(\d{1,5})\s+(\d{1,5})\s+(\d{1,5})\s+(\d{1,5})\s*$", re.I)
-    RE_NEXT_SECTION = re.compile(r"^\s*(Installed\s+Assets|EGMs\s+by\s+Region|REGION\s+FONUM|Years\s+in\s+Storage|Site\s+Operational\s+Status)\b", re.I)
 
-    lines = all_text.split("\n")
+    lines = text_document.as_lines(all_text, "\n")
     rows = []
     in_section = False
     cur_month = None
@@ -256,7 +325,7 @@ def parse_egm_by_field_office(all_text: str) -> pd.DataFrame:
                     break
             if found_month:
                 if found_month in seen_months:
-                    while i < len(lines) and not RE_NEXT_SECTION.search(lines[i]): i += 1
+                    while i < len(lines) and not RE_FO_NEXT_SECTION.search(lines[i]): i += 1
                     continue
                 seen_months.add(found_month)
                 in_section = True
@@ -267,7 +336,7 @@ def parse_egm_by_field_office(all_text: str) -> pd.DataFrame:
                 continue
 
         if in_section:
-            if RE_NEXT_SECTION.search(line):
+            if RE_FO_NEXT_SECTION.search(line):
                 in_section = False
                 cur_month = None
                 i += 1
@@ -333,23 +402,12 @@ def parse_egm_by_field_office(all_text: str) -> pd.DataFrame:
 
 
 # =============================== PARSER 3: Installed Assets by Location, Manufacture ===============================
-def parse_installed_assets(all_text: str, pdf_path: Path) -> pd.DataFrame:
+def parse_installed_assets(all_text: TextSource, pdf_path: Path) -> pd.DataFrame:
     print("Parsing [3/7] 'Installed Assets by Location, Manufacture'...")
     
     # -------------------------- Helpers ---------------------
 
-    def normalize_spaces(line: str) -> str:
-        return re.sub(r"\s+", " ", line.strip())
-
-    def parse_int_token(tok: str) -> Optional[int]:
-        tok = tok.strip()
-        if tok in ("-", "--", ""):
-            return None
-        if re.fullmatch(r"\d+", tok):
-            return int(tok)
-        if re.fullmatch(r"\d+-", tok):
-            return int(tok[:-1])
-        return None
+    parse_int_token = num_tokens.parse_int_token   # memoized: the same counts repeat on every page
 
     def month_in_range(month_name: str, year: int) -> bool:
         month_order = {
@@ -436,30 +494,11 @@ def parse_installed_assets(all_text: str, pdf_path: Path) -> pd.DataFrame:
     def parse_subtotal_row(line: str, region: str, month_label: str) -> Optional[dict]:
         norm = normalize_spaces(line)
 
-        # 1. Simple 'Subtotal' marker
-        if "Subtotal" in norm:
-            parts = norm.split("Subtotal")
-            group = parts[0].strip()
-            rest = parts[1].strip()
-        # 2. Heuristic: group name (non-numeric tokens) followed by numbers
-        else:
-            tokens = norm.split()
-            group_tokens = []
-            rest_tokens = []
-
-            for t in tokens:
-                if re.fullmatch(r"\d+|-", t):
-                    rest_tokens.append(t)
-                else:
-                    if rest_tokens: # Found a non-numeric token AFTER the first number
-                        return None
-                    group_tokens.append(t)
-
-            if not group_tokens or not rest_tokens:
-                return None
-
-            group = " ".join(group_tokens)
-            rest = " ".join(rest_tokens)
+        # 'Subtotal' marker, or group name (non-numeric tokens) followed by numbers
+        split = split_subtotal_line(norm)
+        if split is None:
+            return None
+        group, rest = split
 
         nums = [parse_int_token(tok) for tok in rest.split()]
         if len(nums) < 13:
@@ -581,60 +620,48 @@ def parse_installed_assets(all_text: str, pdf_path: Path) -> pd.DataFrame:
 
             if not norm:
                 continue
+            # One classification, shared with the dispatcher's "assets_stop" marker
+            kind = assets_line_kind(norm)
 
             # Region headers
-            if norm.startswith("Europe ") and "FO #" in norm:
-                current_region = "Europe"; continue
-            if norm.startswith("Japan ") and "FO #" in norm:
-                current_region = "Japan"; continue
-            if norm.startswith("Korea ") and "FO #" in norm:
-                current_region = "Korea"; continue
+            if kind == "region":
+                current_region = norm.split()[0]; continue
 
             if current_region is None:
                 continue
 
             # ARMP TOTAL
-            armp = parse_armp_row(norm, month_label)
-            if armp:
-                rows.append(armp)
+            if kind == "armp":
+                rows.append(parse_armp_row(norm, month_label))
                 seen_armp = True
                 continue
 
             # *** SKIP SPECIAL 'Converted / Location Count' LINE ***
-            if "Converted" in norm and "Subtotal" in norm:
-                continue
-            if "Location Count" in norm:
+            if kind == "skip":
                 continue
 
             # Subtotal
-            subtotal = parse_subtotal_row(norm, current_region, month_label)
-            if subtotal:
-                rows.append(subtotal)
+            if kind == "subtotal":
+                rows.append(parse_subtotal_row(norm, current_region, month_label))
                 continue
 
             # Site rows
-            # Check for a Service (Svc) marker to identify a site row
-            if any(s in norm for s in
-                   ["Army", "Navy", "Air Force", "Marine Corps", "Marine", "Airforce"]):
+            # A Service (Svc) marker identifies a site row
+            if kind == "site":
                 site = parse_site_row(norm, current_region, month_label, fo_to_group)
                 if site:
                     rows.append(site)
                 continue
 
             # Stop when we hit the next big section *after* ARMP
-            if seen_armp and (
-                "EGMs by Region" in norm
-                or "Installed Assets by Location" in norm
-                or "Years in Storage" in norm
-                or "Site Operational Status" in norm # Added for completeness
-            ):
+            if seen_armp and kind == "stop":
                 break
 
         return rows, i
 
     # ---------------------- Main Extraction ----------------------
 
-    lines = all_text.splitlines()
+    lines = text_document.as_lines(all_text)
 
     # Need the FO to Group mapping first, which comes from Parser 2's data area
     fo_to_group = build_fo_group_map(lines)
@@ -696,17 +723,11 @@ def parse_installed_assets(all_text: str, pdf_path: Path) -> pd.DataFrame:
 
 
 # =============================== PARSER 4: Asset Details (Installed Assets by Location) ===============================
-def extract_asset_details(all_text: str) -> pd.DataFrame:
+def extract_asset_details(all_text: TextSource) -> pd.DataFrame:
     print("Parsing [4/7] 'Asset Details' ...")
     
     # --- Localized Regex and Helpers (to match user's standalone script exactly) ---
     RE_TITLE = re.compile(r"Installed\s+Assets\s+by\s+Location", re.I)
-    RE_DETAIL_HEADER = re.compile(
-        r"^\s*REGION\s+FONUM\s+FOSHORT\s+Loc\s+LNAME\s+Asset\s+Class\s+Desc\s+Type\s+"
-        r"Aquire\s+Effective\s+SerialNum\s+PLACE\s+Age\s+Years\s+in\s+Storage\s+Months",
-        re.I
-    )
-    RE_STOP = re.compile(r"^\s*Loc\s+PLACE\s+REGION\s+SVC", re.I)
     TYPE_RE = re.compile(r"^\d{3,5}$")
     DATE_SERIAL_RE = re.compile(r"^(\d{1,2}/\d{1,2}/\d{4})(?:\s+(.*))?$")
     
@@ -736,7 +757,7 @@ def extract_asset_details(all_text: str) -> pd.DataFrame:
         return tok
     # --- End Localized Helpers ---
 
-    lines = all_text.splitlines()
+    lines = text_document.as_lines(all_text)
     rows = []
     encountered_months = set()
     i = 0
@@ -766,7 +787,7 @@ def extract_asset_details(all_text: str) -> pd.DataFrame:
 
             # avoid duplicate month blocks
             if month_disp in encountered_months:
-                while j < len(lines) and not RE_STOP.search(lines[j]):
+                while j < len(lines) and not RE_DETAIL_STOP.search(lines[j]):
                     j += 1
                 i = j
                 continue
@@ -774,7 +795,7 @@ def extract_asset_details(all_text: str) -> pd.DataFrame:
             encountered_months.add(month_disp)
 
             # ------------------ ROW PARSING ------------------
-            while j < len(lines) and not RE_STOP.search(lines[j]):
+            while j < len(lines) and not RE_DETAIL_STOP.search(lines[j]):
                 raw = lines[j].strip()
                 j += 1
                 if not raw:
@@ -905,51 +926,50 @@ def extract_asset_details(all_text: str) -> pd.DataFrame:
     return pd.DataFrame(rows, columns=header)
 
 # =============================== PARSER 5: Years in Storage (EGMs Only) ===============================
-def extract_years_in_storage(pdf_path: Path) -> pd.DataFrame:
+def extract_years_in_storage(pdf_path: Path, document: Optional[TextSource] = None,
+                             index: Optional[List[dict]] = None,
+                             workers: Optional[int] = None,
+                             manifest: Optional[Path] = None) -> pd.DataFrame:
+    """
+    Grid pages and their months come from the page index (page_index.py), so
+    only the "Years in Storage (EGMs Only)" pages are read and parsed. Their
+    layout text is taken from `document` (the shared TextDocument, or a layout
+    text string) when the caller already holds it, otherwise straight from the
+    pdftext cache. With `manifest` (the output CSV path), pages unchanged since
+    the last run are not parsed again (page_manifest.py).
+    """
     print("Parsing [5/7] 'Years in Storage (EGMs Only)'...")
-    
-    def total_pages(pdf_path: Path) -> int:
-        try:
-            info = subprocess.check_output(["pdfinfo", str(pdf_path)]).decode()
-            for line in info.splitlines():
-                if line.strip().startswith("Pages:"):
-                    return int(line.split(":")[1])
-        except FileNotFoundError:
-            print("🚨 Warning: 'pdfinfo' command not found. Cannot determine total pages. Assuming 100.")
-            return 100
-        return 0
 
-    def run_pdftotext(pdf_path: Path, page: int) -> List[str]:
-        out = subprocess.check_output(
-            ["pdftotext", "-f", str(page), "-l", str(page), "-layout", str(pdf_path), "-"]
-        )
-        return out.decode("utf-8", errors="ignore").splitlines()
+    if isinstance(document, str):
+        document = TextDocument(document)
+    if index is None:
+        index = page_index.load_index(pdf_path, pages=document.pages() if document else None, workers=workers)
+
+    def page_text(page: int) -> str:
+        if document is not None:
+            return document.page(page)
+        return pdftext_cache.extract_pages(pdf_path, "layout", first=page, last=page, workers=workers)[0]
+
+    def page_lines(page: int) -> List[str]:
+        # Same lines the old per-page `pdftotext -f p -l p -layout` call produced
+        return (page_text(page) + "\f").splitlines()
 
-    def find_grid_pages_with_months(pdf_path: Path):
-        n = total_pages(pdf_path)
-        month_pattern = RE_MONTH_WORD
-        current_month = None
+    def find_grid_pages_with_months():
         seen_months = set()
         result = []
-        for p in range(1, n + 1):
-            txt = subprocess.check_output(
-                ["pdftotext", "-f", str(p), "-l", str(p), str(pdf_path), "-"]
-            ).decode(errors="ignore")
-            m = month_pattern.search(txt)
-            if m:
-                month_full_name = m.group(2).strip()
-                m_parts = re.search(r"([A-Za-z]+)\s+(\d{4})", month_full_name)
-                if m_parts: current_month = fmt_month(m_parts.group(1), m_parts.group(2))
-            
-            if "Years in Storage (EGMs Only)" in txt:
-                if not current_month: continue
-                if current_month in seen_months: continue
-                seen_months.add(current_month)
-                result.append((p, current_month))
+        for entry in index:
+            if "years_in_storage" not in entry["headers"]:
+                continue
+            m_parts = re.search(r"([A-Za-z]+)\s+(\d{4})", entry["report_month"] or "")
+            if not m_parts: continue
+            current_month = fmt_month(m_parts.group(1), m_parts.group(2))
+            if current_month in seen_months: continue
+            seen_months.add(current_month)
+            result.append((entry["page"], current_month))
         return result
 
-    def parse_grid_page(pdf_path: Path, page: int):
-        lines = run_pdftotext(pdf_path, page)
+    def parse_grid_page(page: int):
+        lines = page_lines(page)
         header_idx = None
         for i, line in enumerate(lines):
             if "Age" in line and "by Age" in line:
@@ -1029,14 +1049,13 @@ def extract_years_in_storage(pdf_path: Path) -> pd.DataFrame:
 
         return age_rows, totals_by, mini_header, mini_values
 
-    pages_with_months = find_grid_pages_with_months(pdf_path)
-    rows = []
-    for page, month in pages_with_months:
+    def grid_rows(page: int, month: str) -> List[List[str]]:
+        rows = []
         try:
-            age_rows, totals_by, mini_header, mini_values = parse_grid_page(pdf_path, page)
+            age_rows, totals_by, mini_header, mini_values = parse_grid_page(page)
         except ValueError as e:
             print(f"Skipping page {page}: {e}")
-            continue
+            return []
 
         for age, counts, total in age_rows:
             rows.append([str(age)] + [str(x) for x in counts] + [str(total)] + [month])
@@ -1054,27 +1073,22 @@ def extract_years_in_storage(pdf_path: Path) -> pd.DataFrame:
         tot12 = mini_values[-1] if mini_values else 0
         pad2 = [""] * (15 - len(vals12))
         rows.append(["Mini_Values"] + [str(x) for x in vals12] + pad2 + [str(tot12), month])
+        return rows
+
+    # One unit per grid page: rows of pages unchanged since the last run are carried over
+    units = [page_manifest.Unit(page_manifest.unit_key(CODE_VERSION, "years_in_storage", month, page_text(page)),
+                                (page,), partial(grid_rows, page, month))
+             for page, month in find_grid_pages_with_months()]
+    rows = [row for page_rows in page_manifest.run_units(manifest, units) for row in page_rows]
 
     headers = ["EGM Age"] + [str(i) for i in range(15)] + ["Total by Age", "Month"]
     return pd.DataFrame(rows, columns=headers)
 
 
 # =============================== PARSER 6: Site Operational Status ===============================
-def extract_site_operational_status(all_text: str) -> pd.DataFrame:
+def extract_site_operational_status(all_text: TextSource) -> pd.DataFrame:
     print("Parsing [6/7] 'Site Operational Status'...")
     RE_MONTH = re.compile(r"for\s+month\s+of\s+([A-Za-z]+)\s+(\d{4})", re.I)
-    RE_SITE_HDR = re.compile(
-        r"^\s*Loc\s+LNAME\s+PLACE\s+Open\s+Closed\s+KSI\s+CmtyNum\s+SVC\s+FONUM\s+FOSHORT\s+FOM\s+EMAIL\s+REGNUM\s+Region\s+",
-        re.I,
-    )
-    END_MARKERS = [
-        re.compile(r"^EGMs\s+by\s+Region", re.I),
-        re.compile(r"^EGMs\s+by\s+Field\s+Office", re.I),
-        re.compile(r"^Installed\s+Assets\s+by\s+Location", re.I),
-        re.compile(r"^REGION\s+FONUM\s+FOSHORT", re.I),
-        re.compile(r"^EGM[s]?\s+Years\s+in\s+Storage", re.I),
-        re.compile(r"\bby\s+Age\b", re.I),
-    ]
     SPLIT2 = re.compile(r"\s{2,}")
     LOC_LETTER = re.compile(r"^(\d+)\s+([A-Za-z])$")
     LOC_VALID = re.compile(r"^\d{3,5}(?:\s*[A-Za-z])?$")
@@ -1094,7 +1108,7 @@ def extract_site_operational_status(all_text: str) -> pd.DataFrame:
         m_abbr = mon_abbr_map.get(m.strip().lower(), m.strip()[:3].title())
         return f"{m_abbr}-{y}"
     def is_block_end(line: str) -> bool:
-        return any(p.search(line.strip()) for p in END_MARKERS)
+        return SITE_END_MARKERS.search(line.strip())
     def compute_slices_from_header(hline: str):
         tokens = [t for t in SPLIT2.split(hline.strip()) if t]
         starts, pos = [], 0
@@ -1166,7 +1180,7 @@ def extract_site_operational_status(all_text: str) -> pd.DataFrame:
             (closed_i is not None and not fields_list[closed_i])
         )
 
-    lines = all_text.splitlines()
+    lines = text_document.as_lines(all_text)
     rows = []
     header, ranges = None, []
     cur_month = None
@@ -1355,77 +1369,323 @@ def parse_floor_details_page(page_text: str) -> List[Dict[str, str]]:
             if parsed: data.append(parsed)
     return data
 
-def extract_floor_asset_details(pdf_path: str) -> pd.DataFrame:
+def extract_floor_asset_details(pdf_path: str, workers: Optional[int] = None,
+                                index: Optional[List[dict]] = None,
+                                document: Optional[TextDocument] = None,
+                                manifest: Optional[Path] = None) -> pd.DataFrame:
     print("Parsing [7/7] 'Floor Asset Details'...")
-    pages = load_pages_from_pdf(pdf_path)
-    month_map = detect_month_map(pages)
+    if document is None:
+        document = TextDocument.from_pdf(Path(pdf_path), workers=workers)
+    if index is None:
+        index = page_index.load_index(Path(pdf_path), pages=document.pages())
+    month_map = page_index.month_map(index)
+
+    def floor_rows(page_text: str, month_tag_val: str) -> List[Dict[str, str]]:
+        recs = parse_floor_details_page(page_text)
+        for rec in recs:
+            rec['Month'] = month_tag_val
+        return recs
 
-    floor_data: List[Dict[str, str]] = []
-    for p_num, page_text in enumerate(pages, start=1):
+    units = []
+    # Only pages that hold floor rows; every other page would parse to nothing
+    for p_num in page_index.section_pages(index, "floor_rows", with_month_pages=False, headers_only=True):
+        page_text = document.page(p_num)
         month_full = month_map.get(p_num)
         if not month_full: continue
         
         m = re.match(r"([A-Za-z]+)\s+(\d{4})", month_full)
         month_tag_val = fmt_month(m.group(1), m.group(2)) if m else month_full
 
-        for rec in parse_floor_details_page(page_text):
-            rec['Month'] = month_tag_val
-            floor_data.append(rec)
+        # One unit per page: with a manifest, pages unchanged since the last run are carried over
+        units.append(page_manifest.Unit(page_manifest.unit_key(CODE_VERSION, "floor_details", month_tag_val, page_text),
+                                        (p_num,), partial(floor_rows, page_text, month_tag_val)))
 
+    floor_data = [rec for page_recs in page_manifest.run_units(manifest, units) for rec in page_recs]
     df = pd.DataFrame(floor_data)
     if not df.empty:
         df = df.drop_duplicates(subset=['Loc', 'Asset', 'SerialNum', 'Month'])
     return df
 
+# =============================== SINGLE-PASS DISPATCHER ===============================
+# Prefilter: every marker below contains one of these words, so only these lines are inspected.
+# It runs case-sensitively on a lowercased copy of the text (re.I is several times slower).
+MARKER_WORDS = r"month|region|field|installed|storage|operational|fo\s+#|armp|by\s+age"
+RE_MARKER_LINE = re.compile(MARKER_WORDS)
+
+# Line markers, each testing a line the way the owning parser does
+MARKERS: Dict[str, Callable[[str], object]] = {
+    "month":          RE_MONTH.search,
+    "region_title":   re.compile(r"^\s*EGMs\s+by\s+Region,\s*Service", re.I).search,
+    "fo_title":       re.compile(r"^\s*EGMs\s+by\s+Field\s+Office", re.I).search,
+    "fo_next":        RE_FO_NEXT_SECTION.search,
+    "fo_map_title":   re.compile(r"EGMs\s+by\s+Field\s+Office").search,
+    "fo_map_end":     re.compile(r"^(?!\s*(?:Europe|Japan|Korea)\s.*ACM).*Installed\s+Assets\s+by\s+Location").search,
+    "assets_title":   re.compile(r"Installed\s+Assets\s+by\s+Location,\s*Manufacture").search,
+    "assets_region":  re.compile(r"^\s*(?:Europe|Japan|Korea)\s.*FO\s+#").search,
+    "assets_armp":    re.compile(r"^\s*ARMP\s+Total").search,
+    # A next-section title that parse_assets_block stops at, by the same classification it uses
+    "assets_stop":    lambda line: assets_line_kind(normalize_spaces(line)) == "stop",
+    "details_title":  re.compile(r"Installed\s+Assets\s+by\s+Location", re.I).search,
+    "details_header": RE_DETAIL_HEADER.search,
+    "details_stop":   RE_DETAIL_STOP.search,
+    "site_header":    RE_SITE_HDR.match,
+    "site_end":       lambda line: SITE_END_MARKERS.search(line.strip()),
+}
+
+# Parser → its blocks: (start marker, markers that must follow in order, end marker,
+# lines always kept after a start because the parser looks that far ahead)
+PARSER_ROUTES: Dict[str, List[Tuple[str, Tuple[str, ...], str, int]]] = {
+    "region_service":   [("region_title", (), "fo_title", 0)],
+    "field_office":     [("fo_title", (), "fo_next", 6)],
+    "installed_assets": [("fo_map_title", (), "fo_map_end", 0),  # FO → group map
+                         ("assets_title", ("assets_region", "assets_armp"), "assets_stop", 0)],
+    "asset_details":    [("details_title", ("details_header",), "details_stop", 200)],
+    "site_status":      [("site_header", (), "site_end", 0)],
+}
+
+# Parsers that pick up the report month from any line
+MONTH_CONTEXT = ("region_service", "installed_assets", "site_status")
+
+
+def _after_lines(text: str, pos: int, n: int) -> int:
+    """Offset just past the n lines that start at `pos`."""
+    for _ in range(n):
+        nl = text.find("\n", pos)
+        if nl == -1:
+            return len(text)
+        pos = nl + 1
+    return pos
+
+
+def dispatch_sections(document: TextDocument) -> Dict[str, text_document.TextSection]:
+    """
+    Route the report's lines to the line-based parsers in one scan.
+
+    RE_MARKER_LINE walks the whole text once and only the lines it hits are
+    tested against MARKERS. A small state machine per parser block opens at
+    the block's start marker, waits for the markers the parser needs before it
+    can stop, and closes at the end marker (that line included). Blocks run
+    to the end of the report if they never close, exactly as the parsers
+    would read on. Each parser gets its block lines plus the month lines it
+    tracks, as one TextSection of character spans; no text is copied.
+    Lines left out are ones the parser would have skipped anyway.
+    """
+    text = document.text
+    scan, prefilter = text.lower(), RE_MARKER_LINE
+    if len(scan) != len(text):  # a few non-ASCII letters change length when lowercased
+        scan, prefilter = text, re.compile(MARKER_WORDS, re.I)
+    spans: Dict[str, List[Tuple[int, int]]] = {parser: [] for parser in PARSER_ROUTES}
+    routes = [(parser, *route) for parser, blocks in PARSER_ROUTES.items() for route in blocks]
+    opened: List[Optional[int]] = [None] * len(routes)  # start offset of each open block
+    stage = [0] * len(routes)
+    keep_until = [0] * len(routes)
+
+    pos = 0
+    while True:
+        hit = prefilter.search(scan, pos)
+        if not hit:
+            break
+        start = text.rfind("\n", 0, hit.start()) + 1
+        end = _after_lines(text, start, 1)
+        pos = end
+        line = text[start:end].rstrip("\n")
+        found = {name for name, test in MARKERS.items() if test(line)}
+        if not found:
+            continue
+
+        if "month" in found:
+            for parser in MONTH_CONTEXT:
+                spans[parser].append((start, end))
+        for k, (parser, first, stages, last, keep) in enumerate(routes):
+            if opened[k] is not None:
+                if stage[k] < len(stages):
+                    if stages[stage[k]] in found:
+                        stage[k] += 1
+                elif last in found:
+                    spans[parser].append((opened[k], max(end, keep_until[k])))
+                    opened[k] = None
+            if first in found:
+                if opened[k] is None:
+                    opened[k], stage[k] = start, 0
+                keep_until[k] = max(keep_until[k], _after_lines(text, end, keep))
+
+    for k, (parser, *_) in enumerate(routes):
+        if opened[k] is not None:
+            spans[parser].append((opened[k], len(text)))
+    return {parser: document.span_section(parser_spans) for parser, parser_spans in spans.items()}
+
+
 # =============================== MASTER EXECUTION ===============================
-def run_all_parsers(pdf_path: Path):
+# Parser processes for run_all_parsers: 1 runs serially, 0 or less uses one process per CPU core
+DEFAULT_JOBS = int(os.environ.get("ASSET_PARSER_JOBS", "1"))
+
+
+def resolve_jobs(jobs: Optional[int] = None) -> int:
+    """None → ASSET_PARSER_JOBS default; 0 or less → one process per CPU core."""
+    if jobs is None:
+        jobs = DEFAULT_JOBS
+    if jobs <= 0:
+        jobs = os.cpu_count() or 1
+    return jobs
+
+
+def prepare_report(pdf_path: Path, workers: Optional[int] = None
+                   ) -> Tuple[TextDocument, List[dict], Dict[str, text_document.TextSection]]:
+    """Load the text once, then return (document, page index, sections routed to each parser)."""
+    # The page index (saved next to the PDF) serves the page-based parsers
+    document = TextDocument(load_text_from_pdf(pdf_path, workers=workers))
+    index = page_index.load_index(pdf_path, pages=document.pages())
+
+    # One scan routes every line to the parser that owns its section
+    return document, index, dispatch_sections(document)
+
+
+def parser_jobs(pdf_path: Path, document: TextDocument, index: List[dict],
+                routed: Dict[str, text_document.TextSection],
+                workers: Optional[int] = None,
+                manifest_dir: Optional[Path] = None) -> Dict[Path, Callable[[], pd.DataFrame]]:
+    """
+    Output CSV path → call of the parser that fills it, in report order. The parsers are independent.
+    With `manifest_dir`, each parser keeps a page manifest there and only re-parses what changed.
+    """
+    def manifest(out_path: Path) -> Optional[Path]:
+        return manifest_dir / out_path.name if manifest_dir is not None else None
+
+    def section_job(out_path: Path, name: str, parse: Callable[[], pd.DataFrame]) -> Callable[[], pd.DataFrame]:
+        # Month and de-duplication state runs through the whole section, so the routed section is
+        # one unit: the parser only runs again when one of its lines changed
+        def job() -> pd.DataFrame:
+            section = routed[name]
+            pages = sorted({p for s, e in section.runs if e > s
+                            for p in range(document.page_of_offset(s), document.page_of_offset(e - 1) + 1)})
+            unit = page_manifest.Unit(page_manifest.unit_key(CODE_VERSION, name, section.text), tuple(pages), parse)
+            return page_manifest.run_units(manifest(out_path), [unit])[0]
+        return job
+
+    return {
+        # [1] EGMs by Region, Service
+        OUT_CSV_REGION_SERVICE: section_job(OUT_CSV_REGION_SERVICE, "region_service",
+                                            lambda: extract_egms_by_region_service(routed["region_service"])),
+
+        # [2] EGMs by Field Office
+        OUT_CSV_FIELD_OFFICE: section_job(OUT_CSV_FIELD_OFFICE, "field_office",
+                                          lambda: parse_egm_by_field_office(routed["field_office"])),
+
+        # [3] Installed Assets by Location, Manufacture (needs the Field Office lines for the FO → group map)
+        OUT_CSV_INSTALLED_MANUFACTURER: section_job(OUT_CSV_INSTALLED_MANUFACTURER, "installed_assets",
+                                                    lambda: parse_installed_assets(routed["installed_assets"], pdf_path)),
+
+        # [4] Asset Details (Installed Assets by Location) - Uses the corrected logic
+        OUT_CSV_ASSET_DETAILS: section_job(OUT_CSV_ASSET_DETAILS, "asset_details",
+                                           lambda: extract_asset_details(routed["asset_details"])),
+
+        # [5] Years in Storage (EGMs Only) (grid pages and months from the index)
+        OUT_CSV_YEARS_STORAGE: lambda: extract_years_in_storage(pdf_path, document=document,
+                                                                index=index, workers=workers,
+                                                                manifest=manifest(OUT_CSV_YEARS_STORAGE)),
+
+        # [6] Site Operational Status
+        OUT_CSV_SITE_STATUS: section_job(OUT_CSV_SITE_STATUS, "site_status",
+                                         lambda: extract_site_operational_status(routed["site_status"])),
+
+        # [7] Floor Asset Details (Needs page-by-page mapping)
+        OUT_CSV_FLOOR_ASSET_DETAILS: lambda: extract_floor_asset_details(str(pdf_path), workers=workers,
+                                                                         index=index, document=document,
+                                                                         manifest=manifest(OUT_CSV_FLOOR_ASSET_DETAILS)),
+    }
+
+
+def parse_report(pdf_path: Path, workers: Optional[int] = None,
+                 manifest_dir: Optional[Path] = None) -> Dict[Path, pd.DataFrame]:
+    """
+    Run all seven parsers over one shared TextDocument; returns {output CSV path: DataFrame}.
+    Pass `manifest_dir` to carry over the rows of unchanged pages from the last run there.
+    """
+    jobs = parser_jobs(pdf_path, *prepare_report(pdf_path, workers=workers), workers=workers,
+                       manifest_dir=manifest_dir)
+    return {out_path: job() for out_path, job in jobs.items()}
+
+
+def save_table(out_path: Path, df: pd.DataFrame) -> int:
+    """Write one parser result to its CSV; returns the number of rows saved."""
+    if df.empty:
+        print(f"⚠️  Skipped {out_path.name}: No rows extracted.")
+        return 0
+    df.to_csv(out_path, index=False, encoding="utf-8-sig")
+    print(f"✅ Saved {len(df)} rows → {out_path.name}")
+    return len(df)
+
+
+def timed_job(out_path: Path, job: Callable[[], pd.DataFrame]) -> Tuple[Path, int, float]:
+    """Run one parser and save its CSV straight away; returns (CSV path, rows, parser seconds)."""
+    t0 = time.perf_counter()
+    df = job()
+    seconds = time.perf_counter() - t0
+    return out_path, save_table(out_path, df), seconds
+
+
+# --- Worker processes ---
+# CSV file name → parser call of this worker, built once by _init_worker
+_WORKER_JOBS: Dict[str, Callable[[], pd.DataFrame]] = {}
+
+
+def _init_worker(pdf_path: Path, text: str, index: List[dict], runs: Dict[str, text_document.Runs],
+                 workers: Optional[int], manifest_dir: Optional[Path]) -> None:
+    """Pool initializer: rebuild the shared document and routed sections once per worker."""
+    document = TextDocument(text)
+    routed = {name: document.span_section(spans) for name, spans in runs.items()}
+    jobs = parser_jobs(pdf_path, document, index, routed, workers=workers, manifest_dir=manifest_dir)
+    _WORKER_JOBS.update((out_path.name, job) for out_path, job in jobs.items())
+
+
+def _run_worker_job(out_path: Path) -> Tuple[Path, int, float]:
+    # Looked up by name: the parent's output folder wins over this process's module defaults
+    return timed_job(out_path, _WORKER_JOBS[out_path.name])
+
+
+def run_all_parsers(pdf_path: Path, workers: Optional[int] = None, jobs: Optional[int] = None):
+    """
+    Run the seven parsers and write each CSV as soon as its parser finishes.
+    jobs > 1 runs the parsers in that many worker processes (see ASSET_PARSER_JOBS).
+    A page manifest next to each CSV lets a re-run skip pages that did not change.
+    """
     if not pdf_path.exists():
         print(f"🚨 Error: PDF file not found at {pdf_path}. Cannot proceed.")
         return
 
-    # 1. Load full text once for parsers 1, 2, 3, 4, 6
-    text_content = load_text_from_pdf(pdf_path)
-
-    # 2. Execute Parsers and Save Results
-    results = {}
-    
-    # [1] EGMs by Region, Service
-    results[OUT_CSV_REGION_SERVICE] = extract_egms_by_region_service(text_content)
-    
-    # [2] EGMs by Field Office
-    results[OUT_CSV_FIELD_OFFICE] = parse_egm_by_field_office(text_content)
-    
-    # [3] Installed Assets by Location, Manufacture 
-    results[OUT_CSV_INSTALLED_MANUFACTURER] = parse_installed_assets(text_content, pdf_path)
-    
-    # [4] Asset Details (Installed Assets by Location) - Uses the corrected logic
-    results[OUT_CSV_ASSET_DETAILS] = extract_asset_details(text_content)
-    
-    # [5] Years in Storage (EGMs Only) (Needs to re-read per page for specific detection)
-    results[OUT_CSV_YEARS_STORAGE] = extract_years_in_storage(pdf_path)
-    
-    # [6] Site Operational Status
-    results[OUT_CSV_SITE_STATUS] = extract_site_operational_status(text_content)
-
-    # [7] Floor Asset Details (Needs page-by-page mapping)
-    results[OUT_CSV_FLOOR_ASSET_DETAILS] = extract_floor_asset_details(str(pdf_path))
-    
-    # 3. Save all DataFrames to CSV
+    t0 = time.perf_counter()
+    jobs = resolve_jobs(jobs)
+    document, index, routed = prepare_report(pdf_path, workers=workers)
     OUT_DIR.mkdir(parents=True, exist_ok=True)
-    total_files = 0
-    total_rows = 0
-    
-    print("\n💾 Saving all output CSV files...")
-    for out_path, df in results.items():
-        if df.empty:
-            print(f"⚠️  Skipped {out_path.name}: No rows extracted.")
-            continue
-        
-        df.to_csv(out_path, index=False, encoding="utf-8-sig")
-        total_files += 1
-        total_rows += len(df)
-        print(f"✅ Saved {len(df)} rows → {out_path.name}")
-
+    tables = parser_jobs(pdf_path, document, index, routed, workers=workers, manifest_dir=OUT_DIR)
+
+    # CSV path → (rows, parser seconds)
+    timings: Dict[Path, Tuple[int, float]] = {}
+    if jobs <= 1:
+        for out_path, job in tables.items():
+            _, rows, seconds = timed_job(out_path, job)
+            timings[out_path] = (rows, seconds)
+    else:
+        # Workers get the text and the routed spans once, through the initializer
+        runs = {name: section.runs for name, section in routed.items()}
+        processes = min(jobs, len(tables))
+        print(f"\n⚙️  Running {len(tables)} parsers in {processes} worker processes...")
+        with ProcessPoolExecutor(max_workers=processes, initializer=_init_worker,
+                                 initargs=(pdf_path, document.text, index, runs, workers, OUT_DIR)) as pool:
+            futures = [pool.submit(_run_worker_job, out_path) for out_path in tables]
+            for future in as_completed(futures):
+                out_path, rows, seconds = future.result()
+                timings[out_path] = (rows, seconds)
+    wall = time.perf_counter() - t0
+
+    print("\n⏱️  Parser wall time:")
+    for out_path in tables:
+        rows, seconds = timings[out_path]
+        print(f"   {out_path.name:<55}{rows:>8} rows{seconds:>9.2f}s")
+    print(f"   {'total (load + parse + save)':<55}{'':>13}{wall:>9.2f}s")
+
+    total_files = sum(1 for rows, _ in timings.values() if rows)
+    total_rows = sum(rows for rows, _ in timings.values())
     print(f"\n🎉 ALL DONE. Successfully generated {total_files} CSV files with a total of {total_rows} rows.")
 
 if __name__ == "__main__":
@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+"""
+Multi-year Asset Report driver (FY2020–FY2024).
+
+Each fiscal year is parsed by the extractor written for its layout:
+
+    FY2020, FY2023, FY2024   FY2020+2023+2024_Asset_Report.ipynb   (eight tables)
+    FY2021                   FY2021_Asset_Report_Extraction.ipynb  (COVID-era layout)
+    FY2022                   FY2022_Asset_Report_Extraction.py
+
+The notebooks' parser cells are imported as modules, so they stay the single
+source of their parsing logic. Reports run in parallel worker processes, one
+per PDF with the largest started first, so refreshing every year costs about
+as much as the largest one. Tables land in `CSVs/FY20xx Asset Report Final/`
+under the file names already used there.
+
+    python "PDF Extraction/asset_reports.py"                       # every *Asset Report*.pdf in pdf/
+    python "PDF Extraction/asset_reports.py" a.pdf b.pdf --jobs 2
+    run_asset_reports([Path("pdf/FY2021 Asset Report.pdf")])
+
+The fiscal year is read from the file name (`FY2023 ...`).
+"""
+import argparse
+import json
+import os
+import re
+import sys
+import time
+import types
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+import pandas as pd
+
+# ============================= CONFIGURATION =============================
+HERE = Path(__file__).resolve().parent
+PROJECT_ROOT = HERE.parent
+PDF_DIR = PROJECT_ROOT / "pdf"
+CSV_ROOT = PROJECT_ROOT / "CSVs"
+
+RE_FISCAL_YEAR = re.compile(r"FY\s*(20\d\d)", re.I)
+
+# Fiscal year → layout variant
+YEAR_VARIANTS = {2020: "v2", 2021: "fy2021", 2022: "fy2022", 2023: "v2", 2024: "v2"}
+
+# Notebook of each notebook variant, and the definition that marks the code cell holding its parsers
+NOTEBOOK_CELLS = {
+    "fy2021": (HERE / "FY2021_Asset_Report_Extraction.ipynb", "def extract_region_field_installed("),
+    "v2": (HERE / "FY2020+2023+2024_Asset_Report.ipynb", "def extract_region_field_installed_v2("),
+}
+
+# CSV base names, in the order the notebook extractors return their tables
+NOTEBOOK_TABLES = [
+    "assets_by_region_service",
+    "assets_by_field_office",
+    "installed_assets_location_manufacture",
+    "asset_details",
+    "floor_asset_details",
+    "site_operational_status",
+    "years_in_storage",
+    "floor_summary_details",   # v2 only
+]
+
+# The FY2022 script writes Excel-friendly CSVs; the notebooks write plain UTF-8
+CSV_ENCODING = {"fy2022": "utf-8-sig"}
+
+
+def year_output_dir(year: int, out_root: Optional[Path] = None) -> Path:
+    return Path(out_root or CSV_ROOT) / f"FY{year} Asset Report Final"
+
+
+def report_year(pdf_path: Path) -> int:
+    """Fiscal year named in the PDF's file name."""
+    m = RE_FISCAL_YEAR.search(Path(pdf_path).name)
+    if not m:
+        raise ValueError(f"Cannot tell the fiscal year of {Path(pdf_path).name}; "
+                         f"name it like 'FY2023 Asset Report.pdf'")
+    return int(m.group(1))
+
+
+# ============================ LAYOUT VARIANTS ============================
+# Notebook modules already imported in this process
+_NOTEBOOKS: Dict[str, types.ModuleType] = {}
+
+
+def notebook_cell(path: Path, marker: str) -> str:
+    """Source of the one code cell of the notebook at `path` that contains `marker`."""
+    cells = json.loads(Path(path).read_text(encoding="utf-8"))["cells"]
+    found = ["".join(c["source"]) for c in cells if c["cell_type"] == "code" and marker in "".join(c["source"])]
+    if len(found) != 1:
+        raise RuntimeError(f"{Path(path).name}: expected one code cell containing {marker!r}, found {len(found)}")
+    return found[0]
+
+
+def load_notebook(variant: str) -> types.ModuleType:
+    """Import the parser cell of a variant's notebook as a module (once per process)."""
+    if variant not in _NOTEBOOKS:
+        path, marker = NOTEBOOK_CELLS[variant]
+        source = notebook_cell(path, marker)
+        module = types.ModuleType(f"asset_report_{variant}")
+        module.__file__ = str(path)
+        sys.modules[module.__name__] = module
+        exec(compile(source, str(path), "exec"), module.__dict__)
+        _NOTEBOOKS[variant] = module
+    return _NOTEBOOKS[variant]
+
+
+def fy2021_tables(pdf_path: Path, year: int) -> Dict[str, pd.DataFrame]:
+    nb = load_notebook("fy2021")
+    frames = nb.extract_region_field_installed(str(pdf_path)) + nb.extract_detailed_tables(str(pdf_path))
+    return {f"{name}_FY{year}.csv": df for name, df in zip(NOTEBOOK_TABLES, frames)}
+
+
+def fy2022_tables(pdf_path: Path, year: int) -> Dict[str, pd.DataFrame]:
+    import FY2022_Asset_Report_Extraction as fy22
+    return {out_path.name: df for out_path, df in fy22.parse_report(pdf_path).items()}
+
+
+def v2_tables(pdf_path: Path, year: int) -> Dict[str, pd.DataFrame]:
+    nb = load_notebook("v2")
+    frames = nb.extract_region_field_installed_v2(str(pdf_path)) + nb.extract_detailed_tables(str(pdf_path))
+    return {f"{name}.csv": df for name, df in zip(NOTEBOOK_TABLES, frames)}
+
+
+# Variant → parser returning {CSV file name: DataFrame}
+VARIANT_TABLES: Dict[str, Callable[[Path, int], Dict[str, pd.DataFrame]]] = {
+    "fy2021": fy2021_tables,
+    "fy2022": fy2022_tables,
+    "v2": v2_tables,
+}
+
+
+# =============================== EXECUTION ==============================
+def process_report(pdf_path: Path, out_root: Optional[Path] = None) -> Tuple[int, Dict[str, int], float]:
+    """Parse one report and write its CSVs; returns (year, {CSV name: rows}, seconds)."""
+    t0 = time.perf_counter()
+    year = report_year(pdf_path)
+    variant = YEAR_VARIANTS[year]
+    out_dir = year_output_dir(year, out_root)
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    rows: Dict[str, int] = {}
+    for name, df in VARIANT_TABLES[variant](Path(pdf_path), year).items():
+        if df is None or df.empty:
+            continue  # like the extractors themselves, empty tables are not written
+        df.to_csv(out_dir / name, index=False, encoding=CSV_ENCODING.get(variant, "utf-8"))
+        rows[name] = len(df)
+    return year, rows, time.perf_counter() - t0
+
+
+def resolve_jobs(jobs: Optional[int], reports: int) -> int:
+    """None → one process per report (up to the CPU count); 0 or less → one per CPU core."""
+    cpus = os.cpu_count() or 1
+    if jobs is None:
+        return max(1, min(reports, cpus))
+    return cpus if jobs <= 0 else jobs
+
+
+def run_asset_reports(pdf_paths: Iterable[Path], jobs: Optional[int] = None,
+                      out_root: Optional[Path] = None) -> Dict[int, Dict[str, int]]:
+    """
+    Extract every report in `pdf_paths`, in parallel worker processes.
+    Returns {fiscal year: {CSV name: rows}} for the reports that succeeded.
+    """
+    reports: Dict[int, Path] = {}
+    for pdf_path in map(Path, pdf_paths):
+        if not pdf_path.exists():
+            print(f"🚨 Error: PDF file not found at {pdf_path}. Skipping.")
+            continue
+        year = report_year(pdf_path)
+        if year not in YEAR_VARIANTS:
+            print(f"⚠️  Skipped {pdf_path.name}: no parser for the FY{year} layout.")
+            continue
+        if year in reports:
+            raise ValueError(f"Two reports for FY{year}: {reports[year].name} and {pdf_path.name}")
+        reports[year] = pdf_path
+    if not reports:
+        print("⚠️  No asset reports to process.")
+        return {}
+
+    # Largest first, so the longest report never starts last
+    order = sorted(reports.values(), key=lambda p: p.stat().st_size, reverse=True)
+    jobs = resolve_jobs(jobs, len(order))
+    print(f"\n⚙️  Processing {len(order)} asset reports with {min(jobs, len(order))} worker process(es)...")
+
+    t0 = time.perf_counter()
+    results: Dict[int, Dict[str, int]] = {}
+    timings: Dict[int, float] = {}
+
+    def record(year: int, rows: Dict[str, int], seconds: float) -> None:
+        results[year], timings[year] = rows, seconds
+        print(f"✅ FY{year}: {len(rows)} CSV files, {sum(rows.values())} rows ({seconds:.1f}s)")
+
+    if jobs <= 1:
+        for pdf_path in order:
+            try:
+                record(*process_report(pdf_path, out_root))
+            except Exception as e:
+                print(f"❌ FY{report_year(pdf_path)} failed: {e}")
+    else:
+        with ProcessPoolExecutor(max_workers=min(jobs, len(order))) as pool:
+            futures = {pool.submit(process_report, pdf_path, out_root): pdf_path for pdf_path in order}
+            for future in as_completed(futures):
+                try:
+                    record(*future.result())
+                except Exception as e:
+                    print(f"❌ FY{report_year(futures[future])} failed: {e}")
+    wall = time.perf_counter() - t0
+
+    print("\n⏱️  Report wall time:")
+    for year in sorted(results):
+        print(f"   FY{year}  {sum(results[year].values()):>8} rows{timings[year]:>9.1f}s  "
+              f"→ {year_output_dir(year, out_root)}")
+    print(f"   {'total':<21}{wall:>9.1f}s")
+    return results
+
+
+def default_reports() -> List[Path]:
+    return sorted(PDF_DIR.glob("*Asset Report*.pdf"))
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    ap = argparse.ArgumentParser(description="Extract the FY2020–FY2024 asset reports in parallel.")
+    ap.add_argument("pdfs", nargs="*", type=Path,
+                    help=f"asset report PDFs (default: every *Asset Report*.pdf in {PDF_DIR})")
+    ap.add_argument("--jobs", type=int, default=None,
+                    help="worker processes (default: one per report; 0 = one per CPU core; 1 = serial)")
+    ap.add_argument("--out-root", type=Path, default=None,
+                    help=f"folder holding the 'FY20xx Asset Report Final' folders (default: {CSV_ROOT})")
+    args = ap.parse_args(argv)
+
+    pdfs = args.pdfs or default_reports()
+    results = run_asset_reports(pdfs, jobs=args.jobs, out_root=args.out_root)
+    return 0 if results and len(results) == len(set(pdfs)) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
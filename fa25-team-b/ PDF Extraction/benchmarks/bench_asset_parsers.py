@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Benchmark: FY2022 asset parsers on private text copies vs the shared line store.
+
+Builds a synthetic asset report (see pdf_fixtures.py), warms the pdftext cache
+and page index, then runs all seven parsers twice, each in a fresh process so
+peak memory is measured separately:
+  * strings – every parser gets its own section string and splits it into its
+              own list of lines; the Floor Asset Details parser reloads the
+              whole document as a list of pages
+  * store   – parse_report(): one TextDocument, parsers read offset-based
+              line views of their sections (text_document.py)
+
+Both runs write their CSVs, which must be byte-identical.
+
+Usage:
+    python benchmarks/bench_asset_parsers.py [--pages 1000] [--keep DIR]
+"""
+import argparse
+import contextlib
+import filecmp
+import io
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+HERE = Path(__file__).resolve().parent
+sys.path.insert(0, str(HERE.parent))
+
+
+def peak_rss_mb() -> float:
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes
+    return rss / (1024 * 1024) if sys.platform == "darwin" else rss / 1024
+
+
+def parse_with_strings(fy22, pdf: Path) -> dict:
+    """The parsers as they ran before the line store: one str copy per section."""
+    import page_index
+    import pdftext_cache
+
+    text_content = fy22.load_text_from_pdf(pdf)
+    pages = pdftext_cache.split_pages(text_content)
+    index = page_index.load_index(pdf, pages=pages)
+
+    def section_text(*sections: str) -> str:
+        return page_index.section_text(pages, index, *sections)
+
+    return {
+        fy22.OUT_CSV_REGION_SERVICE: fy22.extract_egms_by_region_service(section_text("region_service")),
+        fy22.OUT_CSV_FIELD_OFFICE: fy22.parse_egm_by_field_office(section_text("field_office")),
+        fy22.OUT_CSV_INSTALLED_MANUFACTURER: fy22.parse_installed_assets(
+            section_text("field_office", "installed_assets"), pdf),
+        fy22.OUT_CSV_ASSET_DETAILS: fy22.extract_asset_details(section_text("installed_assets", "asset_details")),
+        fy22.OUT_CSV_YEARS_STORAGE: fy22.extract_years_in_storage(pdf, document=text_content, index=index),
+        fy22.OUT_CSV_SITE_STATUS: fy22.extract_site_operational_status(section_text("site_status")),
+        fy22.OUT_CSV_FLOOR_ASSET_DETAILS: fy22.extract_floor_asset_details(
+            str(pdf), index=index, document=fy22.TextDocument("".join(
+                pg + "\f" for pg in fy22.load_pages_from_pdf(str(pdf))))),
+    }
+
+
+def child(mode: str, pdf: Path, out_dir: Path) -> None:
+    """Run one mode and print its wall time and peak RSS as JSON on the last line."""
+    import FY2022_Asset_Report_Extraction as fy22
+
+    base_mb = peak_rss_mb()
+    t0 = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        if mode == "strings":
+            results = parse_with_strings(fy22, pdf)
+        else:
+            results = fy22.parse_report(pdf)
+    wall = time.perf_counter() - t0
+
+    out_dir.mkdir(parents=True, exist_ok=True)
+    for path, df in results.items():
+        df.to_csv(out_dir / Path(path).name, index=False)
+    print(json.dumps({"wall": wall, "base_mb": base_mb, "peak_mb": peak_rss_mb()}))
+
+
+def run_child(mode: str, pdf: Path, out_dir: Path) -> dict:
+    out = subprocess.run(
+        [sys.executable, __file__, "--child", mode, "--pdf", str(pdf), "--out", str(out_dir)],
+        check=True, capture_output=True, text=True, env=os.environ.copy(),
+    ).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--pages", type=int, default=1000)
+    ap.add_argument("--keep", type=Path, help="keep the fixture, cache and CSVs in this folder")
+    ap.add_argument("--child", choices=("strings", "store"), help=argparse.SUPPRESS)
+    ap.add_argument("--pdf", type=Path, help=argparse.SUPPRESS)
+    ap.add_argument("--out", type=Path, help=argparse.SUPPRESS)
+    args = ap.parse_args()
+
+    if args.child:
+        child(args.child, args.pdf, args.out)
+        return
+
+    work = args.keep or Path(tempfile.mkdtemp(prefix="bench_parsers_"))
+    os.environ["PDFTEXT_CACHE_DIR"] = str(work / "cache")
+
+    # Import after PDFTEXT_CACHE_DIR is set so the benchmark never touches the real cache
+    from pdf_fixtures import build_asset_report_fixture
+    import page_index
+    import pdftext_cache
+
+    pdf = build_asset_report_fixture(work / "asset_report_fixture.pdf", args.pages)
+    print(f"Fixture: {pdf} ({args.pages} pages)")
+
+    # Warm the cache and index so both runs measure parsing only
+    page_index.load_index(pdf, pages=pdftext_cache.extract_pages(pdf, "layout"))
+
+    stats = {mode: run_child(mode, pdf, work / mode) for mode in ("strings", "store")}
+
+    print(f"\n{'mode':<32}{'wall (s)':>10}{'peak RSS (MB)':>15}{'parsing (MB)':>14}")
+    labels = {"strings": "before: str copies per parser", "store": "after: shared line store"}
+    for mode, s in stats.items():
+        print(f"{labels[mode]:<32}{s['wall']:>10.2f}{s['peak_mb']:>15.1f}{s['peak_mb'] - s['base_mb']:>14.1f}")
+
+    names = sorted(p.name for p in (work / "strings").glob("*.csv"))
+    same = names == sorted(p.name for p in (work / "store").glob("*.csv")) and all(
+        filecmp.cmp(work / "strings" / n, work / "store" / n, shallow=False) for n in names)
+    print(f"\nIdentical CSVs ({len(names)} files): {'yes' if same else 'NO'}")
+    sys.exit(0 if same else 1)
+
+
+if __name__ == "__main__":
+    main()
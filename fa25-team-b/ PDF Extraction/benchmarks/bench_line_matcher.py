@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Benchmark: per-line marker probes, one test per marker vs. a compiled LineMatcher.
+
+Builds synthetic report lines (table rows with a few section titles, header
+lines and totals mixed in) and times, per line:
+  * before – the old probes: `any(p.search(...))` over SITE_END_MARKERS, the
+             substring checks of is_section_header / parse_block_rows /
+             grab_header_columns, and the District page_has_header /
+             page_has_total regex lists
+  * after  – the same questions asked of one LineMatcher each (line_matcher.py)
+
+Both must give the same answer for every line.
+
+Usage:
+    python benchmarks/bench_line_matcher.py [--lines 200000] [--seed 0]
+"""
+import argparse
+import random
+import re
+import sys
+import time
+from pathlib import Path
+
+HERE = Path(__file__).resolve().parent
+sys.path.insert(0, str(HERE.parent))
+
+from line_matcher import LineMatcher  # noqa: E402
+
+SECTION_SLOT = "Slot Machine Results - Navy"
+SECTION_NAFI = "NAFI Reimbursement from ARMP"
+REPORT_TITLE = "ARMP Navy Slot Report"
+
+SITE_END_PATTERNS = [
+    re.compile(r"^EGMs\s+by\s+Region", re.I),
+    re.compile(r"^EGMs\s+by\s+Field\s+Office", re.I),
+    re.compile(r"^Installed\s+Assets\s+by\s+Location", re.I),
+    re.compile(r"^REGION\s+FONUM\s+FOSHORT", re.I),
+    re.compile(r"^EGM[s]?\s+Years\s+in\s+Storage", re.I),
+    re.compile(r"\bby\s+Age\b", re.I),
+]
+
+# District notebook page filters
+REGION_NORM = r"(Europe|Korea|Japan)"
+SERVICE_NORM = r"(Army|Navy|USMC)"
+REIMB_WORD = r"(?:NAFI\s+Reimb(?:\.|ursement)?)"
+DISTRICT_RES = [re.compile(p, re.I) for p in [
+    rf"Slot\s+Revenue\s+({REGION_NORM}|Far\s*East)",
+    rf"Slot\s+NAFI\s+Reimb(?:\.|ursement)?\s+({REGION_NORM}|Far\s*East)",
+    rf"Slot\s+Revenue\s*&\s*NAFI\s+Reimb(?:\.|ursement)?\s+by\s+Month\s*-\s*({REGION_NORM}|Far\s*East)",
+    rf"Reimbursement\s+by\s+Month\s*-\s*({REGION_NORM}|Far\s*East)",
+    rf"\bnue\s+({REGION_NORM}|Far\s*East)\b",
+    rf"(?:T?otal)\s+{REGION_NORM}\s+Slot\s+Revenue\s+{SERVICE_NORM}",
+    rf"(?:T?otal)\s+{REGION_NORM}\s+{REIMB_WORD}\s+{SERVICE_NORM}",
+]]
+
+SPECIAL_LINES = [
+    SECTION_SLOT, SECTION_NAFI, REPORT_TITLE, "Country   Installation        FY21     FY22     FY23",
+    "Total                                  1,234,567.00   2,345,678.00",
+    "EGMs by Region, Service for month of January 2022", "Installed Assets by Location, Manufacture",
+    "REGION FONUM FOSHORT Loc LNAME Asset Class", "EGMs Years in Storage", "Summary by Age of EGMs",
+    "Slot Revenue & NAFI Reimbursement by Month - Korea", "Total Japan Slot Revenue Navy",
+]
+
+
+def synthetic_lines(n: int, seed: int):
+    rnd = random.Random(seed)
+    places = ["Sasebo", "Yokosuka", "Camp Humphreys", "Ramstein AB", "Atsugi", "Okinawa Kadena", "Naples"]
+    lines = []
+    for _ in range(n):
+        if rnd.random() < 0.03:
+            lines.append(rnd.choice(SPECIAL_LINES))
+            continue
+        nums = "   ".join(f"{rnd.randint(0, 9_999_999):,}.{rnd.randint(0, 99):02d}" for _ in range(rnd.randint(3, 6)))
+        lines.append(f"  {rnd.choice(['Japan', 'Korea', 'Italy'])}   {rnd.choice(places)}{' ' * rnd.randint(4, 20)}{nums}  ")
+    return lines
+
+
+def time_probe(fn, lines):
+    t0 = time.perf_counter()
+    results = [fn(line) for line in lines]
+    return (time.perf_counter() - t0) / len(lines) * 1e9, results
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--lines", type=int, default=200_000)
+    ap.add_argument("--seed", type=int, default=0)
+    args = ap.parse_args()
+
+    lines = synthetic_lines(args.lines, args.seed)
+    site_end = LineMatcher(patterns={f"end_{i}": p for i, p in enumerate(SITE_END_PATTERNS)})
+    block_end = LineMatcher(literals={"total": "Total", "slot": SECTION_SLOT, "nafi": SECTION_NAFI,
+                                      "title": REPORT_TITLE})
+    header_words = LineMatcher(literals={"Country": "Country", "Installation": "Installation"})
+    district = LineMatcher(patterns={f"page_{i}": p for i, p in enumerate(DISTRICT_RES)})
+
+    def old_block_end(line):
+        s = line.strip()
+        return "Total" in line or (SECTION_SLOT in s) or (SECTION_NAFI in s) or (REPORT_TITLE in s)
+
+    probes = [
+        ("Site Operational Status end markers (6 regexes)",
+         lambda line: any(p.search(line.strip()) for p in SITE_END_PATTERNS),
+         lambda line: site_end.search(line.strip())),
+        ("Navy table row end (Total + 3 titles)", old_block_end, block_end.search),
+        ("Navy header probe (Country and Installation)",
+         lambda line: "Country" in line and "Installation" in line,
+         header_words.has_all),
+        ("District page filters (7 regexes)",
+         lambda line: any(p.search(line) for p in DISTRICT_RES),
+         district.search),
+    ]
+
+    print(f"{len(lines):,} synthetic lines, {sum(l in SPECIAL_LINES for l in lines):,} holding a marker\n")
+    print(f"{'probe':<50}{'before':>12}{'after':>12}{'speedup':>10}")
+    ok = True
+    for name, before, after in probes:
+        t_before, r_before = time_probe(before, lines)
+        t_after, r_after = time_probe(after, lines)
+        same = [bool(x) for x in r_before] == [bool(x) for x in r_after]
+        ok &= same
+        print(f"{name:<50}{t_before:>9.0f} ns{t_after:>9.0f} ns{t_before / t_after:>9.2f}x"
+              f"{'' if same else '   ❌ results differ'}")
+    print("\nResults identical:", ok)
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Benchmark: money as REAL dollars vs INTEGER cents in SQLite.
+
+A Navy monthly summary master CSV (CSVs/Navy Revenue Report/, with its
+"(1157.65)" negatives) is loaded twice into an in-memory database, repeated
+`--scales N` times (as N times the reports would be):
+
+  * real  – `revenue REAL` from pd.to_numeric, as convert_csv_to_db.py used to store it
+  * cents – `revenue_cents INTEGER` from deploy/money.py's cents_column
+
+For each scale: conversion rate of the Revenue column (values/s), amounts
+lost to NULL, a per-installation total and average query on both tables
+(ms, best of --repeat), and the REAL grand total next to the exact one.
+
+Usage:
+    python benchmarks/bench_money_cents.py [--csv "../CSVs/Navy Revenue Report/....csv"] [--scales 1 10 100]
+"""
+import argparse
+import sqlite3
+import sys
+import time
+from pathlib import Path
+
+import pandas as pd
+
+HERE = Path(__file__).resolve().parent
+sys.path.insert(0, str(HERE.parent.parent / "deploy"))
+
+import money  # noqa: E402
+
+DEFAULT_CSV = HERE.parent.parent / "CSVs" / "Navy Revenue Report" / "Navy Revenue Report FY20-FY24-2_monthly_summary_master.csv"
+
+QUERY = """
+select installation, count(distinct location_name) as locations,
+       round({total}, 2) as total_revenue, round({average}, 2) as avg_monthly_revenue
+from {table} group by installation order by total_revenue desc
+"""
+QUERIES = {
+    "real": QUERY.format(table="real", total="sum(revenue)", average="avg(revenue)"),
+    "cents": QUERY.format(table="cents", total="sum(revenue_cents) / 100.0", average="avg(revenue_cents) / 100.0"),
+}
+
+
+def best_of(repeat, fn, *args):
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        money.to_cents.cache_clear()
+        t0 = time.perf_counter()
+        result = fn(*args)
+        best = min(best, time.perf_counter() - t0)
+    return best, result
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--csv", type=Path, default=DEFAULT_CSV)
+    ap.add_argument("--scales", type=int, nargs="+", default=[1, 10, 100])
+    ap.add_argument("--repeat", type=int, default=5)
+    args = ap.parse_args()
+
+    base = pd.read_csv(args.csv, dtype=str, encoding="utf-8-sig")[["Installation", "Location", "Revenue"]]
+    print(f"{args.csv.name}: {len(base)} rows; best of {args.repeat}\n")
+    print(f"{'scale':>6}{'rows':>10}{'to_numeric/s':>15}{'cents/s':>13}{'NULL':>7}{'NULL':>6}"
+          f"{'REAL ms':>10}{'INTEGER ms':>12}  {'REAL total':>22}{'exact total':>17}")
+    print(f"{'real':>51}{'cents':>6}")
+
+    ok = True
+    for scale in args.scales:
+        df = pd.concat([base] * scale, ignore_index=True)
+        t_real, real = best_of(args.repeat, lambda s: pd.to_numeric(s, errors="coerce"), df["Revenue"])
+        t_cents, cents = best_of(args.repeat, money.cents_column, df["Revenue"])
+        both = real.notna()   # where to_numeric read a number, both must agree to the cent
+        ok &= bool((cents[both] / 100 - real[both]).abs().lt(0.005).all())
+
+        con = sqlite3.connect(":memory:")
+        con.execute("create table real (installation text, location_name text, revenue real)")
+        con.execute("create table cents (installation text, location_name text, revenue_cents integer)")
+        con.executemany("insert into real values (?, ?, ?)",
+                        zip(df["Installation"], df["Location"], real.astype(object).where(real.notna(), None)))
+        con.executemany("insert into cents values (?, ?, ?)",
+                        zip(df["Installation"], df["Location"], cents.astype(object).where(cents.notna(), None)))
+        timings = {}
+        for name, sql in QUERIES.items():
+            timings[name], _ = best_of(args.repeat, lambda q: con.execute(q).fetchall(), sql)
+        real_total = con.execute("select sum(revenue) from real").fetchone()[0]
+        exact_total = con.execute("select sum(revenue_cents) from cents").fetchone()[0]
+        con.close()
+
+        exact = f"{'-' if exact_total < 0 else ''}{abs(exact_total) // 100}.{abs(exact_total) % 100:02d}"
+        print(f"{scale:>6}{len(df):>10}{len(df) / t_real:>15,.0f}{len(df) / t_cents:>13,.0f}"
+              f"{real.isna().sum() - df['Revenue'].isna().sum():>7}{cents.isna().sum() - df['Revenue'].isna().sum():>6}"
+              f"{timings['real'] * 1e3:>10.1f}{timings['cents'] * 1e3:>12.1f}  {real_total!r:>22}{exact:>17}")
+    print("\nSame amounts where to_numeric reads a number:", ok)
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
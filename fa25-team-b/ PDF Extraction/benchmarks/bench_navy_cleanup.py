@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+"""
+Benchmark: Navy Monthly Summary cleanup, row-wise `apply` vs. vectorized rule tables.
+
+Rows come from the committed `*_monthly_summary_master.csv` files, with rows
+each cleanup rule removes mixed in (damaged Yokosuka "Oct 15" lines, Souda
+Bay graffiti, Sasebo B/C, Atsugi "None 401401", Atsugi "Club Trilogy" twins),
+repeated months and blank Installation/Loc#/Location cells for the
+forward-fill. For a scale of N the rows are copied N times, each copy shifted
+by whole years, and timed through:
+  * before – run_monthly_summary's cleanup as it was: clean_number and
+             month_to_date per value, five `df.apply(..., axis=1)` filters, the
+             Atsugi duplicate mask rebuilt over the whole frame for every row
+  * after  – clean_monthly_frame (MONTHLY_DROP_RULES / MONTHLY_DUPLICATE_RULES)
+
+Both must write the same CSV. At scale 1 without the injected rows, the
+output must also equal the committed CSV.
+
+Usage:
+    python benchmarks/bench_navy_cleanup.py [--scales 1 10 100]
+"""
+import argparse
+import io
+import random
+import re
+import sys
+import time
+from pathlib import Path
+
+import pandas as pd
+
+HERE = Path(__file__).resolve().parent
+sys.path.insert(0, str(HERE.parent))
+
+import navy_revenue as navy  # noqa: E402
+
+
+CSV_DIR = HERE.parent.parent / "CSVs" / "Navy Revenue Report"
+re_any_code6 = navy.re_any_code6
+
+
+# ---- run_monthly_summary's cleanup as it was ----
+def clean_number(x):
+    """navy_revenue's clean_number as it was (frozen here; the engine now uses num_tokens.clean_numbers)."""
+    if pd.isna(x):
+        return pd.NA
+    s = str(x).strip().replace(",", "").replace("$", "")
+    if re.fullmatch(r"\(?-?\d+(?:\.\d+)?\)?", s):
+        return s
+    try:
+        return float(s)
+    except ValueError:
+        return s
+
+
+def clean_before(df):
+    df[["Installation", "Loc#", "Location"]] = df[["Installation", "Loc#", "Location"]].ffill()
+
+    for c in ["Revenue", "NAFI Amt", "Annual Revenue", "Annual NAFI"]:
+        df[c] = df[c].apply(clean_number)
+
+    df["MonthDate"] = df["Month"].apply(navy.month_to_date)
+    df = df.sort_values(["Installation", "Loc#", "Location", "MonthDate"])
+    df = df.drop_duplicates(subset=["Installation", "Loc#", "Location", "Month"], keep="last")
+    df = df.drop(columns=["MonthDate"])
+
+    def yokosuka_row_is_bad(row) -> bool:
+        if str(row["Installation"]).strip().lower() != "yokosuka":
+            return False
+        loc = str(row["Location"])
+        if re_any_code6.search(loc):
+            return False
+        return bool(re.search(r"(oct\s*15|o\s*t\s*15)", loc.lower()))
+
+    df = df[~df.apply(yokosuka_row_is_bad, axis=1)].reset_index(drop=True)
+
+    def is_souda_graffiti_no_code(row) -> bool:
+        if str(row["Installation"]).strip().lower() != "souda bay":
+            return False
+        loc = str(row["Location"]).lower()
+        return ("graffiti" in loc and "shipmate" in loc) and (re_any_code6.search(loc) is None)
+
+    df = df[~df.apply(is_souda_graffiti_no_code, axis=1)].reset_index(drop=True)
+
+    def is_sasebo_bc_no_code(row) -> bool:
+        if str(row["Installation"]).strip().lower() != "sasebo":
+            return False
+        loc = str(row["Location"]).lower()
+        looks_bc = bool(re.search(r"sasebo\s+b\s*/?\s*c\b", loc))
+        return looks_bc and (re_any_code6.search(loc) is None)
+
+    df = df[~df.apply(is_sasebo_bc_no_code, axis=1)].reset_index(drop=True)
+
+    def is_atsugi_none_code(row) -> bool:
+        if str(row["Installation"]).strip().lower() != "atsugi":
+            return False
+        if str(row["Loc#"]).strip() != "3079":
+            return False
+        loc = str(row["Location"]).strip().lower()
+        return bool(re.match(r"^none\s+\d{6}$", loc))
+
+    df = df[~df.apply(is_atsugi_none_code, axis=1)].reset_index(drop=True)
+
+    mask_dup = df.apply(
+        lambda r: (
+            str(r["Installation"]).strip().lower() == "atsugi"
+            and str(r["Loc#"]).strip() == "3079"
+            and str(r["Location"]).strip().lower() == "club trilogy"
+            and any(
+                (df["Installation"].str.lower() == "atsugi")
+                & (df["Loc#"].astype(str) == "3079")
+                & (df["Month"] == r["Month"])
+                & (df["Location"].str.lower().str.contains("club trilogy 401401"))
+            )
+        ),
+        axis=1,
+    )
+    return df[~mask_dup].reset_index(drop=True)
+
+
+# ---- Rows ----
+def committed_rows():
+    return [pd.read_csv(p, dtype=str, encoding="utf-8-sig") for p in sorted(CSV_DIR.glob("*_monthly_summary_master.csv"))]
+
+
+def inject(df, seed):
+    """Mix in rows every cleanup rule removes, repeated months and blanks for the forward-fill."""
+    rnd = random.Random(seed)
+    months = df["Month"].dropna().unique().tolist()
+    extra = []
+    for month in rnd.sample(months, min(40, len(months))):
+        amounts = {"Revenue": f"{rnd.randint(0, 99999)}.{rnd.randint(0, 99):02d}", "NAFI Amt": "(1,234.50)",
+                   "Annual Revenue": pd.NA, "Annual NAFI": pd.NA, "Status": pd.NA}
+        for inst, loc_no, loc in [("Yokosuka", "3090", "CPO Club Oct 15"), ("Yokosuka", "3090", "O t 15 Lounge 401234"),
+                                  ("Souda Bay", "3300", "Graffiti Shipmate Bar"), ("Sasebo", "3085", "Sasebo B/C"),
+                                  ("Atsugi", "3079", "None 401401"), ("Atsugi", "3079", "Club Trilogy"),
+                                  ("Atsugi", "3079", "Club Trilogy 401401")]:
+            extra.append({"Installation": inst, "Loc#": loc_no, "Location": loc, "Month": month, **amounts})
+    df = pd.concat([df, pd.DataFrame(extra)], ignore_index=True)
+    # Repeated months (the later one wins) and cells left blank until the forward-fill
+    repeats = df.sample(frac=0.05, random_state=seed)
+    df = pd.concat([df, repeats.assign(Revenue="$1,000")], ignore_index=True)
+    blanks = df.sample(frac=0.02, random_state=seed + 1).index
+    df.loc[blanks[blanks > 0], ["Installation", "Loc#", "Location"]] = pd.NA
+    return df
+
+
+def scaled(df, n):
+    """n copies of the rows, copy i shifted by i years (Month "Oct-12" → "Oct-13" ...)."""
+    mon = df["Month"].str.slice(0, 4)
+    yy = pd.to_numeric(df["Month"].str.slice(4), errors="coerce")
+    copies = []
+    for i in range(n):
+        copy = df.copy()
+        shifted = ((yy + i) % 100).astype("Int64").astype("string").str.zfill(2)
+        copy["Month"] = (mon + shifted).where(yy.notna(), df["Month"])
+        copies.append(copy)
+    return pd.concat(copies, ignore_index=True)
+
+
+def to_csv(df):
+    buf = io.StringIO()
+    df.to_csv(buf, index=False)
+    return buf.getvalue()
+
+
+def timed(fn, df):
+    t0 = time.perf_counter()
+    out = fn(df.copy())
+    return (time.perf_counter() - t0) * 1e3, to_csv(out)
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--scales", type=int, nargs="+", default=[1, 10, 100])
+    ap.add_argument("--seed", type=int, default=0)
+    args = ap.parse_args()
+
+    committed = committed_rows()
+    ok = True
+    for i, df in enumerate(committed):
+        same = to_csv(navy.clean_monthly_frame(df.copy())) == to_csv(df)
+        ok &= same
+        print(f"Committed CSV {i + 1}: cleanup output unchanged: {same}")
+
+    base = pd.concat([inject(df, args.seed + i) for i, df in enumerate(committed)], ignore_index=True)
+    print(f"\n{'scale':>6}{'rows':>10}{'before ms':>12}{'after ms':>11}{'speedup':>9}")
+    for n in args.scales:
+        df = scaled(base, n)
+        t_before, ref = timed(clean_before, df)
+        t_after, out = timed(navy.clean_monthly_frame, df)
+        same = ref == out
+        ok &= same
+        print(f"{n:>6}{len(df):>10}{t_before:>12.0f}{t_after:>11.0f}{t_before / t_after:>8.1f}x"
+              f"{'' if same else '   ❌ output differs'}")
+    print("\nOutput identical:", ok)
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
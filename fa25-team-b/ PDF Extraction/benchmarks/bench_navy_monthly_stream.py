@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Benchmark: Navy Monthly Summary output, whole-table DataFrame vs. streaming writer.
+
+Parsed rows are rebuilt from the committed `*_monthly_summary_master.csv`
+files with the cleanup fixtures of bench_navy_cleanup.py (rows each rule
+drops, repeated months, blank cells for the forward-fill). Installation
+blocks are interleaved so they arrive out of sorted order. For a scale of N
+a generator yields the rows N times, each copy as new locations (Loc#
+suffixed), like iter_monthly_rows producing a report N times longer. Timed, with peak traced
+memory (tracemalloc):
+  * before – list of every row, one DataFrame, clean_monthly_frame, to_csv
+  * after  – write_monthly_summary: forward-fill as rows arrive, bounded
+             buffers per installation and Loc#, one group cleaned and
+             appended at a time
+
+Both must write byte-identical CSV files.
+
+Usage:
+    python benchmarks/bench_navy_monthly_stream.py [--scales 1 10 50] [--chunk-rows 5000]
+"""
+import argparse
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+import pandas as pd
+
+HERE = Path(__file__).resolve().parent
+sys.path.insert(0, str(HERE))
+
+import bench_navy_cleanup as fixtures  # noqa: E402
+
+navy = fixtures.navy
+
+
+def source_frame(seed):
+    frames = [fixtures.inject(df, seed + i) for i, df in enumerate(fixtures.committed_rows())]
+    df = pd.concat(frames, ignore_index=True)
+    # Interleave installation blocks: the report is grouped by installation, but not in sorted order
+    block = (df["Installation"].ne(df["Installation"].shift()) & df["Installation"].notna()).cumsum()
+    order = sorted(block.unique(), key=lambda b: (b % 3, -b))
+    return pd.concat([df[block == b] for b in order], ignore_index=True)
+
+
+def iter_rows(df, n):
+    """The rows of n copies of df, one dict at a time; copy i > 0 gets its own Loc# ("3079" → "3079.i")."""
+    rows = df.astype(object).where(df.notna(), pd.NA).to_dict("records")
+    for i in range(n):
+        for row in rows:
+            row = dict(row)
+            if i and not pd.isna(row["Loc#"]):
+                row["Loc#"] = f"{row['Loc#']}.{i}"
+            yield row
+
+
+def before(rows, out_csv, chunk_rows):
+    df = navy.clean_monthly_frame(pd.DataFrame(list(rows)))
+    df.to_csv(out_csv, index=False, encoding="utf-8-sig")
+    return len(df), df["Installation"].nunique()
+
+
+def after(rows, out_csv, chunk_rows):
+    return navy.write_monthly_summary(rows, out_csv, chunk_rows=chunk_rows)
+
+
+def measure(fn, rows, out_csv, chunk_rows):
+    tracemalloc.start()
+    t0 = time.perf_counter()
+    counts = fn(rows, out_csv, chunk_rows)
+    wall = time.perf_counter() - t0
+    peak = tracemalloc.get_traced_memory()[1] / 2**20
+    tracemalloc.stop()
+    return wall, peak, counts
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--scales", type=int, nargs="+", default=[1, 10, 50])
+    ap.add_argument("--chunk-rows", type=int, default=navy.MONTHLY_CHUNK_ROWS)
+    ap.add_argument("--seed", type=int, default=0)
+    args = ap.parse_args()
+
+    base = source_frame(args.seed)
+    print(f"{'scale':>6}{'rows':>10}{'before s':>10}{'peak MB':>9}{'after s':>10}{'peak MB':>9}")
+    ok = True
+    with tempfile.TemporaryDirectory() as tmp:
+        for n in args.scales:
+            ref_csv, out_csv = Path(tmp) / "before.csv", Path(tmp) / "after.csv"
+            t_b, m_b, c_b = measure(before, iter_rows(base, n), ref_csv, args.chunk_rows)
+            t_a, m_a, c_a = measure(after, iter_rows(base, n), out_csv, args.chunk_rows)
+            same = ref_csv.read_bytes() == out_csv.read_bytes() and c_b == c_a
+            ok &= same
+            print(f"{n:>6}{len(base) * n:>10}{t_b:>10.1f}{m_b:>9.0f}{t_a:>10.1f}{m_a:>9.0f}"
+                  f"{'' if same else '   ❌ output differs'}")
+    print("\nOutput identical:", ok)
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
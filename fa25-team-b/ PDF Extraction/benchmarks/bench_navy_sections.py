@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+"""
+Benchmark: Navy slot/NAFI table parsing, one scan per section title vs. one tokenizer pass.
+
+Builds synthetic layout text shaped like the slot/NAFI pages (page titles,
+"Country ... Installation" headers with FY continuation lines, rows, totals,
+blank lines, the odd blank right under a header) and times:
+  * before – extract_section as it was, once for SECTION_SLOT and once for
+             SECTION_NAFI: a 25-line header lookahead per title hit and a
+             second parse_block_rows pass when a block comes back empty
+  * after  – iter_table_events + section_rows: both tables in one pass
+
+The merged tables (merge_blocks + ordered_columns) of both must be identical.
+
+Usage:
+    python benchmarks/bench_navy_sections.py [--pages 50 500 5000] [--titles 1] [--seed 0]
+"""
+import argparse
+import random
+import re
+import sys
+import time
+from pathlib import Path
+
+HERE = Path(__file__).resolve().parent
+sys.path.insert(0, str(HERE.parent))
+
+import navy_revenue as navy  # noqa: E402
+
+
+
+# ---- extract_section as it was ----
+def grab_header_columns(lines, start_idx):
+    header_idx = -1
+    for k in range(start_idx, min(start_idx + 25, len(lines))):
+        if navy.is_table_header(lines[k]):
+            header_idx = k
+            break
+    if header_idx == -1:
+        return -1, []
+
+    header_block = lines[header_idx]
+    for off in (1, 2):
+        if header_idx + off < len(lines):
+            nxt = lines[header_idx + off]
+            if navy.is_fy_header_line(nxt):
+                header_block += "  " + nxt
+
+    raw_cols = [m.group(0) for m in navy.FY_TOKEN.finditer(header_block)]
+    cleaned = [c for c in map(navy.clean_fy_label, raw_cols) if c]
+
+    seen = set()
+    expected = []
+    for c in cleaned:
+        if c not in seen:
+            seen.add(c)
+            expected.append(c)
+    return header_idx, expected
+
+
+def parse_block_rows(lines, body_start, expected_cols):
+    rows = []
+    for k in range(body_start, len(lines)):
+        row_line = lines[k]
+        if not row_line.strip() or navy.is_block_end(row_line):
+            break
+
+        tokens = row_line.strip().split()
+        if len(tokens) < 3:
+            continue
+
+        country = tokens[0]
+        i = 1
+        inst_parts = []
+        while i < len(tokens):
+            tok = tokens[i]
+            if navy.MONEY_OR_DASH.match(tok):
+                break
+            inst_parts.append(tok)
+            i += 1
+
+        installation = " ".join(inst_parts).strip()
+        if not installation:
+            continue
+
+        numbers = []
+        for tok in tokens[i:]:
+            clean = re.sub(r"[^\d,\.\(\)\-]", "", tok)
+            if navy.NUM_TOKEN.match(clean) or clean == "-":
+                numbers.append(clean)
+
+        values = [navy.parse_value(x) for x in numbers]
+        if len(values) < len(expected_cols):
+            values += [""] * (len(expected_cols) - len(values))
+        elif len(values) > len(expected_cols):
+            values = values[:len(expected_cols)]
+
+        row = {"Country": country, "Installation": installation}
+        for c, v in zip(expected_cols, values):
+            row[c] = v
+        rows.append(row)
+    return rows
+
+
+def extract_section(lines, section_title):
+    rows_all = []
+    for i, line in enumerate(lines):
+        if section_title in line:
+            header_idx, expected_cols = grab_header_columns(lines, i)
+            if header_idx == -1 or not expected_cols:
+                continue
+            rows = parse_block_rows(lines, header_idx + 1, expected_cols)
+            if not rows:
+                rows = parse_block_rows(lines, header_idx + 2, expected_cols)
+            for r in rows:
+                r["_cols"] = tuple(expected_cols)
+            rows_all.extend(rows)
+    return rows_all
+
+
+# ---- Synthetic slot/NAFI pages ----
+PLACES = [("Japan", "Yokosuka"), ("Japan", "Sasebo"), ("Japan", "New Sanno Hotel"), ("Korea", "Chin Hae $"),
+          ("Italy", "Naples"), ("Italy", "Sigonella"), ("Spain", "Rota"), ("Greece", "Souda Bay")]
+
+
+def money(rnd):
+    v = f"{rnd.randint(0, 999_999):,}.{rnd.randint(0, 99):02d}"
+    return rnd.choice([v, v, v, f"({v})", "-"])
+
+
+def synthetic_lines(n_pages, seed, titles=1):
+    rnd = random.Random(seed)
+    lines = []
+    for p in range(n_pages):
+        first = 16 + (p % 6)
+        years = [f"FY{y}" for y in range(first, first + 6)]
+        for section in (navy.SECTION_SLOT, navy.SECTION_NAFI):
+            lines.append(("\f" if lines else "") + f"              {navy.REPORT_TITLE}")
+            lines.extend([f"           {section}"] * titles)
+            lines.append("")
+            lines.append("Country   Installation      " + "      ".join(years))
+            lines.append(f"                          {years[-1]} thru SEP    ANNUALIZED {years[-1]}")
+            if rnd.random() < 0.2:
+                lines.append("")
+            for country, inst in rnd.sample(PLACES, rnd.randint(4, len(PLACES))):
+                nums = "   ".join(money(rnd) for _ in range(rnd.randint(5, 9)))
+                lines.append(f"{country}    {inst}{' ' * rnd.randint(3, 12)}{nums}")
+                if rnd.random() < 0.05:
+                    lines.append("   continued")
+            lines.append("Total              " + "   ".join(money(rnd) for _ in range(8)))
+            lines.append("")
+    return lines
+
+
+def tables(slot_rows, nafi_rows):
+    out = []
+    for rows in (slot_rows, nafi_rows):
+        merged, cols = navy.merge_blocks(rows)
+        out.append((list(merged.items()), navy.ordered_columns(cols)))
+    return out
+
+
+def before(lines):
+    return tables(extract_section(lines, navy.SECTION_SLOT), extract_section(lines, navy.SECTION_NAFI))
+
+
+def after(lines):
+    rows = navy.section_rows(navy.iter_table_events(lines, (navy.SECTION_SLOT, navy.SECTION_NAFI)))
+    return tables(rows[navy.SECTION_SLOT], rows[navy.SECTION_NAFI])
+
+
+def best_of(repeat, fn, *args):
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        result = fn(*args)
+        best = min(best, time.perf_counter() - t0)
+    return best * 1e3, result
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--pages", type=int, nargs="+", default=[50, 500, 5000])
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--titles", type=int, default=1, help="title lines per table page (each one is a header search before)")
+    ap.add_argument("--repeat", type=int, default=3)
+    args = ap.parse_args()
+
+    print(f"{'pages':>7}{'lines':>9}{'before ms':>12}{'after ms':>11}{'speedup':>9}")
+    ok = True
+    for n in args.pages:
+        lines = synthetic_lines(n, args.seed, args.titles)
+        t_before, ref = best_of(args.repeat, before, lines)
+        t_after, out = best_of(args.repeat, after, lines)
+        same = ref == out
+        ok &= same
+        print(f"{n:>7}{len(lines):>9}{t_before:>12.1f}{t_after:>11.1f}{t_before / t_after:>8.1f}x"
+              f"{'' if same else '   ❌ output differs'}")
+    print("\nOutput identical:", ok)
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Benchmark: number-token cleanup, the parsers' original per-token functions vs num_tokens.py.
+
+Tokens are read from the Financial Statements text (pdf/FinancialTexts.txt):
+the amount columns of every line, each line's tail for extract_number_tokens
+and its whitespace-split words for parse_int_token. `--scales N` repeats the
+token list N times (as N years of reports would).
+
+For each function, tokens per second:
+  * before – the original function, called once per token
+  * token  – the num_tokens function (memoized, except parse_value), called once per token
+  * column – the whole token list in one call (num_cleanup_column / parse_values)
+
+A fresh process is not needed between runs: the memo caches are cleared
+before each timing. The outputs of every version must be identical.
+
+Usage:
+    python benchmarks/bench_num_tokens.py [--text ../pdf/FinancialTexts.txt] [--scales 1 10]
+"""
+import argparse
+import re
+import sys
+import time
+from pathlib import Path
+
+HERE = Path(__file__).resolve().parent
+sys.path.insert(0, str(HERE.parent))
+
+import num_tokens  # noqa: E402
+
+DEFAULT_TEXT = HERE.parent.parent / "pdf" / "FinancialTexts.txt"
+
+
+# ---- The parsers' original functions ----
+def numCleanup(numStr: str) -> str:
+    trailingMinus = ''
+    removeSpace = re.sub(r'[\s+]', '', numStr.strip())
+    badChars = re.sub(r'[:;,._·\"\']', '', removeSpace)
+    if badChars[-1] == '-':
+        trailingMinus = '-'
+    removeMinus = re.sub(r'[-]', '', badChars)
+    letterTransposition = re.sub(r'[LlJ]', '1', removeMinus)
+    zeroTransposition = re.sub(r'[QODo]', '0', letterTransposition)
+    fiveTransposition = re.sub(r'[Ss]', "5", zeroTransposition)
+    return trailingMinus + fiveTransposition[:-2] + '.' + fiveTransposition[-2:]
+
+
+def parse_value(val: str):
+    val = val.strip().replace("$", "")
+    if not val or val == "-":
+        return ""
+    neg = val.startswith("(") and val.endswith(")")
+    if neg:
+        val = val[1:-1]
+    try:
+        num = float(val.replace(",", ""))
+        return -num if neg else num
+    except ValueError:
+        return ""
+
+
+re_nums = re.compile(r"\(?-?\d{1,3}(?:,\d{3})*(?:\.\d+)?\)?")
+
+
+def extract_number_tokens(tail):
+    toks = re_nums.findall(tail)
+    return [t.replace(",", "").replace("$", "").strip() for t in toks]
+
+
+def parse_int_token(tok):
+    tok = tok.strip()
+    if tok in ("-", "--", ""):
+        return None
+    if re.fullmatch(r"\d+", tok):
+        return int(tok)
+    if re.fullmatch(r"\d+-", tok):
+        return int(tok[:-1])
+    return None
+
+
+# ---- Tokens ----
+def text_tokens(path: Path):
+    """(amount cells, line tails, words) of the Financial Statements text."""
+    amounts, tails, words = [], [], []
+    for line in path.read_text(encoding="cp1252").splitlines():
+        cols = re.split(r"[\s]{2,}", line.strip())
+        amounts += [c for c in cols[1:] if re.search(r"\d", c) and re.sub(r"[\s+:;,._·\"'-]", "", c)]
+        if len(cols) > 1:
+            tails.append(" ".join(cols[1:]))
+        words += line.split()
+    return amounts, tails, words
+
+
+def best_of(repeat, fn, *args):
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        for cached in (num_tokens.num_cleanup, num_tokens.parse_int_token):
+            cached.cache_clear()
+        t0 = time.perf_counter()
+        result = fn(*args)
+        best = min(best, time.perf_counter() - t0)
+    return best, result
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--text", type=Path, default=DEFAULT_TEXT)
+    ap.add_argument("--scales", type=int, nargs="+", default=[1, 10])
+    ap.add_argument("--repeat", type=int, default=3)
+    args = ap.parse_args()
+
+    amounts, tails, words = text_tokens(args.text)
+    print(f"{args.text.name}: {len(amounts)} amount cells ({len(set(amounts))} distinct), "
+          f"{len(tails)} line tails, {len(words)} words; best of {args.repeat}, tokens/s\n")
+
+    cases = [
+        ("numCleanup", amounts,
+         lambda toks: [numCleanup(t) for t in toks],
+         lambda toks: [num_tokens.num_cleanup(t) for t in toks],
+         lambda toks: num_tokens.num_cleanup_column(toks).tolist()),
+        ("parse_value", amounts,
+         lambda toks: [parse_value(t) for t in toks],
+         lambda toks: [num_tokens.parse_value(t) for t in toks],
+         lambda toks: num_tokens.parse_values(toks).tolist()),
+        ("extract_number_tokens", tails,
+         lambda toks: [extract_number_tokens(t) for t in toks],
+         lambda toks: [num_tokens.extract_number_tokens(t) for t in toks],
+         None),
+        ("parse_int_token", words,
+         lambda toks: [parse_int_token(t) for t in toks],
+         num_tokens.parse_int_tokens,
+         None),
+    ]
+
+    print(f"{'function':<22}{'scale':>6}{'tokens':>10}{'before':>12}{'token':>12}{'column':>12}{'speedup':>9}")
+    ok = True
+    for name, base, before, token, column in cases:
+        for scale in args.scales:
+            toks = base * scale
+            t_before, ref = best_of(args.repeat, before, toks)
+            t_token, out = best_of(args.repeat, token, toks)
+            same = out == ref
+            rates = [len(toks) / t_before, len(toks) / t_token]
+            if column is not None:
+                t_column, col_out = best_of(args.repeat, column, toks)
+                same &= col_out == ref
+                rates.append(len(toks) / t_column)
+            ok &= same
+            cells = "".join(f"{r:>12,.0f}" for r in rates) + ("" if column else f"{'-':>12}")
+            print(f"{name:<22}{scale:>6}{len(toks):>10}{cells}{max(rates[1:]) / rates[0]:>8.1f}x"
+                  f"{'' if same else '   ❌ output differs'}")
+    print("\nOutput identical:", ok)
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+Benchmark: Marine notebook char grouping, per-character loops vs. pdfplumber_chars.py.
+
+For each page, times:
+  * summary – chars_to_lines + line_to_words (the Summary Table cell), before
+              as the notebook had them, after as chars_to_line_words
+  * detail  – chars_to_words + group_by_y (the Detail Table cell)
+
+`page.chars` is read once per page outside the timings. The outputs of both
+versions must be identical on every page.
+
+Usage:
+    python benchmarks/bench_pdfplumber_chars.py [--pdf "../pdf/Marine Revenue FY20-FY24.pdf"]
+                                                [--pages 1 35 73 115 157] [--repeat 5]
+
+Needs pdfplumber; without it (or without the PDF) synthetic pages are used.
+"""
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+HERE = Path(__file__).resolve().parent
+sys.path.insert(0, str(HERE.parent))
+
+import pdfplumber_chars  # noqa: E402
+
+DEFAULT_PDF = HERE.parent.parent / "pdf" / "Marine Revenue FY20-FY24.pdf"
+TARGET_PAGES = [1, 35, 73, 115, 157]
+X_TOL, Y_TOL = 4.0, 3.0   # the Detail Table's base tolerances
+
+
+# ---- The notebook's original loops ----
+def chars_to_lines(chars, y_tol=3):
+    chars = sorted(chars, key=lambda c: (c["top"], c["x0"]))
+    lines, cur, last_y = [], [], None
+    for ch in chars:
+        if last_y is None or abs(ch["top"] - last_y) <= y_tol:
+            cur.append(ch)
+            last_y = ch["top"] if last_y is None else (last_y + ch["top"]) / 2
+        else:
+            if cur:
+                lines.append(cur)
+            cur = [ch]
+            last_y = ch["top"]
+    if cur:
+        lines.append(cur)
+    return lines
+
+
+def _merge_chars(chars):
+    txt = "".join(c["text"] for c in chars)
+    return {"text": txt, "x0": min(c["x0"] for c in chars), "x1": max(c["x1"] for c in chars)}
+
+
+def line_to_words(line_chars, gap=3):
+    if not line_chars:
+        return []
+    line_chars = sorted(line_chars, key=lambda c: c["x0"])
+    words, cur = [], [line_chars[0]]
+    for ch in line_chars[1:]:
+        if ch["x0"] - cur[-1]["x1"] <= gap:
+            cur.append(ch)
+        else:
+            words.append(_merge_chars(cur))
+            cur = [ch]
+    if cur:
+        words.append(_merge_chars(cur))
+    return words
+
+
+def chars_to_words(chars, x_tol, y_tol):
+    chars = sorted(chars, key=lambda c: (round(c["top"], 1), c["x0"]))
+    lines, words = [], []
+    for ch in chars:
+        if not lines or abs(ch["top"] - lines[-1]["y"]) > y_tol:
+            lines.append({"y": ch["top"], "chars": [ch]})
+        else:
+            lines[-1]["chars"].append(ch)
+    for line in lines:
+        row = sorted(line["chars"], key=lambda c: c["x0"])
+        cur = [row[0]]
+        for c in row[1:]:
+            if c["x0"] - cur[-1]["x1"] <= x_tol:
+                cur.append(c)
+            else:
+                words.append({"text": "".join(x["text"] for x in cur), "x0": cur[0]["x0"],
+                              "x1": cur[-1]["x1"], "top": line["y"]})
+                cur = [c]
+        if cur:
+            words.append({"text": "".join(x["text"] for x in cur), "x0": cur[0]["x0"],
+                          "x1": cur[-1]["x1"], "top": line["y"]})
+    return words
+
+
+def group_by_y(words, y_tol):
+    lines = []
+    for w in sorted(words, key=lambda w: (round(w["top"], 1), w["x0"])):
+        if not lines or abs(w["top"] - lines[-1]["y"]) > y_tol:
+            lines.append({"y": w["top"], "tokens": [w]})
+        else:
+            lines[-1]["tokens"].append(w)
+    return lines
+
+
+# ---- Pages ----
+def pdf_pages(pdf_path, pages):
+    import pdfplumber
+    with pdfplumber.open(pdf_path) as pdf:
+        return [(p, pdf.pages[p - 1].chars) for p in pages if 0 < p <= len(pdf.pages)]
+
+
+def synthetic_pages(pages, seed=0):
+    """Table-like pages: rows of words with slightly jittered baselines."""
+    rnd = random.Random(seed)
+    out = []
+    for p in pages:
+        chars = []
+        for row in range(55):
+            base = 60 + row * 12.5
+            x = 30.0
+            for _ in range(rnd.randint(4, 9)):
+                for ch in f"{rnd.randint(0, 999_999):,}":
+                    w = rnd.choice([4.45, 5.0, 2.5])
+                    top = base + rnd.choice([0, 0, 0, 0.01, -0.02, 0.7])
+                    chars.append({"text": ch, "x0": x, "x1": x + w, "top": top})
+                    x += w + rnd.choice([0, 0, 0.3])
+                x += rnd.uniform(6, 40)
+        rnd.shuffle(chars)
+        out.append((p, chars))
+    return out
+
+
+def best_of(repeat, fn, *args):
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        result = fn(*args)
+        best = min(best, time.perf_counter() - t0)
+    return best * 1e3, result
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--pdf", type=Path, default=DEFAULT_PDF)
+    ap.add_argument("--pages", type=int, nargs="+", default=TARGET_PAGES)
+    ap.add_argument("--repeat", type=int, default=5)
+    args = ap.parse_args()
+
+    try:
+        pages = pdf_pages(args.pdf, args.pages)
+        source = args.pdf.name
+    except (ImportError, OSError) as e:
+        print(f"⚠️ Using synthetic pages ({e})")
+        pages = synthetic_pages(args.pages)
+        source = "synthetic"
+
+    def summary_before(chars):
+        return [line_to_words(ln) for ln in chars_to_lines(chars) if ln]
+
+    def detail_before(chars):
+        words = chars_to_words(chars, X_TOL, Y_TOL)
+        return words, group_by_y(words, Y_TOL)
+
+    def detail_after(chars):
+        words = pdfplumber_chars.chars_to_words(chars, X_TOL, Y_TOL)
+        return words, pdfplumber_chars.group_by_y(words, Y_TOL)
+
+    print(f"{source}: best of {args.repeat}, ms per page\n")
+    print(f"{'page':>5}{'chars':>8}{'summary before':>16}{'after':>9}{'speedup':>9}"
+          f"{'detail before':>15}{'after':>9}{'speedup':>9}")
+    ok = True
+    for page, chars in pages:
+        s_before, s_ref = best_of(args.repeat, summary_before, chars)
+        s_after, s_out = best_of(args.repeat, pdfplumber_chars.chars_to_line_words, chars)
+        d_before, d_ref = best_of(args.repeat, detail_before, chars)
+        d_after, d_out = best_of(args.repeat, detail_after, chars)
+        same = s_ref == s_out and d_ref == d_out
+        ok &= same
+        print(f"{page:>5}{len(chars):>8}{s_before:>16.2f}{s_after:>9.2f}{s_before / s_after:>8.1f}x"
+              f"{d_before:>15.2f}{d_after:>9.2f}{d_before / d_after:>8.1f}x"
+              f"{'' if same else '   ❌ output differs'}")
+    print("\nOutput identical:", ok)
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
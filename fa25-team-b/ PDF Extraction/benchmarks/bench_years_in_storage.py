@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Benchmark: Years in Storage parser, per-page pdftotext calls vs one batched extraction.
+
+Builds a synthetic 1,000-page asset report (see pdf_fixtures.py) and times:
+  * before – the old spawn pattern: `pdfinfo`, one plain `pdftotext -f p -l p`
+             per page, then one layout `pdftotext` per grid page
+  * after  – extract_years_in_storage() on a cold pdftext cache: one layout
+             extraction for the whole document, indexed once (page_index.py),
+             then only the grid pages are parsed
+
+Both paths feed the same grid parser, so the resulting tables must be equal.
+
+Usage:
+    python benchmarks/bench_years_in_storage.py [--pages 1000] [--keep DIR]
+"""
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+HERE = Path(__file__).resolve().parent
+sys.path.insert(0, str(HERE.parent))
+
+from pdf_fixtures import build_asset_report_fixture  # noqa: E402
+
+
+class SpawnCounter:
+    """Counts child processes started through subprocess while active."""
+
+    def __init__(self):
+        self.count = 0
+        self._orig = subprocess.Popen
+
+    def __enter__(self):
+        counter = self
+
+        class CountingPopen(self._orig):
+            def __init__(self, *args, **kwargs):
+                counter.count += 1
+                super().__init__(*args, **kwargs)
+
+        subprocess.Popen = CountingPopen
+        return self
+
+    def __exit__(self, *exc):
+        subprocess.Popen = self._orig
+
+
+def legacy_page_texts(pdf_path: Path):
+    """Reproduce the old spawn pattern and return (layout_text, plain_pages) for the parser."""
+    info = subprocess.check_output(["pdfinfo", str(pdf_path)]).decode()
+    n = int(next(l for l in info.splitlines() if l.strip().startswith("Pages:")).split(":")[1])
+
+    plain_pages = []
+    for p in range(1, n + 1):
+        plain_pages.append(subprocess.check_output(
+            ["pdftotext", "-f", str(p), "-l", str(p), str(pdf_path), "-"]
+        ).decode(errors="ignore").replace("\r\n", "\n").rstrip("\f"))
+
+    layout_pages = [""] * n
+    for p, txt in enumerate(plain_pages, start=1):
+        if "Years in Storage (EGMs Only)" in txt:
+            layout_pages[p - 1] = subprocess.check_output(
+                ["pdftotext", "-f", str(p), "-l", str(p), "-layout", str(pdf_path), "-"]
+            ).decode("utf-8", errors="ignore").replace("\r\n", "\n").rstrip("\f")
+
+    return "".join(pg + "\f" for pg in layout_pages), plain_pages
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--pages", type=int, default=1000)
+    ap.add_argument("--keep", type=Path, help="keep the fixture and cache in this folder")
+    args = ap.parse_args()
+
+    work = args.keep or Path(tempfile.mkdtemp(prefix="bench_yis_"))
+    os.environ["PDFTEXT_CACHE_DIR"] = str(work / "cache")
+
+    # Import after PDFTEXT_CACHE_DIR is set so the benchmark never touches the real cache
+    import FY2022_Asset_Report_Extraction as fy22
+    import page_index
+
+    pdf = build_asset_report_fixture(work / "asset_report_fixture.pdf", args.pages)
+    print(f"Fixture: {pdf} ({args.pages} pages)\n")
+
+    with SpawnCounter() as spawns:
+        t0 = time.perf_counter()
+        layout_text, plain_pages = legacy_page_texts(pdf)
+        # The old parser found grid pages and months by scanning every plain-text page
+        before_index = page_index.build_index(plain_pages)
+        before_df = fy22.extract_years_in_storage(pdf, document=layout_text, index=before_index)
+        before_s = time.perf_counter() - t0
+    before_spawns = spawns.count
+
+    with SpawnCounter() as spawns:
+        t0 = time.perf_counter()
+        after_df = fy22.extract_years_in_storage(pdf)
+        after_s = time.perf_counter() - t0
+    after_spawns = spawns.count
+
+    with SpawnCounter() as spawns:
+        t0 = time.perf_counter()
+        warm_df = fy22.extract_years_in_storage(pdf)
+        warm_s = time.perf_counter() - t0
+    warm_spawns = spawns.count
+
+    print(f"\n{'mode':<28}{'wall (s)':>10}{'spawns':>10}{'rows':>8}")
+    print(f"{'before: per-page calls':<28}{before_s:>10.2f}{before_spawns:>10}{len(before_df):>8}")
+    print(f"{'after: batched, cold cache':<28}{after_s:>10.2f}{after_spawns:>10}{len(after_df):>8}")
+    print(f"{'after: batched, warm cache':<28}{warm_s:>10.2f}{warm_spawns:>10}{len(warm_df):>8}")
+
+    same = before_df.equals(after_df) and after_df.equals(warm_df)
+    print(f"\nIdentical output: {'yes' if same else 'NO'}")
+    sys.exit(0 if same else 1)
+
+
+if __name__ == "__main__":
+    main()
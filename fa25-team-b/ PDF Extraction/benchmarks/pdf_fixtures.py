@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+"""
+Synthetic PDF fixtures for the extraction benchmarks.
+
+The real ARMP reports are large and not all of them are committed, so the
+benchmarks build their own text-only PDFs: one Courier text line per entry,
+which `pdftotext -layout` turns back into column-aligned lines. No third-party
+PDF library is needed.
+"""
+import calendar
+from pathlib import Path
+from typing import List
+
+PAGE_W, PAGE_H = 792, 612          # landscape letter, like the asset reports
+FONT_SIZE, LEADING = 7, 8.5
+MARGIN_X, MARGIN_TOP = 18, 594
+
+
+def _escape(s: str) -> str:
+    return s.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def write_text_pdf(path: Path, pages: List[List[str]]) -> Path:
+    """Write a minimal PDF with one page per entry of `pages` (a list of text lines)."""
+    objects: List[bytes] = []
+
+    def add(body: bytes) -> int:
+        objects.append(body)
+        return len(objects)
+
+    catalog = add(b"")                    # filled in once the page tree exists
+    pages_obj = add(b"")
+    font = add(b"<< /Type /Font /Subtype /Type1 /BaseFont /Courier /Encoding /WinAnsiEncoding >>")
+
+    kids = []
+    for lines in pages:
+        ops = [f"BT /F1 {FONT_SIZE} Tf {LEADING} TL {MARGIN_X} {MARGIN_TOP} Td"]
+        for line in lines:
+            ops.append(f"({_escape(line)}) Tj T*")
+        ops.append("ET")
+        stream = "\n".join(ops).encode("latin-1", errors="replace")
+        content = add(b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream")
+        kids.append(add(
+            f"<< /Type /Page /Parent {pages_obj} 0 R /MediaBox [0 0 {PAGE_W} {PAGE_H}] "
+            f"/Resources << /Font << /F1 {font} 0 R >> >> /Contents {content} 0 R >>".encode()
+        ))
+
+    objects[catalog - 1] = f"<< /Type /Catalog /Pages {pages_obj} 0 R >>".encode()
+    objects[pages_obj - 1] = (
+        f"<< /Type /Pages /Kids [{' '.join(f'{k} 0 R' for k in kids)}] /Count {len(kids)} >>".encode()
+    )
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for num, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += f"{num} 0 obj\n".encode() + body + b"\nendobj\n"
+    xref = len(out)
+    out += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode()
+    for off in offsets:
+        out += f"{off:010d} 00000 n \n".encode()
+    out += f"trailer\n<< /Size {len(objects) + 1} /Root {catalog} 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode()
+
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(bytes(out))
+    return path
+
+
+# =============================== ASSET REPORT FIXTURE ===============================
+FY_MONTHS = [(10, 2021), (11, 2021), (12, 2021), (1, 2022), (2, 2022), (3, 2022),
+             (4, 2022), (5, 2022), (6, 2022), (7, 2022), (8, 2022), (9, 2022)]
+
+
+def _region_page(month: str) -> List[str]:
+    return [
+        f"EGMs by Region, Service for month of {month}",
+        "",
+        "              # Locations   Army   Navy   Marine   Airforce   Total   %",
+        "Europe        40            310    25     0        0          335     31%",
+        "Japan         35            120    260    290      45         715     66%",
+        "Korea         12            30     0      0        0          30      3%",
+        "Total         87            460    285    290      45         1080    100%",
+        "",
+        f"EGMs by Field Office for month of {month}",
+        "",
+        "Europe   Slots   ACM   ITC   FRS   Total",
+        "10   KAISERSLAUTERN   120   3   2   1   126",
+        "11   STUTTGART   80   2   1   0   83",
+        "Europe Total   200   5   3   1   209",
+        "40%   1%   1%   0%   42%",
+        "Japan   Slots   ACM   ITC   FRS   Total",
+        "20   OKINAWA   300   4   2   1   307",
+        "Japan Total   300   4   2   1   307",
+        "ARMP Total   500   9   5   2   516",
+    ]
+
+
+def _columns(widths: List[int], cells: List[str]) -> str:
+    return "".join(c.ljust(w) for c, w in zip(cells, widths)).rstrip()
+
+
+def _installed_assets_page(seed: int) -> List[str]:
+    counts = lambda k: "   ".join(str((seed + k + c) % 9) for c in range(7))
+    return [
+        "Installed Assets by Location, Manufacture",
+        "",
+        "Europe   FO #   Loc   Svc   NOV   AIN   IGT   WMS   BAL   KON   ITE   Tot/EGMs   FRS   ACM   ITC   Total",
+        f"Ramstein Club   10   3001   Army   {counts(0)}   11   1   2   -   0   14",
+        f"Patch Barracks   11   3002   Army   {counts(1)}   5   0   1   -   0   6",
+        f"KAISERSLAUTERN Subtotal   {counts(2)}   16   1   3   -   0   20",
+        "Japan   FO #   Loc   Svc   NOV   AIN   IGT   WMS   BAL   KON   ITE   Tot/EGMs   FRS   ACM   ITC   Total",
+        f"Kadena Club   20   3101   Air Force   {counts(3)}   9   0   1   -   0   10",
+        f"Camp Foster   20   3102   Marine Corps   {counts(4)}   7   0   0   -   0   7",
+        f"ARMP Total   {counts(5)}   48   1   6   -   0   57",
+    ]
+
+
+def _asset_details_page(report_date: str, seed: int) -> List[str]:
+    lines = [
+        "Installed Assets by Location",
+        "",
+        "REGION  FONUM  FOSHORT  Loc  LNAME  Asset  Class  Desc  Type  Aquire  Effective  SerialNum  "
+        f"PLACE  Age  Years in Storage  Months    {report_date}",
+    ]
+    for r in range(12):
+        lines.append(f"Europe  10  KAISERSLAUTERN  {3001 + r % 3}  Ramstein Club  {200000 + seed * 100 + r}  01  "
+                     f"Slot machine  4100  01/05/2015  02/01/2015  AB-{seed:02d}{r:02d}  Floor  {r % 9}  0  {r % 4}")
+    return lines
+
+
+def _floor_page(seed: int) -> List[str]:
+    lines = ["Loc  PLACE  REGION  SVC  Asset  SerialNum  Type  Desc  Acquire  Effective  Disposed  "
+             "Class  MFG  LNAME  FONUM  FOSHORT  Cat  Year  Age"]
+    for r in range(12):
+        lines.append(f"{3001 + r % 3}  Floor  Europe  Army  {300000 + seed * 100 + r}  FL-{seed:02d}{r:02d}  4100  "
+                     f"Slot machine  01/05/2015  02/01/2015  -  01  IGT  Ramstein Club  10  KAISERSLAUTERN  "
+                     f"A  {2010 + r % 9}  {r % 12}")
+    return lines
+
+
+SITE_WIDTHS = [6, 18, 8, 12, 12, 5, 9, 6, 7, 16, 7, 18, 8, 9, 20]
+
+
+def _site_status_page(seed: int) -> List[str]:
+    header = ["Loc", "LNAME", "PLACE", "Open", "Closed", "KSI", "CmtyNum", "SVC", "FONUM",
+              "FOSHORT", "FOM", "EMAIL", "REGNUM", "Region", "Message"]
+    lines = ["Site Operational Status", "", _columns(SITE_WIDTHS, header)]
+    for r in range(8):
+        closed = "6/30/2021" if r % 4 == 3 else ""
+        lines.append(_columns(SITE_WIDTHS, [
+            str(3001 + r), f"Club {seed:02d}-{r}", "Club", "1/1/2010", closed, "Y", str(100 + r),
+            "Army", "10", "KAISERSLAUTERN", "Smith", "fom@example.mil", "1", "Europe",
+            "Closed" if closed else "Open",
+        ]))
+    return lines
+
+
+def _filler_page(page_no: int) -> List[str]:
+    lines = ["REGION FONUM FOSHORT  Loc  LNAME                Asset  Class  Desc          Type"]
+    for r in range(60):
+        lines.append(f"Japan  {10 + r % 7:<5} OKINAWA  {3000 + r:<4} Club {page_no:04d}-{r:02d}        "
+                     f"{100000 + page_no * 60 + r:<6} 01     Slot machine  4100")
+    return lines
+
+
+def _storage_grid_page(seed: int) -> List[str]:
+    header = "Age " + "".join(f"{i:<5}" for i in range(15)) + "  Total by Age"
+    tot_start = header.find("by Age")
+    lines = ["Years in Storage (EGMs Only)", "", header]
+    col_tot = [0] * 15
+    for age in range(26):
+        counts = [(seed + age * 3 + c) % 7 for c in range(15)]
+        col_tot = [a + b for a, b in zip(col_tot, counts)]
+        row = f"{age:<4}" + "".join(f"{c:<5}" for c in counts)
+        lines.append(row.ljust(tot_start) + str(sum(counts)))
+    lines.append(("    " + "".join(f"{c:<5}" for c in col_tot)).ljust(tot_start) + str(sum(col_tot)))
+    lines += ["", "Months in storage  12 11 10 9 8 7 6 5 4 3 2 1",
+              "EGMs               " + " ".join(str((seed + k) % 9) for k in range(12)) + " 54"]
+    return lines
+
+
+def build_asset_report_fixture(path: Path, n_pages: int = 1000) -> Path:
+    """
+    An FY-style asset report: 12 monthly blocks, each with one page per table
+    (region/field office, installed assets, asset details, floor details,
+    Years in Storage grid, site status) and filler pages.
+    """
+    per_month = max(7, n_pages // len(FY_MONTHS))
+    pages: List[List[str]] = []
+    for idx, (mon, year) in enumerate(FY_MONTHS):
+        month = f"{calendar.month_name[mon]} {year}"
+        report_date = f"{mon}/{calendar.monthrange(year, mon)[1]}/{year}"
+        block = [_region_page(month), _installed_assets_page(idx), _asset_details_page(report_date, idx),
+                 _floor_page(idx), _storage_grid_page(idx), _site_status_page(idx)]
+        while len(block) < per_month:
+            block.append(_filler_page(len(pages) + len(block) + 1))
+        pages.extend(block)
+    while len(pages) < n_pages:
+        pages.append(_filler_page(len(pages) + 1))
+    return write_text_pdf(path, pages[:n_pages])
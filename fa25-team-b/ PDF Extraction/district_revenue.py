@@ -0,0 +1,704 @@
+#!/usr/bin/env python3
+"""
+District Revenues FY20–FY24 parser (PyMuPDF), shared by District_Revenues_FY20_FY24.ipynb.
+
+    python "PDF Extraction/district_revenue.py" [--filtered audit.pdf] [--jobs 4]
+    df = extract_district_revenue(SRC_PDF, OUT_CSV)
+
+  1. preselect_table_pages – the pages holding revenue/reimbursement tables,
+                             classified in worker processes; their text is
+                             kept for the parser
+  2. parse_doc_pages       – one row per (line, month) of those pages, read
+                             straight from the source document, with the
+                             service filled back from each block's totals line
+  3. patch_hario_2020      – manual patch for Sasebo Navy – Hario (FY2020 Feb–Sep)
+  4. canonicalize_bases    – base name fixes (Camp Hanson → Camp Hansen, ...)
+
+The source PDF is opened once for the whole run. Writing the kept pages to a
+filtered PDF (build_filtered_pdf / write_filtered_pdf) is only needed as an
+audit copy; parsing no longer goes through it.
+
+Parsed rows stay in a DistrictRows accumulator until the end: it keeps them
+in output order with a dict from the normalized (Base, Location, Category,
+Month, Year) key to their positions, so a patch is one lookup and the
+DataFrame is built once. (The notebook used to scan and re-normalize the
+whole DataFrame for every patched cell and grow it one `df.loc` row at a
+time.)
+"""
+import argparse
+import os
+import re
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+import fitz
+import numpy as np
+import pandas as pd
+
+from line_matcher import LineMatcher
+
+# ============================= CONFIGURATION =============================
+HERE = Path(__file__).resolve().parent
+PROJECT_ROOT = HERE.parent
+SRC_PDF = PROJECT_ROOT / "pdf" / "District Revenues FY20-FY24.pdf"
+FILTERED_PDF = PROJECT_ROOT / "pdf" / "District Revenues FY20-FY24_FILTERED.pdf"
+OUT_CSV = PROJECT_ROOT / "CSVs" / "District Revenue" / "District_Revenue_filtered_FY20-FY24_final.csv"
+
+OUTPUT_COLUMNS = ["Service", "Category", "Region", "Base", "Location", "Month", "Year", "Amount"]
+
+# Worker processes classifying pages during preselection (0 = one per CPU core, 1 = in-process)
+PRESELECT_JOBS = int(os.environ.get("DISTRICT_PRESELECT_JOBS", "0"))
+
+
+def resolve_jobs(jobs: int) -> int:
+    return (os.cpu_count() or 1) if jobs <= 0 else jobs
+
+
+# ---------------- Month helpers ----------------
+MONTH_TOKEN_RE = re.compile(
+    r"^(?:\d{2,4}[-/])?(Jan(?:uary)?|Feb(?:ruary)?|Mar(?:ch)?|Apr(?:il)?|"
+    r"May|Jun(?:e)?|Jul(?:y)?|Aug(?:ust)?|Sep(?:t|tember)?|Oct(?:ober)?|"
+    r"Nov(?:ember)?|Dec(?:ember)?)(?:[-/]\d{2,4})?$", re.I
+)
+MONTH_NAMES_FULL = ["October","November","December","January","February","March",
+                    "April","May","June","July","August","September"]
+FISCAL_RE = re.compile(r"Fiscal\s+Year\s+(\d{4})", re.I)
+
+def normalise_month(name: str) -> Optional[str]:
+    if not name: return None
+    s = name.strip().rstrip('.').lower()
+    m = {
+        "jan":"January","january":"January",
+        "feb":"February","february":"February",
+        "mar":"March","march":"March",
+        "apr":"April","april":"April",
+        "may":"May",
+        "jun":"June","june":"June",
+        "jul":"July","july":"July",
+        "aug":"August","august":"August",
+        "sep":"September","sept":"September","september":"September",
+        "oct":"October","october":"October",
+        "nov":"November","november":"November",
+        "dec":"December","december":"December",
+    }
+    for k,v in m.items():
+        if s.startswith(k): return v
+    return None
+
+def extract_fiscal_year(text: str) -> Optional[int]:
+    m = FISCAL_RE.search(text)
+    return int(m.group(1)) if m else None
+
+# 🔧 Detect month column centers and column bins (with tolerance) for coordinate-based projection
+def extract_month_columns(page: fitz.Page, words: Optional[List[tuple]] = None) -> Tuple[List[str], List[float], List[Tuple[float,float]]]:
+    if words is None:
+        words = page.get_text("words")  # [x0,y0,x1,y1,text,block_no,line_no,word_no]
+    lines: Dict[float, List[Tuple[float,float,str]]] = {}
+    for x0,y0,x1,y1,txt, *_ in words:
+        y = round(y0, 1)
+        xc = (x0 + x1) / 2.0
+        lines.setdefault(y, []).append((xc, x1 - x0, txt))
+
+    for y, toks in sorted(lines.items(), key=lambda kv: kv[0]):
+        month_hits = []
+        for xc, w, t in sorted(toks, key=lambda z: z[0]):
+            tt = t.strip().replace('.', '')
+            if MONTH_TOKEN_RE.match(tt):
+                m = normalise_month(tt)
+                if m: month_hits.append((xc, m))
+        if len(month_hits) >= 8:
+            month_hits = sorted(month_hits, key=lambda z: z[0])
+            centers, names = [], []
+            for xc, m in month_hits:
+                if m in MONTH_NAMES_FULL and m not in names:
+                    names.append(m); centers.append(xc)
+            if centers:
+                # Fill up to 12 columns
+                gap = np.median(np.diff(centers)) if len(centers) >= 2 else 60.0
+                first_x = centers[0] - gap*(MONTH_NAMES_FULL.index(names[0]))
+                centers_full = [first_x + i*gap for i in range(12)]
+                bins = _to_bins_with_tolerance(centers_full)
+                return MONTH_NAMES_FULL, centers_full, bins
+    # fallback
+    centers = [100 + i*60 for i in range(12)]
+    return MONTH_NAMES_FULL, centers, _to_bins_with_tolerance(centers)
+
+def _to_bins_with_tolerance(centers: List[float]) -> List[Tuple[float,float]]:
+    centers = list(centers)
+    gaps = np.diff(centers) if len(centers) >= 2 else np.array([60.0]*11)
+    gap_med = float(np.median(gaps)) if len(gaps) else 60.0
+    tol = max(8.0, 0.10 * gap_med)  # tolerance: expand left/right
+    edges = [centers[0] - gap_med/2] + [(centers[i]+centers[i+1])/2 for i in range(11)] + [centers[-1] + gap_med/2]
+    return [(edges[i]-tol, edges[i+1]+tol) for i in range(12)]
+
+# 🔧 More permissive numeric detection/parsing to avoid zeros from decimals or stray symbols
+def is_value_token(tok: str) -> bool:
+    s = tok.strip()
+    s = re.sub(r"[,\s$]+", "", s)
+    s = re.sub(r"[^\d().-]", "", s)
+    return bool(re.fullmatch(r"-?\(?\d+(?:\.\d+)?\)?", s))
+
+def parse_number(tok: str) -> Optional[float]:
+    s = tok.strip()
+    s = re.sub(r"[,\s$]+", "", s)
+    s = re.sub(r"[^\d().-]", "", s)
+    if s.startswith("(") and s.endswith(")"): s = "-" + s[1:-1]
+    try: return float(s)
+    except: return None
+
+# ---------------- Common regex pieces ----------------
+TOTAL_WORD   = r"(?:T?otal)"
+REGION_NORM  = r"(Europe|Korea|Japan)"  # Far East is excluded from totals
+SERVICE_NORM = r"(Army|Navy|USMC)"
+REIMB_WORD   = r"(?:NAFI\s+Reimb(?:\.|ursement)?)"
+REIMB_TOKEN  = re.compile(r"\bNAFI\s+Reimb(?:\.|ursement)?\b", re.I)
+
+# ---------------- Page pre-filter ----------------
+HEADER_PATTERNS = [
+    rf"Slot\s+Revenue\s+({REGION_NORM}|Far\s*East)",
+    rf"Slot\s+NAFI\s+Reimb(?:\.|ursement)?\s+({REGION_NORM}|Far\s*East)",
+    rf"Slot\s+Revenue\s*&\s*NAFI\s+Reimb(?:\.|ursement)?\s+by\s+Month\s*-\s*({REGION_NORM}|Far\s*East)",
+    rf"Reimbursement\s+by\s+Month\s*-\s*({REGION_NORM}|Far\s*East)",
+    rf"\bnue\s+({REGION_NORM}|Far\s*East)\b",
+]
+HEADER_RES = [re.compile(p, re.I) for p in HEADER_PATTERNS]
+HEADER_MARKERS = LineMatcher(patterns={f"header_{i}": p for i, p in enumerate(HEADER_RES)})
+
+TOTAL_PATTERNS = [
+    rf"{TOTAL_WORD}\s+{REGION_NORM}\s+Slot\s+Revenue\s+{SERVICE_NORM}",
+    rf"{TOTAL_WORD}\s+{REGION_NORM}\s+{REIMB_WORD}\s+{SERVICE_NORM}",
+    rf"Slot\s+Revenue\s+{REGION_NORM}\s+{SERVICE_NORM}",
+    rf"Slot\s+NAFI\s+Reimb(?:\.|ursement)?\s+{REGION_NORM}\s+{SERVICE_NORM}",
+]
+TOTAL_RES = [re.compile(p, re.I) for p in TOTAL_PATTERNS]
+TOTAL_MARKERS = LineMatcher(patterns={f"total_{i}": p for i, p in enumerate(TOTAL_RES)})
+
+MONTH_BAR_RE = re.compile(
+    r"October.*November.*December.*January.*February.*March.*April.*May.*June.*July.*August.*September",
+    re.I | re.S
+)
+MONTH_WORDS = LineMatcher(patterns={m: re.compile(rf"\b{m}\b", re.I) for m in MONTH_NAMES_FULL})
+
+def page_has_header(text: str) -> bool:
+    t = " ".join(text.split())
+    return HEADER_MARKERS.search(t)
+
+def page_has_total(text: str) -> bool:
+    t = " ".join(text.split())
+    return TOTAL_MARKERS.search(t)
+
+def page_has_month_bar(text: str) -> bool:
+    if MONTH_BAR_RE.search(text): return True
+    cnt = len(MONTH_WORDS.hits(text))
+    return cnt >= 8
+
+# (page index, has a header or totals line, has a month bar, page text)
+PageClass = Tuple[int, bool, bool, str]
+
+def classify_pages(doc: fitz.Document, pages: Iterable[int]) -> List[PageClass]:
+    out = []
+    for i in pages:
+        text = doc[i].get_text()
+        out.append((i, page_has_header(text) or page_has_total(text), page_has_month_bar(text), text))
+    return out
+
+def _classify_chunk(pdf_path: str, pages: List[int]) -> List[PageClass]:
+    """Worker: classify a run of pages from the worker's own handle on the PDF."""
+    doc = fitz.open(pdf_path)
+    try:
+        return classify_pages(doc, pages)
+    finally:
+        doc.close()
+
+def select_table_pages(classes: Iterable[PageClass]) -> Dict[int, str]:
+    """Kept pages in order → their text: table pages, plus month-bar pages continuing a table block."""
+    keep, in_block = {}, False
+    for i, is_table, has_month_bar, text in classes:
+        if is_table:
+            in_block = True; keep[i] = text; continue
+        if in_block and has_month_bar:
+            keep[i] = text; continue
+        in_block = False
+    return keep
+
+def preselect_table_pages(doc: fitz.Document, jobs: Optional[int] = None) -> Dict[int, str]:
+    """
+    Pages holding revenue/reimbursement tables → their text (reused by the parser).
+
+    Pages are classified in `jobs` worker processes (None: PRESELECT_JOBS), each
+    opening the PDF itself; the block scan over the results runs here, in page order.
+    """
+    jobs = resolve_jobs(PRESELECT_JOBS if jobs is None else jobs)
+    pages = list(range(doc.page_count))
+    if jobs <= 1 or len(pages) < 2 * jobs or not doc.name:
+        return select_table_pages(classify_pages(doc, pages))
+    size = -(-len(pages) // jobs)
+    chunks = [pages[i:i + size] for i in range(0, len(pages), size)]
+    with ProcessPoolExecutor(max_workers=len(chunks)) as pool:
+        classes = [c for chunk in pool.map(_classify_chunk, repeat(doc.name), chunks) for c in chunk]
+    return select_table_pages(classes)
+
+# ---------------- Line-level regex ----------------
+HEADER_REV_LINE_RE    = re.compile(rf"Slot\s+Revenue\s+{REGION_NORM}", re.I)
+HEADER_REIMB_LINE_RE  = re.compile(rf"Slot\s+NAFI\s+Reimb(?:\.|ursement)?\s+{REGION_NORM}", re.I)
+TRUNC_REV_LINE_RE     = re.compile(rf"\b(nue|enue)\s+{REGION_NORM}\b", re.I)
+
+TOP_TITLE_FE_RE = re.compile(
+    r"Slot\s+Revenue\s*&\s*NAFI\s+Reimb(?:\.|ursement)?\s+by\s+Month\s*-\s*Far\s*East",
+    re.I
+)
+
+TOTAL_LINE_A = re.compile(rf"Slot\s+Revenue\s+{REGION_NORM}\s+{SERVICE_NORM}\s*:?", re.I)
+TOTAL_LINE_D = re.compile(rf"Slot\s+NAFI\s+Reimb(?:\.|ursement)?\s+{REGION_NORM}\s+{SERVICE_NORM}\s*:?", re.I)
+TOTAL_LINE_B = re.compile(rf"{TOTAL_WORD}\s+{REGION_NORM}\s+Slot\s+Revenue\s+{SERVICE_NORM}\s*:?", re.I)
+TOTAL_LINE_C = re.compile(rf"{TOTAL_WORD}\s+{REGION_NORM}\s+{REIMB_WORD}\s+{SERVICE_NORM}\s*:?", re.I)
+TOTAL_LINE_E = re.compile(
+    rf"Slot\s+(?:Revenue|NAFI\s+Reimb(?:\.|ursement)?)\s+{REGION_NORM}\b.*?\b{SERVICE_NORM}\b",
+    re.I
+)
+
+def _service_norm(s: str) -> str:
+    s = s.strip().strip(":).(").upper()
+    if s.startswith("USMC"): return "USMC"
+    if s.startswith("NAVY"): return "Navy"
+    if s.startswith("ARMY"): return "Army"
+    return s.title()
+
+def _category_from_line(line: str) -> Optional[str]:
+    if re.search(r"\bSlot\s+Revenue\b", line, re.I):
+        return "Revenue"
+    if REIMB_TOKEN.search(line):
+        return "Reimbursement"
+    return None
+
+def _pick_total_match(line: str) -> Optional[Tuple[str, str, str]]:
+    for pat, cat in [
+        (TOTAL_LINE_B, "Revenue"), (TOTAL_LINE_A, "Revenue"),
+        (TOTAL_LINE_C, "Reimbursement"), (TOTAL_LINE_D, "Reimbursement"),
+        (TOTAL_LINE_E, None),
+    ]:
+        m = pat.search(line)
+        if m:
+            region = m.group(1).title()
+            service = _service_norm(m.group(2))
+            category = cat if cat else _category_from_line(line) or "Revenue"
+            return (region, service, category)
+    low = line.lower()
+    if (("slot revenue" in low) or ("reimb" in low)) and any(r in low for r in ("europe","korea","japan")):
+        ms = re.search(r"\b(Army|Navy|USMC)\b[:)]?", line, re.I)
+        rg = re.search(rf"\b{REGION_NORM}\b", line, re.I)
+        if ms and rg:
+            region = rg.group(1).title()
+            service = _service_norm(ms.group(1))
+            category = "Reimbursement" if "reimb" in low else "Revenue"
+            return (region, service, category)
+    return None
+
+# ---------------- Slot name builder (hyphen-aware) ----------------
+# 🔧 New: merge ["K","-","16"] into "K-16"; drop standalone dashes and pure-symbol tokens
+def build_slot_name(tokens: List[str]) -> str:
+    clean = []
+    for t in tokens:
+        tt = t.strip()
+        if not tt: continue
+        if tt in ("-","–","—"):  # keep dash token; merging is handled below
+            clean.append(tt)
+            continue
+        # Drop tokens with no letters or digits (pure symbols)
+        if not re.search(r"[A-Za-z0-9]", tt):
+            continue
+        clean.append(tt)
+
+    # Merge: token, dash, token  → "token-token" (absorb repeated patterns)
+    out = []
+    i = 0
+    while i < len(clean):
+        cur = clean[i]
+        if cur in ("-","–","—"):
+            # dash with no neighbors → skip
+            i += 1
+            continue
+        # If next is a dash and the next-next has alphanum → merge
+        if (i + 2 < len(clean)) and clean[i+1] in ("-","–","—") and re.search(r"[A-Za-z0-9]", clean[i+2]):
+            merged = f"{cur}-{clean[i+2]}"
+            i += 3
+            # absorb successive "- X" patterns
+            while (i + 1 < len(clean)) and clean[i] in ("-","–","—") and re.search(r"[A-Za-z0-9]", clean[i+1]):
+                merged += f"-{clean[i+1]}"
+                i += 2
+            out.append(merged)
+            continue
+        # Otherwise keep as-is
+        out.append(cur)
+        i += 1
+
+    # Join with spaces
+    return " ".join(out).strip()
+
+# ---------------- Page parser ----------------
+def parse_page(page: fitz.Page,
+               default_fy: Optional[int] = None,
+               default_region: Optional[str] = None,
+               default_category: Optional[str] = None,
+               default_subregion: Optional[str] = None,
+               text: Optional[str] = None
+               ) -> Tuple[List[Dict[str, Any]], Optional[str], Optional[str], Optional[int], List[Tuple[int,str,str,str]], Optional[str]]:
+
+    if text is None:  # preselection already extracted it
+        text = page.get_text()
+    fy = extract_fiscal_year(text) or default_fy
+
+    words = page.get_text("words")
+
+    # 12 month columns by coordinates
+    header_months, month_centers, month_bins = extract_month_columns(page, words)
+    month_left_edge = month_bins[0][0]          # 🔧 left boundary of month area
+    sep_right_edge  = month_bins[-1][1]         # right boundary of September column (ignore anything to the right)
+
+    # Keep x_center and original boxes per line
+    lines: Dict[float, List[Tuple[float, float, float, str]]] = {}
+    for x0,y0,x1,y1,txt, *_ in words:
+        y = round(y0, 1)
+        xc = (x0 + x1) / 2.0
+        lines.setdefault(y, []).append((xc, x0, x1, txt.strip()))
+
+    records: List[Dict[str, Any]] = []
+    totals_in_order: List[Tuple[int,str,str,str]] = []
+
+    current_country   = default_region
+    current_subregion = default_subregion
+    current_category  = default_category
+
+    line_no = 0
+    for _, toks in sorted(lines.items(), key=lambda x: x[0]):
+        line_no += 1
+        toks = [(xc,x0,x1,t) for (xc,x0,x1,t) in toks if t and t != "$"]
+        if not toks: continue
+
+        # Loc#
+        if re.fullmatch(r'\d{3,5}', toks[0][3]):
+            toks = toks[1:]
+            if not toks: continue
+
+        line = " ".join(t for *_, t in toks)
+        low  = line.lower()
+
+        if TOP_TITLE_FE_RE.search(line): continue
+
+        m = HEADER_REV_LINE_RE.search(line)
+        if m: current_country, current_category = m.group(1).title(), "Revenue";        current_subregion = None
+        m2 = HEADER_REIMB_LINE_RE.search(line)
+        if m2: current_country, current_category = m2.group(1).title(), "Reimbursement"; current_subregion = None
+        m3 = TRUNC_REV_LINE_RE.search(line)
+        if m3: current_country, current_category = m3.group(2).title(), "Revenue";       current_subregion = None
+
+        ts = _pick_total_match(line)
+        if ts:
+            region, service, category_from_line = ts
+            totals_in_order.append((line_no, region, category_from_line, service))
+            continue
+
+        if low.startswith("fiscal year"): continue
+        if any(k in low for k in (" avg ", "avg slots", "slots avg", "average", " ytd ")): continue
+        if "as400" in low or "f&a" in low: continue
+
+        # 🔧 Treat only numbers to the RIGHT of the left month boundary as month values;
+        # numbers on the left are not months
+        numeric_positions = [i for i,(xc,_,_,t) in enumerate(toks) if is_value_token(t) and xc >= month_left_edge]
+        if not numeric_positions:
+            # likely a subregion / section title line
+            if any(re.search(r"[A-Za-z]", t) for *_,t in toks):
+                month_bar = sum(1 for *_,t in toks if MONTH_TOKEN_RE.match(t)) >= 8
+                if month_bar: continue
+                if "total" in low or "otal" in low: continue
+                current_subregion = " ".join(t for *_,t in toks)
+            continue
+
+        if not current_country or not current_category or fy is None:
+            continue
+
+        first_num_idx = min(numeric_positions)
+        first_num_xc  = toks[first_num_idx][0]
+
+        # 🔧 slot name = all tokens LEFT of the first month value’s center (keep hyphens)
+        slot_tokens_raw = [t for (xc,_,_,t) in toks if xc < first_num_xc - 1.0]
+        slot_name = build_slot_name(slot_tokens_raw)
+        if not slot_name: continue
+        if slot_name.isdigit() and len(slot_name) in (3,4): continue
+        if slot_name.lower() in ("fiscal year", "fiscal"): continue
+        if slot_name.lower().startswith(("total ","otal ")): continue
+
+        # Value projection: ignore numbers to the right of the September boundary;
+        # if multiple values fall into the same column, keep the rightmost one
+        values_by_col = ["-"] * 12
+        best_xc = [-1e9] * 12
+        for xc, x0, x1, t in toks[first_num_idx:]:
+            if xc > sep_right_edge:
+                continue
+            if not is_value_token(t):
+                continue
+            for col_idx, (xL, xR) in enumerate(month_bins):
+                if xL <= xc <= xR:
+                    if values_by_col[col_idx] == "-" or xc > best_xc[col_idx]:
+                        values_by_col[col_idx] = t
+                        best_xc[col_idx] = xc
+                    break
+
+        for i, raw_val in enumerate(values_by_col):
+            mname = MONTH_NAMES_FULL[i]
+            yval = (fy - 1) if fy and mname in ("October", "November", "December") else fy
+            amount = 0.0
+            if raw_val != "-":
+                parsed = parse_number(raw_val)
+                if parsed is not None: amount = parsed
+            records.append({
+                "__ord": line_no,
+                "Category": current_category,
+                "Region": current_country,
+                "Base": current_subregion,
+                "Location": slot_name,
+                "Month": mname,
+                "Year": yval,
+                "Amount": amount
+            })
+
+    return records, current_country, current_category, fy, totals_in_order, current_subregion
+
+# ---------------- Filtered PDF (audit copy) ----------------
+def write_filtered_pdf(doc: fitz.Document, keep_pages: Iterable[int], dst_pdf: str) -> None:
+    new_doc = fitz.open()
+    for i in keep_pages:
+        new_doc.insert_pdf(doc, from_page=i, to_page=i)
+    new_doc.save(dst_pdf)
+    new_doc.close()
+
+def build_filtered_pdf(src_pdf: str, dst_pdf: str) -> List[int]:
+    doc = fitz.open(src_pdf)
+    keep_pages = list(preselect_table_pages(doc))
+    write_filtered_pdf(doc, keep_pages, dst_pdf)
+    doc.close()
+    return keep_pages
+
+
+# ---------------- Parse pages ----------------
+def parse_rows(pdf_path: str, max_pages: Optional[int] = None) -> List[Dict[str, Any]]:
+    """Rows of every page of `pdf_path` (e.g. the filtered PDF)."""
+    doc = fitz.open(pdf_path)
+    try:
+        pages = range(doc.page_count) if max_pages is None else range(min(max_pages, doc.page_count))
+        return parse_doc_pages(doc, {i: None for i in pages})
+    finally:
+        doc.close()
+
+def parse_doc_pages(doc: fitz.Document, pages: Dict[int, Optional[str]]) -> List[Dict[str, Any]]:
+    """Rows of the given pages of an open document, in order; `pages` maps index → text already extracted (or None)."""
+    page_indices = list(pages)
+
+    segments: Dict[Tuple[str,str], List[Dict[str,Any]]] = {}
+    final_rows: List[Dict[str,Any]] = []
+
+    last_fy: Optional[int] = None
+    last_region: Optional[str]   = None
+    last_category: Optional[str] = None
+    last_subregion: Optional[str] = None
+
+    for i in page_indices:
+        page = doc[i]
+        recs, end_region, end_category, end_fy, totals_in_order, end_subregion = parse_page(
+            page,
+            default_fy=last_fy,
+            default_region=last_region,
+            default_category=last_category,
+            default_subregion=last_subregion,
+            text=pages[i]
+        )
+        if end_fy is not None: last_fy = end_fy
+        last_region, last_category, last_subregion = end_region, end_category, end_subregion
+
+        events: List[Tuple[int,str,Any]] = []
+        for r in recs: events.append((int(r["__ord"]), "row", r))
+        for (ord_no, region, category, service) in totals_in_order:
+            events.append((ord_no, "total", (region, category, service)))
+        events.sort(key=lambda x: x[0])
+
+        for _, etype, payload in events:
+            if etype == "row":
+                r = payload
+                r.pop("__ord__", None)
+                r.setdefault("Service", None)
+                key = (r["Region"], r["Category"])
+                segments.setdefault(key, []).append(r)
+            else:
+                region, category, service = payload
+                key = (region, category)
+                block = segments.get(key, [])
+                if block:
+                    for rr in block:
+                        rr["Service"] = service
+                        final_rows.append(rr)
+                    segments[key] = []
+
+    for block in segments.values():
+        final_rows.extend(block)
+    return final_rows
+
+def rows_to_frame(rows: List[Dict[str, Any]]) -> pd.DataFrame:
+    df = pd.DataFrame(rows)
+    if not df.empty:
+        df = df.reindex(columns=OUTPUT_COLUMNS).dropna(how="all").reset_index(drop=True)
+    else:
+        df = pd.DataFrame(columns=OUTPUT_COLUMNS)
+    return df
+
+def parse_pdf(pdf_path: str, max_pages: Optional[int] = None) -> pd.DataFrame:
+    return rows_to_frame(parse_rows(pdf_path, max_pages))
+
+# ---------------- Row accumulator ----------------
+def _casefolded(value: Any) -> str:
+    """A text cell as the patches compare it: missing → "", else stripped and casefolded."""
+    return value.strip().casefold() if isinstance(value, str) else ""
+
+class DistrictRows:
+    """Parsed rows in output order, indexed by normalized (Base, Location, Category, Month, Year)."""
+
+    def __init__(self, rows: Iterable[Dict[str, Any]] = ()):
+        self.rows: List[Dict[str, Any]] = []
+        self._index: Dict[Tuple[str, str, str, Any, Any], List[int]] = {}
+        for row in rows:
+            self.append(row)
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    @staticmethod
+    def key(base: Any, location: Any, category: Any, month: Any, year: Any) -> Tuple[str, str, str, Any, Any]:
+        return (_casefolded(base), _casefolded(location), _casefolded(category), month, year)
+
+    def append(self, row: Dict[str, Any]) -> None:
+        key = self.key(row.get("Base"), row.get("Location"), row.get("Category"), row.get("Month"), row.get("Year"))
+        self._index.setdefault(key, []).append(len(self.rows))
+        self.rows.append(row)
+
+    def first(self, predicate: Callable[[Dict[str, Any]], bool]) -> Optional[Dict[str, Any]]:
+        return next((row for row in self.rows if predicate(row)), None)
+
+    def upsert(self, base_row: Dict[str, Any], month: str, year: int, amount: float) -> None:
+        """Set Amount on every row of base_row's Base/Location/Category for (month, year), or add that row."""
+        hits = self._index.get(self.key(base_row["Base"], base_row["Location"], base_row["Category"], month, year))
+        if hits:
+            for i in hits:
+                self.rows[i]["Amount"] = float(amount)
+        else:
+            self.append({
+                "Service":   base_row.get("Service", "Navy"),
+                "Category":  base_row.get("Category", "Revenue"),
+                "Region":   base_row.get("Region", "Japan"),
+                "Base": base_row.get("Base", "Sasebo Navy"),
+                "Location": base_row.get("Location", "Hario"),
+                "Month":     month,
+                "Year":      int(year),
+                "Amount":    float(amount),
+            })
+
+    def to_frame(self) -> pd.DataFrame:
+        return rows_to_frame(self.rows)
+
+# =========================
+# Manual patch: Sasebo Navy - Hario (FY2020 Feb–Sep)
+# =========================
+HARIO_BASE_RE = re.compile(r"\bSasebo\s+Navy\b", re.I)
+HARIO_LOCATION_RE = re.compile(r"\bHario\b", re.I)
+
+# Conservative template when the PDF has no Hario row
+HARIO_TEMPLATE = {
+    "Service":   "Navy",
+    "Category":  "Revenue",
+    "Region":   "Japan",
+    "Base": "Sasebo Navy",
+    "Location": "Hario",
+}
+
+# 2020/Feb–Sep according to the provided figure
+HARIO_2020_FIXES = {
+    "February":  7568,
+    "March":     17708,
+    "April":     0,
+    "May":       0,
+    "June":      0,
+    "July":      27862,
+    "August":    195,
+    "September": 41098,
+}
+
+def patch_hario_2020(rows: DistrictRows) -> None:
+    # Find one Hario row as a template; if not found, use the conservative template
+    tmpl = rows.first(lambda r: bool(HARIO_BASE_RE.search(r.get("Base") or "")
+                                     and HARIO_LOCATION_RE.search(r.get("Location") or "")))
+    base = dict(tmpl) if tmpl is not None else HARIO_TEMPLATE
+    for month, amount in HARIO_2020_FIXES.items():
+        rows.upsert(base, month, 2020, amount)
+
+# ---------------- Canonical base names ----------------
+BASE_RENAMES = {
+    "Camp Hanson USMC": "Camp Hansen USMC",
+    "Tori Station Army": "Torii Station Army",
+    "Garmisch -AFRC": "Garmisch-AFRC",
+}
+
+def canonicalize_bases(df: pd.DataFrame) -> pd.DataFrame:
+    for old, new in BASE_RENAMES.items():
+        df["Base"] = df["Base"].replace(old, new)
+    df["Base"] = df["Base"].replace(
+        to_replace=r'(?i)^\s*hohenfels[\s\-–—]*\s*$',
+        value='Hohenfels',
+        regex=True
+    )
+    return df
+
+# ---------------- Run ----------------
+def extract_district_revenue(src_pdf: Path = SRC_PDF, out_csv: Optional[Path] = OUT_CSV,
+                             filtered_pdf: Optional[Path] = None, jobs: Optional[int] = None) -> pd.DataFrame:
+    doc = fitz.open(src_pdf)
+    try:
+        kept = preselect_table_pages(doc, jobs)
+        print(f"✅ Kept pages after filtering: {len(kept)} of {doc.page_count}")
+        if filtered_pdf is not None:
+            write_filtered_pdf(doc, kept, filtered_pdf)
+            print(f"📄 Filtered PDF (audit copy) → {filtered_pdf}")
+
+        rows = DistrictRows(parse_doc_pages(doc, kept))
+        print("✅ Parsed rows:", len(rows))
+    finally:
+        doc.close()
+
+    patch_hario_2020(rows)
+    print("✅ Patched: Sasebo Navy - Hario (FY2020 Feb–Sep)")
+
+    df = canonicalize_bases(rows.to_frame())
+    if out_csv is not None:
+        Path(out_csv).parent.mkdir(parents=True, exist_ok=True)
+        df.to_csv(out_csv, index=False)
+        print("Saved CSV:", out_csv)
+    return df
+
+def main(argv: Optional[List[str]] = None) -> int:
+    ap = argparse.ArgumentParser(description="Extract the District Revenues FY20–FY24 report to CSV.")
+    ap.add_argument("pdf", nargs="?", type=Path, default=SRC_PDF, help=f"source PDF (default: {SRC_PDF})")
+    ap.add_argument("--out", type=Path, default=OUT_CSV, help=f"output CSV (default: {OUT_CSV})")
+    ap.add_argument("--filtered", type=Path, default=None,
+                    help=f"also write the kept pages to this PDF for auditing (e.g. {FILTERED_PDF})")
+    ap.add_argument("--jobs", type=int, default=None,
+                    help="worker processes for page preselection (default: DISTRICT_PRESELECT_JOBS; 0 = one per CPU core; 1 = in-process)")
+    args = ap.parse_args(argv)
+
+    if not args.pdf.exists():
+        print(f"🚨 Error: PDF file not found at {args.pdf}.")
+        return 1
+    df = extract_district_revenue(args.pdf, args.out, filtered_pdf=args.filtered, jobs=args.jobs)
+    return 0 if not df.empty else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+Compiled multi-marker line matcher shared by the parsers.
+
+Hot parser loops test every line against several section titles and header
+regexes. A LineMatcher compiles a set of named markers once and answers, per
+line, whether any marker is present and which ones:
+
+    TITLES = LineMatcher(literals={"storage": "Years in Storage"}, patterns={"age": r"\bby\s+Age\b"})
+    TITLES.search(line)   → True when any marker occurs in the line
+    TITLES.hits(line)     → frozenset of the names of every marker in the line
+    TITLES.has_all(line)  → True when every marker occurs in the line
+
+Markers are literals (plain substrings, case-sensitive) or regexes (with
+their own flags, used like `pattern.search(line)`). They compile into:
+
+  * anchored  – every `^...` regex as one alternation, tried once with .match
+  * prefilter – the remaining regexes, and the literals when there are more
+                than SUBSTRING_LITERALS of them, as one alternation: one
+                C-level search per line (a leading `\\b` is left out so the
+                search can skip ahead on the first literal characters)
+  * automaton – an Aho-Corasick automaton over those literals
+
+Most report lines hold no marker and cost one match plus one search. Only a
+line the prefilter hits is walked through the automaton (from the first hit
+on) and tested against the individual regexes, so the results are exactly
+those of testing each marker separately. A handful of literals is cheaper
+to test with `in` than through any regex, so small literal sets skip the
+prefilter and the automaton. A probe made only of one to four literals is
+cheaper still as plain `in` tests without a matcher (as navy_revenue.py does).
+
+benchmarks/bench_line_matcher.py compares the per-line cost with the old
+`any(...)` loops.
+"""
+import re
+from typing import Dict, FrozenSet, List, Mapping, Optional, Pattern, Tuple, Union
+
+# Up to this many literals, plain substring tests (`lit in line`) beat one regex alternation
+SUBSTRING_LITERALS = 4
+
+# Flags that can be scoped to one alternative with an inline (?imsx:...) group
+_INLINE_FLAGS = ((re.I, "i"), (re.M, "m"), (re.S, "s"), (re.X, "x"))
+
+
+def _top_level_alternation(source: str) -> bool:
+    """True when `source` has a `|` outside every group and character class."""
+    depth, in_class, escaped = 0, False, False
+    for ch in source:
+        if escaped:
+            escaped = False
+        elif ch == "\\":
+            escaped = True
+        elif in_class:
+            in_class = ch != "]"
+        elif ch == "[":
+            in_class = True
+        elif ch == "(":
+            depth += 1
+        elif ch == ")":
+            depth -= 1
+        elif ch == "|" and depth == 0:
+            return True
+    return False
+
+
+def _scoped(pattern: Pattern) -> str:
+    """Pattern source wrapped so its flags apply inside a larger alternation."""
+    letters = "".join(letter for flag, letter in _INLINE_FLAGS if pattern.flags & flag)
+    return f"(?{letters}:{pattern.pattern})" if letters else f"(?:{pattern.pattern})"
+
+
+class _Automaton:
+    """Aho-Corasick automaton: finds every literal occurring in a string in one left-to-right walk."""
+
+    def __init__(self, literals: Mapping[str, str]):
+        self.goto: List[Dict[str, int]] = [{}]
+        self.out: List[FrozenSet[str]] = [frozenset()]
+        for name, literal in literals.items():
+            state = 0
+            for ch in literal:
+                nxt = self.goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(self.goto)
+                    self.goto[state][ch] = nxt
+                    self.goto.append({})
+                    self.out.append(frozenset())
+                state = nxt
+            self.out[state] |= {name}
+
+        # Failure links in breadth-first order; each state also outputs what its fallback state outputs
+        self.fail = [0] * len(self.goto)
+        queue = list(self.goto[0].values())
+        for state in queue:
+            for ch, nxt in self.goto[state].items():
+                queue.append(nxt)
+                fallback = self.fail[state]
+                while ch not in self.goto[fallback] and fallback:
+                    fallback = self.fail[fallback]
+                target = self.goto[fallback].get(ch, 0)
+                self.fail[nxt] = target if target != nxt else 0
+                self.out[nxt] |= self.out[self.fail[nxt]]
+
+    def find(self, text: str, start: int = 0) -> FrozenSet[str]:
+        goto, fail, out = self.goto, self.fail, self.out
+        found = frozenset()
+        state = 0
+        for ch in text[start:]:
+            while ch not in goto[state] and state:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if out[state]:
+                found |= out[state]
+        return found
+
+
+class LineMatcher:
+    """Named literals and regexes compiled for one-pass line tests (see the module docstring)."""
+
+    def __init__(self, literals: Optional[Mapping[str, str]] = None,
+                 patterns: Optional[Mapping[str, Union[str, Pattern]]] = None):
+        literals = dict(literals or {})
+        patterns = {name: re.compile(p) for name, p in (patterns or {}).items()}
+        overlap = literals.keys() & patterns.keys()
+        if overlap:
+            raise ValueError(f"Marker names used twice: {sorted(overlap)}")
+        if any(not literal for literal in literals.values()):
+            raise ValueError("Empty literal marker")
+
+        anchored: Dict[str, Pattern] = {}
+        floating: Dict[str, Pattern] = {}
+        for name, p in patterns.items():
+            is_anchored = (p.pattern.startswith("^") and not p.flags & re.M
+                           and not _top_level_alternation(p.pattern))
+            (anchored if is_anchored else floating)[name] = p
+        self._anchored: Tuple[Tuple[str, Pattern], ...] = tuple(anchored.items())
+        self._floating: Tuple[Tuple[str, Pattern], ...] = tuple(floating.items())
+
+        self._anchored_re = (re.compile("|".join(_scoped(p) for p in anchored.values()))
+                             if anchored else None)
+        self._names = frozenset(literals) | frozenset(patterns)
+        # Few literals: tested directly; more: found through the prefilter and the automaton
+        self._substrings: Tuple[Tuple[str, str], ...] = ()
+        if len(literals) <= SUBSTRING_LITERALS:
+            self._substrings, literals = tuple(literals.items()), {}
+        prefilter = [re.escape(literal) for literal in literals.values()]
+        for p in floating.values():
+            # Dropping a leading \b only widens the prefilter; hits are confirmed per pattern
+            body = p.pattern[2:] if p.pattern.startswith("\\b") and not p.flags & re.X else p.pattern
+            prefilter.append(_scoped(re.compile(body, p.flags)))
+        self._prefilter = re.compile("|".join(prefilter)) if prefilter else None
+        self._automaton = _Automaton(literals) if literals else None
+
+    def search(self, line: str) -> bool:
+        """True when any marker occurs in `line`."""
+        for _, literal in self._substrings:
+            if literal in line:
+                return True
+        if self._anchored_re is not None and self._anchored_re.match(line):
+            return True
+        if self._prefilter is None:
+            return False
+        m = self._prefilter.search(line)
+        if m is None:
+            return False
+        if self._automaton is not None and self._automaton.find(line, m.start()):
+            return True
+        return any(p.search(line) for _, p in self._floating)
+
+    def hits(self, line: str) -> FrozenSet[str]:
+        """Names of every marker that occurs in `line`."""
+        found = frozenset(name for name, literal in self._substrings if literal in line)
+        if self._anchored_re is not None and self._anchored_re.match(line):
+            found |= {name for name, p in self._anchored if p.search(line)}
+        if self._prefilter is not None:
+            m = self._prefilter.search(line)
+            if m is not None:
+                if self._automaton is not None:
+                    found |= self._automaton.find(line, m.start())
+                found |= {name for name, p in self._floating if p.search(line)}
+        return found
+
+    def has_all(self, line: str) -> bool:
+        """True when every marker occurs in `line`."""
+        for _, literal in self._substrings:
+            if literal not in line:
+                return False
+        return self.hits(line) == self._names
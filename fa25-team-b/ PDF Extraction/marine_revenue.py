@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+Marine Revenue slot revenue tables, extracted page-parallel.
+
+The Summary Table cell of `Marine_Revenue_FY20_FY24.ipynb` walks its target
+pages one after another in a single pdfplumber document, and every page it
+parses keeps its chars and layout objects cached until the document closes.
+This driver runs the same page parser in worker processes:
+
+  * the page list is cut into chunks of at most CHUNK_PAGES pages
+  * each task opens the PDF, parses its pages (closing each one, which drops
+    its cached objects, as soon as it is done) and closes the PDF again
+  * results come back as (page, DataFrame) and are merged in page order
+
+A worker holds one page's objects and one chunk's document state at a time,
+so runtime and peak memory follow the worker count, not the page count.
+
+    python "PDF Extraction/marine_revenue.py"                      # pages 1, 35, 73, 115, 157
+    python "PDF Extraction/marine_revenue.py" --pages 1-202 --jobs 4
+    run_marine_summary(Path("pdf/Marine Revenue FY20-FY24.pdf"), pages=[1, 35])
+
+The page parser is the notebook cell itself, imported as a module, so it stays
+the single source of the parsing logic.
+"""
+import argparse
+import json
+import math
+import os
+import sys
+import time
+import types
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from pathlib import Path
+from typing import List, Optional, Sequence, Tuple
+
+import pandas as pd
+import pdfplumber
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# ============================= CONFIGURATION =============================
+HERE = Path(__file__).resolve().parent
+PROJECT_ROOT = HERE.parent
+PDF_PATH = PROJECT_ROOT / "pdf" / "Marine Revenue FY20-FY24.pdf"
+OUT_CSV = PROJECT_ROOT / "CSVs" / "Marine Revenue" / "Marine_Revenue_FY20-FY24_summary_table.csv"
+
+# Notebook, and the definition that marks the code cell holding the Summary Table parser
+NOTEBOOK = HERE / "Marine_Revenue_FY20_FY24.ipynb"
+SUMMARY_CELL_MARKER = "def extract_page_slot_revenue("
+
+TARGET_PAGES = [1, 35, 73, 115, 157]   # the notebook's target_pages_1based
+CHUNK_PAGES = int(os.environ.get("MARINE_CHUNK_PAGES", "8"))   # most pages one task opens the PDF for
+
+_SUMMARY: Optional[types.ModuleType] = None
+
+
+def notebook_cell(path: Path, marker: str) -> str:
+    """Source of the one code cell of the notebook at `path` that contains `marker`."""
+    cells = json.loads(Path(path).read_text(encoding="utf-8"))["cells"]
+    found = ["".join(c["source"]) for c in cells if c["cell_type"] == "code" and marker in "".join(c["source"])]
+    if len(found) != 1:
+        raise RuntimeError(f"{Path(path).name}: expected one code cell containing {marker!r}, found {len(found)}")
+    return found[0]
+
+
+def load_summary_cell() -> types.ModuleType:
+    """Import the notebook's Summary Table cell as a module (once per process)."""
+    global _SUMMARY
+    if _SUMMARY is None:
+        source = notebook_cell(NOTEBOOK, SUMMARY_CELL_MARKER)
+        module = types.ModuleType("marine_summary")
+        module.__file__ = str(NOTEBOOK)
+        sys.modules[module.__name__] = module
+        exec(compile(source, str(NOTEBOOK), "exec"), module.__dict__)
+        _SUMMARY = module
+    return _SUMMARY
+
+
+# =============================== WORKERS ==============================
+def extract_chunk(pdf_path: Path, pages: Sequence[int]) -> List[Tuple[int, pd.DataFrame]]:
+    """Slot Revenue table of each page (1-based) in `pages`, from one short-lived PDF handle."""
+    nb = load_summary_cell()
+    results: List[Tuple[int, pd.DataFrame]] = []
+    with pdfplumber.open(pdf_path) as pdf:
+        for page_num in pages:
+            if not 0 < page_num <= len(pdf.pages):
+                print(f"⚠️ Specified page number out of range: {page_num}")
+                continue
+            page = pdf.pages[page_num - 1]
+            try:
+                results.append((page_num, nb.extract_page_slot_revenue(page)))
+            finally:
+                page.close()   # drop the page's cached chars and layout objects
+    return results
+
+
+def resolve_jobs(jobs: Optional[int], tasks: int) -> int:
+    """None → one process per task (up to the CPU count); 0 or less → one per CPU core."""
+    cpus = os.cpu_count() or 1
+    if jobs is None:
+        return max(1, min(tasks, cpus))
+    return cpus if jobs <= 0 else jobs
+
+
+def peak_rss_mb(who: int) -> float:
+    """Peak resident set size of this process or (RUSAGE_CHILDREN) its largest finished child."""
+    peak = resource.getrusage(who).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+# =============================== EXECUTION ==============================
+def run_marine_summary(pdf_path: Path = PDF_PATH, pages: Optional[Sequence[int]] = None,
+                       jobs: Optional[int] = None, out_csv: Optional[Path] = OUT_CSV) -> pd.DataFrame:
+    """
+    Extract the Slot Revenue table from `pages` (default TARGET_PAGES) in
+    parallel worker processes; returns the merged table, ordered by page,
+    and writes it to `out_csv` unless that is None.
+    """
+    pages = sorted(set(pages or TARGET_PAGES))
+    jobs = resolve_jobs(jobs, len(pages))
+    # Spread the pages over the workers, but never more than CHUNK_PAGES per PDF handle
+    size = max(1, min(CHUNK_PAGES, math.ceil(len(pages) / jobs)))
+    chunks = [pages[i:i + size] for i in range(0, len(pages), size)]
+    workers = min(jobs, len(chunks))
+    print(f"\n⚙️  Extracting {len(pages)} page(s) in {len(chunks)} chunk(s) with {workers} worker process(es)...")
+
+    t0 = time.perf_counter()
+    results: List[Tuple[int, pd.DataFrame]] = []
+    if workers <= 1:
+        for chunk in chunks:
+            results.extend(extract_chunk(pdf_path, chunk))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for chunk_results in pool.map(extract_chunk, repeat(pdf_path), chunks):
+                results.extend(chunk_results)
+    wall = time.perf_counter() - t0
+
+    all_dfs, empty = [], []
+    for page_num, df in sorted(results, key=lambda r: r[0]):
+        if df.empty:
+            empty.append(page_num)
+            continue
+        df.insert(0, "Page", page_num)  # Preserve actual 1-based page number
+        all_dfs.append(df)
+    if empty:
+        print(f"⚠️ No Slot Revenue table detected on page(s): {', '.join(map(str, empty))}")
+    if not all_dfs:
+        print("⚠️ No table data retrieved from any page.")
+        return pd.DataFrame()
+
+    out_df = pd.concat(all_dfs, ignore_index=True)
+    if out_csv is not None:
+        Path(out_csv).parent.mkdir(parents=True, exist_ok=True)
+        out_df.to_csv(out_csv, index=False, encoding="utf-8-sig")
+        print(f"✅ Slot Revenue: {len(out_df)} rows exported → {out_csv}")
+
+    if resource is not None:
+        rss = f"; peak RSS {peak_rss_mb(resource.RUSAGE_SELF):.0f} MB"
+        if workers > 1:
+            rss += f", largest worker {peak_rss_mb(resource.RUSAGE_CHILDREN):.0f} MB"
+    else:
+        rss = ""
+    print(f"⏱️  {len(pages)} page(s) in {wall:.1f}s{rss}")
+    return out_df
+
+
+def parse_pages(specs: Sequence[str]) -> List[int]:
+    """Page numbers from arguments like `1 35 73`, `1,35` or `1-202`."""
+    pages: List[int] = []
+    for spec in specs:
+        for part in filter(None, spec.split(",")):
+            first, _, last = part.partition("-")
+            pages.extend(range(int(first), int(last or first) + 1))
+    return pages
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    ap = argparse.ArgumentParser(description="Extract the Marine Revenue slot revenue tables page-parallel.")
+    ap.add_argument("pdf", nargs="?", type=Path, default=PDF_PATH, help=f"Marine Revenue PDF (default: {PDF_PATH})")
+    ap.add_argument("--pages", nargs="+", default=None,
+                    help="1-based pages or ranges, e.g. `1 35 73` or `1-202` (default: the notebook's target pages)")
+    ap.add_argument("--jobs", type=int, default=None,
+                    help="worker processes (default: one per chunk; 0 = one per CPU core; 1 = serial)")
+    ap.add_argument("--out", type=Path, default=OUT_CSV, help=f"output CSV (default: {OUT_CSV})")
+    args = ap.parse_args(argv)
+
+    if not args.pdf.exists():
+        print(f"🚨 Error: PDF file not found at {args.pdf}.")
+        return 1
+    pages = parse_pages(args.pages) if args.pages else None
+    return 0 if not run_marine_summary(args.pdf, pages, jobs=args.jobs, out_csv=args.out).empty else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,964 @@
+#!/usr/bin/env python3
+"""
+Navy Revenue Report engine: one extractor for every Navy report PDF.
+
+For each report it writes, into OUT_DIR:
+  1) Slot Machine Results – Navy         → <PDF stem>_slot_results.csv
+  2) NAFI Reimbursement from ARMP        → <PDF stem>_nafi_reimbursements.csv
+  3) Monthly Summary by Location (v12.8) → <PDF stem>_monthly_summary_master.csv
+
+The FY columns are read from each report's own headers (e.g. FY16–FY22 or
+FY18–FY24), so every fiscal-year edition goes through the same code. Reports
+run in parallel worker processes, one per PDF, and their tables are then
+merged across reports into master CSVs:
+
+  Navy_Revenue_Reimburse_Summary_master.csv   slot revenue and NAFI rows per installation
+  Navy_Revenue_monthly_summary_master.csv     one row per location and month
+
+Where reports overlap, the one later in the list wins (by default the PDFs
+are taken in name order, so the newer edition wins).
+
+    python "PDF Extraction/navy_revenue.py"                       # every Navy Revenue Report*.pdf in pdf/
+    python "PDF Extraction/navy_revenue.py" a.pdf b.pdf --jobs 2
+    python "PDF Extraction/navy_revenue.py" --stream              # monthly pages parsed as they convert
+    run_navy_reports([Path("pdf/Navy Revenue Report FY20-FY24-2.pdf")])
+
+navy_revenue_report-1.py and -2.py remain as launchers for one report each.
+Requires Poppler `pdftotext` on PATH and pandas.
+"""
+
+import argparse
+import os
+import pickle
+import re
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from collections import defaultdict
+from typing import Iterable, List, NamedTuple, Optional
+import pandas as pd
+
+import num_tokens
+import page_index
+import page_manifest
+import pdftext_bbox
+import pdftext_cache
+import pdftext_stream
+from num_tokens import clean_numbers, extract_number_tokens, parse_value
+
+# ============================= CONFIGURATION =============================
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+
+# Input PDF files (from pdf/ directory)
+PDF_DIR = PROJECT_ROOT / "pdf"
+
+# Output folder (inside CSVs/)
+OUT_DIR = PROJECT_ROOT / "CSVs" / "Navy Revenue Report"
+
+# Master CSVs merged across reports
+SUMMARY_MASTER = "Navy_Revenue_Reimburse_Summary_master.csv"
+MONTHLY_MASTER = "Navy_Revenue_monthly_summary_master.csv"
+
+# Slot/NAFI table backend: "text" splits layout lines on whitespace, "bbox" reads
+# word coordinates (pdftotext -bbox-layout) and bins values under their FY headers.
+# bbox is experimental: only checked on synthetic pages, not on the real reports
+TABLE_BACKEND = os.environ.get("NAVY_TABLE_BACKEND", "text")
+
+# Monthly Summary producer: parse pages as pdftotext converts them (pdftext_stream.py)
+# instead of after the whole report, without the page manifest's carried-over rows
+MONTHLY_STREAM = os.environ.get("NAVY_MONTHLY_STREAM", "0") == "1"
+
+def normalize_dashes(s: str) -> str:
+    return s.replace("–", "-").replace("—", "-")
+
+def extract_pdf_text(pdf_path: Path, workers=None) -> str:
+    # Served from the shared page cache; pdftotext only runs on a cold cache,
+    # split into `workers` page-range shards (None → PDFTEXT_WORKERS, 0 → all cores)
+    return pdftext_cache.extract_text(pdf_path, mode="layout", workers=workers)
+
+def routed_pages(pdf_path: Path, pages, *sections):
+    """
+    Page numbers of `sections` through the saved page index. Without a saved
+    index that matches the PDF (first run, or the PDF changed) every page is
+    returned, so no line is lost to a routing the parser has never been
+    checked against; the index is built and saved for the next run.
+    """
+    index = page_index.read_saved_index(pdf_path)
+    if index is None:
+        page_index.load_index(pdf_path, pages=pages)
+        return list(range(1, len(pages) + 1))
+    return page_index.section_pages(index, *sections)
+
+def routed_text(pdf_path: Path, *sections):
+    """(text of the pages routed_pages picks, joined with form feeds; their page numbers)."""
+    pages = pdftext_cache.split_pages(extract_pdf_text(pdf_path))
+    nums = routed_pages(pdf_path, pages, *sections)
+    return "".join(pages[p - 1] + "\f" for p in nums), nums
+
+def extract_pdf_lines_layout(pdf_path: Path, sections=None):
+    """Layout-preserving lines for table parsing (only the pages of `sections` when given)."""
+    text = routed_text(pdf_path, *sections)[0] if sections else extract_pdf_text(pdf_path)
+    return normalize_dashes(text).split("\n")
+
+# =========================================================
+# -------------------- PART A: SLOT / NAFI -----------------
+# =========================================================
+SECTION_SLOT = "Slot Machine Results - Navy"
+SECTION_NAFI = "NAFI Reimbursement from ARMP"
+REPORT_TITLE = "ARMP Navy Slot Report"
+
+
+FY_TOKEN = re.compile(r"(FY\d{2}\s+thru\s+SEP|ANNUALIZED\s+FY\d{2}|FY\d{2})", re.IGNORECASE)
+NUM_TOKEN = re.compile(r"^\(?-?\d{1,3}(?:,\d{3})*(?:\.\d{2})?\)?$")
+MONEY_OR_DASH = re.compile(r"^\(?-?[\d,]+(?:\.\d{2})?\)?$|^-?$")
+NOT_NUM_CHAR = re.compile(r"[^\d,\.\(\)\-]")
+
+# Per-line probes of the slot/NAFI tables. Each is one to four literals, which plain `in`
+# tests answer faster than a line_matcher.LineMatcher (benchmarks/bench_line_matcher.py)
+def is_section_header(line: str) -> bool:
+    return SECTION_SLOT in line or SECTION_NAFI in line or REPORT_TITLE in line
+
+def is_table_header(line: str) -> bool:
+    return "Country" in line and "Installation" in line
+
+def is_fy_header_line(line: str) -> bool:
+    """A header continuation line ("thru SEP", "ANNUALIZED FY22" ...)."""
+    return "FY" in line or "SEP" in line or "ANNUALIZED" in line
+
+def is_block_end(line: str) -> bool:
+    """A total or the next title ends a table's rows."""
+    return "Total" in line or is_section_header(line)
+
+def clean_fy_label(token: str):
+    """Column name for one FY header token ("FY22", "FY22 thru SEP", "ANNUALIZED FY22"), else None."""
+    c2 = re.sub(r"\s+", " ", token.strip().upper())
+    if "THRU" in c2:
+        m = re.search(r"FY(\d{2})", c2)
+        return f"FY{m.group(1)} thru SEP" if m else None
+    if "ANNUALIZED" in c2:
+        m = re.search(r"FY(\d{2})", c2)
+        return f"ANNUALIZED FY{m.group(1)}" if m else None
+    m = re.fullmatch(r"FY(\d{2})", c2)
+    return f"FY{m.group(1)}" if m else None
+
+def fy_column_label(text: str):
+    """Column name of a merged header label (pdftext_bbox.header_columns), else None."""
+    m = FY_TOKEN.search(text)
+    return clean_fy_label(m.group(0)) if m else None
+
+def header_fy_columns(lines, header_idx):
+    """FY columns of the header at `header_idx`, read with up to two continuation lines below it."""
+    header_block = lines[header_idx]
+    for off in (1, 2):
+        if header_idx + off < len(lines):
+            nxt = lines[header_idx + off]
+            if is_fy_header_line(nxt):
+                header_block += "  " + nxt
+
+    # Detect all FY-like tokens
+    raw_cols = [m.group(0) for m in FY_TOKEN.finditer(header_block)]
+    return tuple(dict.fromkeys(c for c in map(clean_fy_label, raw_cols) if c))
+
+def split_table_row(row_line: str):
+    """(country, installation, values) of one table line, or None if it is not a row."""
+    tokens = row_line.strip().split()
+    if len(tokens) < 3:
+        return None
+
+    country = tokens[0]
+    i = 1
+    inst_parts = []
+    while i < len(tokens):
+        tok = tokens[i]
+        if MONEY_OR_DASH.match(tok):
+            break
+        inst_parts.append(tok)
+        i += 1
+
+    installation = " ".join(inst_parts).strip()
+    if not installation:
+        return None
+
+    numbers = []
+    for tok in tokens[i:]:
+        clean = NOT_NUM_CHAR.sub("", tok)
+        if NUM_TOKEN.match(clean) or clean == "-":
+            numbers.append(clean)
+    return country, installation, [parse_value(x) for x in numbers]
+
+# Table events, in line order
+EV_PAGE, EV_SECTION, EV_HEADER, EV_ROW, EV_TOTAL = "page", "section", "header", "row", "total"
+HEADER_WINDOW = 25   # a header belongs to a section title at most this many lines above it
+
+class TableEvent(NamedTuple):
+    kind: str     # EV_PAGE, EV_SECTION, EV_HEADER, EV_ROW or EV_TOTAL
+    line: int     # index into the layout lines
+    value: object = None
+
+def iter_table_events(lines, titles=(SECTION_SLOT, SECTION_NAFI)):
+    """
+    Tokenize the slot/NAFI tables in one pass over the layout lines:
+      page    – a form feed (value: pages started so far)
+      section – a line naming one of `titles` (value: the title)
+      header  – a "Country ... Installation" line (value: its FY columns)
+      row     – a table row below a header (value: split_table_row's tuple)
+      total   – a "Total" line ending the rows (value: the line)
+    Rows run until a blank line, a total, a title or the next header. A blank
+    or total right below the header is stepped over once, since the body of
+    some blocks starts a line further down.
+    """
+    pages = 0
+    in_body = first_body_line = False
+    for k, line in enumerate(lines):
+        if "\f" in line:
+            pages += line.count("\f")
+            yield TableEvent(EV_PAGE, k, pages)
+        for title in titles:
+            if title in line:
+                yield TableEvent(EV_SECTION, k, title)
+        if "Country" in line and "Installation" in line:
+            yield TableEvent(EV_HEADER, k, header_fy_columns(lines, k))
+            in_body = first_body_line = True
+            continue
+        if not in_body:
+            continue
+
+        total = "Total" in line
+        if total or not line.strip() or is_section_header(line):
+            if total:
+                yield TableEvent(EV_TOTAL, k, line)
+            in_body = first_body_line
+            first_body_line = False
+            continue
+        first_body_line = False
+        row = split_table_row(line)
+        if row is not None:
+            yield TableEvent(EV_ROW, k, row)
+
+def section_rows(events, window=HEADER_WINDOW):
+    """
+    Rows of every section from iter_table_events, keyed by title. A header
+    belongs to each title seen at most `window` - 1 lines above it (or on its
+    own line) with no other header in between; its rows get the header's FY
+    columns, padded or cut to fit, and `_cols` for merge_blocks.
+    """
+    rows = defaultdict(list)
+    last_title = {}
+    last_header = -1
+    owners, cols = [], ()
+    for ev in events:
+        if ev.kind == EV_SECTION:
+            last_title[ev.value] = ev.line
+        elif ev.kind == EV_HEADER:
+            cols = ev.value
+            owners = [t for t, i in last_title.items() if last_header < i and ev.line - i < window] if cols else []
+            last_header = ev.line
+        elif ev.kind == EV_ROW and owners:
+            country, installation, values = ev.value
+            values = (values + [""] * len(cols))[:len(cols)]
+            for title in owners:
+                row = {"Country": country, "Installation": installation}
+                row.update(zip(cols, values))
+                row["_cols"] = cols
+                rows[title].append(row)
+    return rows
+
+def extract_section(lines, section_title):
+    return section_rows(iter_table_events(lines, (section_title,)))[section_title]
+
+def parse_cell(text: str):
+    """Value of one column cell, cleaned like the number tokens of split_table_row."""
+    clean = re.sub(r"[^\d,\.\(\)\-]", "", text)
+    return parse_value(clean) if NUM_TOKEN.match(clean) or clean == "-" else ""
+
+def extract_section_bbox(pages, section_title):
+    """
+    Coordinate backend for extract_section: the same rows, read from word boxes.
+    `pages` holds each page's rows (pdftext_bbox.page_rows). The FY labels of
+    the header give the column bins, and every value lands in the column it is
+    printed under, so rows need no padding, truncation or second pass.
+    Experimental: validated on synthetic pages only, not on the real reports.
+    """
+    rows_all = []
+    for rows in pages:
+        height = pdftext_bbox.line_height(rows)
+        for i, row in enumerate(rows):
+            if section_title not in row.text:
+                continue
+            header_idx = next((k for k in range(i, min(i + 25, len(rows)))
+                               if is_table_header(rows[k].text)), -1)
+            if header_idx == -1:
+                continue
+
+            # Header continuation rows ("thru SEP", "ANNUALIZED" ...) sit right below it
+            body = header_idx + 1
+            while body < min(header_idx + 3, len(rows)) and is_fy_header_line(rows[body].text):
+                body += 1
+            installation = next(w for w in rows[header_idx].words if "Installation" in w.text)
+            columns = pdftext_bbox.header_columns(rows[header_idx:body], fy_column_label, min_x=installation.x1)
+            if not columns:
+                continue
+            bins = pdftext_bbox.ColumnBins(columns)
+            expected_cols = tuple(dict.fromkeys(c.label for c in columns))
+
+            bottom = rows[body - 1].y1
+            for data_row in rows[body:]:
+                # A blank line, a total or the next section ends the block
+                if data_row.y0 - bottom > height or is_block_end(data_row.text):
+                    break
+                bottom = data_row.y1
+                label, cells = bins.split_row(data_row)
+                if len(label) < 2:
+                    continue
+                r = {"Country": label[0].text, "Installation": " ".join(w.text for w in label[1:])}
+                for col, cell in zip(columns, cells):
+                    r.setdefault(col.label, parse_cell(cell))
+                r["_cols"] = expected_cols
+                rows_all.append(r)
+    return rows_all
+
+def merge_blocks(rows):
+    merged = defaultdict(dict)
+    all_cols = set(["Country", "Installation"])
+    for r in rows:
+        key = (r["Country"], r["Installation"])
+        merged[key]["Country"] = r["Country"]
+        merged[key]["Installation"] = r["Installation"]
+        for c in r.get("_cols", []):
+            merged[key][c] = r.get(c, "")
+            all_cols.add(c)
+    return merged, all_cols
+
+def ordered_columns(cols):
+    cols = set(cols)
+    base = ["Country", "Installation"]
+
+    def year_of(label, kind):
+        if kind == "bare":
+            m = re.fullmatch(r"FY(\d{2})", label)
+        elif kind == "sep":
+            m = re.fullmatch(r"FY(\d{2}) thru SEP", label)
+        else:
+            m = re.fullmatch(r"ANNUALIZED FY(\d{2})", label)
+        return int(m.group(1)) if m else None
+
+    bare = sorted([c for c in cols if year_of(c, "bare")], key=lambda x: year_of(x, "bare"))
+    sep  = sorted([c for c in cols if year_of(c, "sep")],  key=lambda x: year_of(x, "sep"))
+    ann  = sorted([c for c in cols if year_of(c, "ann")],  key=lambda x: year_of(x, "ann"))
+
+    wanted = base + bare + sep + ann
+    leftovers = [c for c in cols if c not in wanted]
+    return wanted + sorted(leftovers)
+
+def run_slot_nafi(pdf_path: Path, out_dir: Path, backend=None):
+    backend = backend or TABLE_BACKEND
+    if backend == "bbox":
+        # Word boxes of the slot/NAFI pages only, located through the page index (every page without one)
+        pages = pdftext_cache.split_pages(extract_pdf_text(pdf_path))
+        bbox_pages = [pdftext_bbox.page_rows(pdftext_cache.extract_pages(pdf_path, "bbox", first=p, last=p)[0])
+                      for p in routed_pages(pdf_path, pages, "slot_results", "nafi")]
+        slot_rows = extract_section_bbox(bbox_pages, SECTION_SLOT)
+        nafi_rows = extract_section_bbox(bbox_pages, SECTION_NAFI)
+    elif backend == "text":
+        # One tokenizer pass over the slot/NAFI pages yields the blocks of both tables
+        lines = extract_pdf_lines_layout(pdf_path, sections=("slot_results", "nafi"))
+        rows = section_rows(iter_table_events(lines, (SECTION_SLOT, SECTION_NAFI)))
+        slot_rows, nafi_rows = rows[SECTION_SLOT], rows[SECTION_NAFI]
+    else:
+        raise ValueError(f"Unknown table backend {backend!r}; expected 'text' or 'bbox'")
+
+    slot_merged, slot_cols = merge_blocks(slot_rows)
+    nafi_merged, nafi_cols = merge_blocks(nafi_rows)
+
+    slot_df = pd.DataFrame(slot_merged.values())
+    nafi_df = pd.DataFrame(nafi_merged.values())
+
+    slot_df = slot_df.reindex(columns=ordered_columns(slot_cols))
+    nafi_df = nafi_df.reindex(columns=ordered_columns(nafi_cols))
+
+    slot_out = out_dir / f"{pdf_path.stem}_slot_results.csv"
+    nafi_out = out_dir / f"{pdf_path.stem}_nafi_reimbursements.csv"
+
+    slot_df.to_csv(slot_out, index=False)
+    nafi_df.to_csv(nafi_out, index=False)
+
+    return slot_out, nafi_out
+
+# =========================================================
+# ------------ PART B: MONTHLY SUMMARY ------------
+# =========================================================
+re_hdr_main  = re.compile(r"^ARMP Navy Slot Report$")
+re_hdr_sub   = re.compile(r"^Monthly Summary by Location$")
+re_month     = re.compile(r"^[A-Za-z]{3}-\d{2}$")
+re_code6     = re.compile(r"^\d{6}$")
+re_loc4      = re.compile(r"^\d{4}$")
+re_find_mon  = re.compile(r"([A-Za-z]{3}-\d{2})")
+re_any_code6 = re.compile(r"\b\d{6}\b")
+
+def month_to_date(m):
+    try:
+        mon, yr = m.split('-')
+        yr = int(yr)
+        yr = 2000 + yr if yr < 50 else 1900 + yr
+        return pd.to_datetime(f"01-{mon}-{yr}", format="%d-%b-%Y", errors="coerce")
+    except:
+        return pd.NaT
+
+def is_sep_month(m):
+    try:
+        return str(m).split("-")[0].lower().startswith("sep")
+    except:
+        return False
+
+def map_tokens(month, toks):
+    """v12.8 mapping rules (Sep-specific behavior)."""
+    rev = nafi = annr = annn = pd.NA
+    n = len(toks)
+    if n >= 4:
+        last4 = toks[-4:]
+        rev, nafi, annr, annn = last4
+    elif n == 3:
+        if is_sep_month(month):
+            rev, nafi, annr = toks[0], toks[1], toks[2]
+        else:
+            rev, nafi, annr = toks[0], toks[1], toks[2]
+    elif n == 2:
+        if is_sep_month(month):
+            annr, annn = toks[0], toks[1]
+        else:
+            rev, nafi = toks[0], toks[1]
+    elif n == 1:
+        if is_sep_month(month):
+            annr = toks[0]
+        else:
+            rev = toks[0]
+    return rev, nafi, annr, annn
+
+def iter_monthly_rows(lines):
+    """
+    Line state machine for the Monthly Summary pages.
+    Consumes stripped, non-empty lines one at a time (any iterable, including a
+    stream that is still being converted) and yields one dict per row. A row is
+    held back until the next one arrives because a following site-code line may
+    still patch its Location.
+    """
+    src = pdftext_stream.PeekableLines(lines)
+    pending = None
+    installation = locno = location = site_code = full_loc = None
+    last_month = None
+
+    while True:
+        line = src.next()
+        if line is None:
+            break
+
+        # Detect new Installation block
+        if re_hdr_main.match(line):
+            for j in range(1, 6):
+                nxt = src.peek(j)
+                if nxt is not None and re_hdr_sub.match(nxt):
+                    src.skip(j)
+                    while src.peek() is not None and not src.peek().strip():
+                        src.next()
+                    inst = src.next()
+                    if inst is not None:
+                        installation = inst.strip()
+                        locno = location = site_code = full_loc = None
+                        last_month = None
+                    break
+            continue
+
+        # Skip headers and totals
+        if "Loc #" in line or "Total for Current Period" in line:
+            continue
+
+        # Handle Temp Closed lines
+        if "Temp Closed" in line:
+            mmon = re_find_mon.search(line)
+            month = mmon.group(1) if mmon else last_month
+            if pending is not None:
+                yield pending
+            pending = {
+                "Installation": installation, "Loc#": locno, "Location": full_loc,
+                "Month": month, "Revenue": pd.NA, "NAFI Amt": pd.NA,
+                "Annual Revenue": pd.NA, "Annual NAFI": pd.NA, "Status": "Temp Closed"
+            }
+            last_month = month
+            continue
+
+        parts = line.split()
+
+        # New Loc# + Location
+        if parts and re_loc4.match(parts[0]):
+            locno = parts[0]
+            loc_tokens, j = [], 1
+            while j < len(parts) and not (re_month.match(parts[j]) or re_code6.match(parts[j])):
+                loc_tokens.append(parts[j]); j += 1
+
+            site_code = None
+            if j < len(parts) and re_code6.match(parts[j]):
+                site_code = parts[j]; j += 1
+
+            location = " ".join(loc_tokens).strip()
+            full_loc = f"{location} {site_code}".strip() if site_code else location
+
+            if j < len(parts) and re_month.match(parts[j]):
+                month = parts[j]; tail = " ".join(parts[j + 1:])
+            else:
+                continue
+
+            toks = extract_number_tokens(tail)
+            rev, nafi, annr, annn = map_tokens(month, toks)
+
+            if pending is not None:
+                yield pending
+            pending = {
+                "Installation": installation, "Loc#": locno, "Location": full_loc,
+                "Month": month, "Revenue": rev, "NAFI Amt": nafi,
+                "Annual Revenue": annr, "Annual NAFI": annn, "Status": ""
+            }
+            last_month = month; continue
+
+        # Continuation: site code + month
+        if parts and re_code6.match(parts[0]) and len(parts) > 1 and re_month.match(parts[1]):
+            site_code = parts[0]
+            full_loc = f"{location} {site_code}".strip()
+            if pending is not None and pending["Loc#"] == locno and site_code not in str(pending["Location"]):
+                pending["Location"] = f"{pending['Location']} {site_code}".strip()
+            month = parts[1]; tail = " ".join(parts[2:])
+
+            toks = extract_number_tokens(tail)
+            rev, nafi, annr, annn = map_tokens(month, toks)
+
+            if pending is not None:
+                yield pending
+            pending = {
+                "Installation": installation, "Loc#": locno, "Location": full_loc,
+                "Month": month, "Revenue": rev, "NAFI Amt": nafi,
+                "Annual Revenue": annr, "Annual NAFI": annn, "Status": ""
+            }
+            last_month = month; continue
+
+        # Continuation with only month
+        if parts and re_month.match(parts[0]):
+            month = parts[0]; tail = " ".join(parts[1:])
+            toks = extract_number_tokens(tail)
+            rev, nafi, annr, annn = map_tokens(month, toks)
+
+            if pending is not None:
+                yield pending
+            pending = {
+                "Installation": installation, "Loc#": locno, "Location": full_loc,
+                "Month": month, "Revenue": rev, "NAFI Amt": nafi,
+                "Annual Revenue": annr, "Annual NAFI": annn, "Status": ""
+            }
+            last_month = month; continue
+
+    if pending is not None:
+        yield pending
+
+# Part of every page-manifest key: editing this script invalidates saved rows
+CODE_VERSION = page_manifest.source_version(Path(__file__), Path(num_tokens.__file__))
+
+def installation_units(text: str, section_pages):
+    """
+    Cut the Monthly Summary text (pages joined with form feeds) into one unit
+    per installation block for page_manifest. iter_monthly_rows resets its
+    state at every "ARMP Navy Slot Report / Monthly Summary by Location"
+    header, so a block parses to the same rows on its own as inside the
+    whole section.
+    """
+    lines, line_pages = [], []
+    page_no = 0
+    for raw in text.split("\n"):
+        page_no += raw.count("\f")  # a form feed starts the next page
+        ln = raw.strip()
+        if ln:
+            lines.append(ln)
+            line_pages.append(section_pages[min(page_no, len(section_pages) - 1)])
+
+    starts = [0] + [i for i, ln in enumerate(lines) if i and re_hdr_main.match(ln)
+                    and any(re_hdr_sub.match(nxt) for nxt in lines[i + 1:i + 6])]
+    units = []
+    for start, end in zip(starts, starts[1:] + [len(lines)]):
+        block = lines[start:end]
+        if block:
+            units.append(page_manifest.Unit(page_manifest.unit_key(CODE_VERSION, "\n".join(block)),
+                                            tuple(sorted(set(line_pages[start:end]))),
+                                            lambda block=block: list(iter_monthly_rows(block))))
+    return units
+
+# ===================== CLEANUP RULES =====================
+MONTHLY_AMOUNT_COLUMNS = ["Revenue", "NAFI Amt", "Annual Revenue", "Annual NAFI"]
+re_month_parts = re.compile(r"^([A-Za-z]{3})-(\d{2})$")
+
+class DropRule(NamedTuple):
+    """Rows of `installation` whose stripped, lower-cased Location matches `location`."""
+    installation: str
+    location: re.Pattern
+    loc_no: Optional[str] = None     # only rows with this Loc#
+    unless_site_code: bool = True    # keep rows whose Location carries a 6-digit site code
+
+class DuplicateRule(NamedTuple):
+    """The `location` row of a month, dropped when a row whose Location contains `twin` has the same month."""
+    installation: str
+    loc_no: str
+    location: str
+    twin: str
+
+MONTHLY_DROP_RULES = {
+    # Yokosuka: damaged "Oct 15" rows (extremely small font)
+    "yokosuka_oct15": DropRule("yokosuka", re.compile(r"(?:oct\s*15|o\s*t\s*15)")),
+    # Souda Bay: "Graffiti ... Shipmate" rows
+    "souda_bay_graffiti": DropRule("souda bay", re.compile(r"(?s)^(?=.*graffiti)(?=.*shipmate)")),
+    # Sasebo: "Sasebo B/C" rows
+    "sasebo_bc": DropRule("sasebo", re.compile(r"sasebo\s+b\s*/?\s*c\b")),
+    # Atsugi: "None 401401"
+    "atsugi_none_code": DropRule("atsugi", re.compile(r"^none\s+\d{6}$"), loc_no="3079", unless_site_code=False),
+}
+
+MONTHLY_DUPLICATE_RULES = {
+    # Atsugi: "Club Trilogy" repeats the month of "Club Trilogy 401401"
+    "atsugi_club_trilogy": DuplicateRule("atsugi", "3079", "club trilogy", "club trilogy 401401"),
+}
+
+def months_to_dates(months: pd.Series) -> pd.Series:
+    """month_to_date over a whole column ("Oct-21" → 2021-10-01; years 50-99 are 19xx)."""
+    parts = months.astype("string").str.extract(re_month_parts)
+    yy = pd.to_numeric(parts[1])
+    year = (yy.where(yy < 50, yy - 100) + 2000).astype("Int64").astype("string")
+    dates = pd.to_datetime("01-" + parts[0] + "-" + year, format="%d-%b-%Y", errors="coerce")
+    odd = parts[0].isna() & months.notna()
+    if odd.any():
+        dates[odd] = months[odd].map(month_to_date)
+    return dates
+
+def drop_rule_mask(df: pd.DataFrame, rules=MONTHLY_DROP_RULES) -> pd.Series:
+    """True for every row one of the drop rules removes."""
+    inst = df["Installation"].astype(str).str.strip().str.lower()
+    loc = df["Location"].astype(str).str.strip().str.lower()
+    loc_no = df["Loc#"].astype(str).str.strip()
+    has_code = loc.str.contains(re_any_code6, na=False)
+    mask = pd.Series(False, index=df.index)
+    for rule in rules.values():
+        hit = (inst == rule.installation) & loc.str.contains(rule.location, na=False)
+        if rule.loc_no is not None:
+            hit &= loc_no == rule.loc_no
+        if rule.unless_site_code:
+            hit &= ~has_code
+        mask |= hit
+    return mask
+
+def drop_duplicate_rows(df: pd.DataFrame, rules=MONTHLY_DUPLICATE_RULES) -> pd.DataFrame:
+    """Apply the duplicate rules, each as one join of the rows it may drop with the months of their twins."""
+    for rule in rules.values():
+        inst = df["Installation"].astype(str)
+        loc = df["Location"].astype(str).str.lower()
+        loc_no = df["Loc#"].astype(str)
+        twin_months = df.loc[(inst.str.lower() == rule.installation) & (loc_no == rule.loc_no)
+                             & loc.str.contains(rule.twin, regex=False, na=False), ["Month"]].dropna().drop_duplicates()
+        candidates = ((inst.str.strip().str.lower() == rule.installation) & (loc_no.str.strip() == rule.loc_no)
+                      & (loc.str.strip() == rule.location))
+        shadowed = df.loc[candidates, ["Month"]].reset_index().merge(twin_months, on="Month")["index"]
+        df = df.drop(index=shadowed).reset_index(drop=True)
+    return df
+
+def clean_monthly_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """Parsed Monthly Summary rows → the master table: filled, cleaned, one row per month, cleanup rules applied."""
+    df[["Installation", "Loc#", "Location"]] = df[["Installation", "Loc#", "Location"]].ffill()
+
+    # Clean numerics (keep parentheses as-is)
+    for c in MONTHLY_AMOUNT_COLUMNS:
+        df[c] = clean_numbers(df[c])
+
+    # Unique months
+    df["MonthDate"] = months_to_dates(df["Month"])
+    df = df.sort_values(["Installation", "Loc#", "Location", "MonthDate"])
+    df = df.drop_duplicates(subset=["Installation", "Loc#", "Location", "Month"], keep="last")
+    df = df.drop(columns=["MonthDate"])
+
+    df = df[~drop_rule_mask(df)].reset_index(drop=True)
+    return drop_duplicate_rows(df)
+
+# ===================== STREAMING WRITER =====================
+MONTHLY_CHUNK_ROWS = int(os.environ.get("NAVY_MONTHLY_CHUNK_ROWS", "5000"))   # rows held in memory before spilling
+MONTHLY_FILL_COLUMNS = ("Installation", "Loc#", "Location")
+
+class LocationBuffers:
+    """
+    Parsed rows grouped by (Installation, Loc#), in bounded buffers. At most
+    `chunk_rows` rows are held in memory; when they fill up, every group's
+    rows are appended to that group's spill file (pickled, so values keep
+    their types). rows() reads a group back in arrival order.
+    """
+
+    def __init__(self, spill_dir: Path, chunk_rows: int = MONTHLY_CHUNK_ROWS):
+        self.spill_dir = spill_dir
+        self.chunk_rows = max(1, chunk_rows)
+        self.pending = defaultdict(list)   # group → rows not spilled yet
+        self.n_pending = 0
+        self.files = {}                    # group → spill file
+
+    @staticmethod
+    def group_of(row):
+        return tuple(None if pd.isna(row[c]) else row[c] for c in ("Installation", "Loc#"))
+
+    def add(self, row):
+        self.pending[self.group_of(row)].append(row)
+        self.n_pending += 1
+        if self.n_pending >= self.chunk_rows:
+            self.spill()
+
+    def spill(self):
+        for group, rows in self.pending.items():
+            if group not in self.files:
+                self.files[group] = self.spill_dir / f"{len(self.files):05d}.pkl"
+            with open(self.files[group], "ab") as f:
+                pickle.dump(rows, f)
+        self.pending.clear()
+        self.n_pending = 0
+
+    def groups(self):
+        """Groups in the order the whole-table sort puts them (missing values last)."""
+        return sorted(set(self.pending) | set(self.files),
+                      key=lambda g: [(v is None, v or "") for v in g])
+
+    def rows(self, group):
+        """Every row of one group, in arrival order (its buffer and spill file are released)."""
+        out = []
+        path = self.files.pop(group, None)
+        if path is not None:
+            with open(path, "rb") as f:
+                while True:
+                    try:
+                        out.extend(pickle.load(f))
+                    except EOFError:
+                        break
+            path.unlink()
+        out.extend(self.pending.pop(group, []))
+        return out
+
+def write_monthly_summary(rows, out_csv: Path, chunk_rows: int = MONTHLY_CHUNK_ROWS):
+    """
+    Stream parsed rows (any iterable, e.g. iter_monthly_rows) into the master
+    CSV; returns (rows written, installations).
+
+    Installation, Loc# and Location are forward-filled as rows arrive, then
+    buffered per installation and Loc# (LocationBuffers). Sorting,
+    de-duplication and the cleanup rules never compare rows of different
+    groups, so the groups are cleaned (clean_monthly_frame) in sorted order,
+    a batch of consecutive groups at a time, and appended to the CSV. It is
+    the same file the whole-table cleanup writes, with memory bounded by the
+    chunk size and the largest group.
+    """
+    last = dict.fromkeys(MONTHLY_FILL_COLUMNS)
+    n_rows = 0
+    installations = set()
+    with tempfile.TemporaryDirectory(prefix="navy_monthly_") as spill_dir:
+        buffers = LocationBuffers(Path(spill_dir), chunk_rows)
+        for row in rows:
+            row = dict(row)
+            for c in MONTHLY_FILL_COLUMNS:
+                if pd.isna(row.get(c)):
+                    row[c] = last[c]
+                else:
+                    last[c] = row[c]
+            buffers.add(row)
+
+        # Consecutive groups are cleaned together, about `chunk_rows` rows per batch
+        groups = buffers.groups()
+        batch, first = [], True
+        for i, group in enumerate(groups):
+            batch.extend(buffers.rows(group))
+            if len(batch) < chunk_rows and i + 1 < len(groups):
+                continue
+            df = clean_monthly_frame(pd.DataFrame(batch))
+            # One header (and BOM) at the top, then each batch appended below
+            df.to_csv(out_csv, mode="w" if first else "a", header=first, index=False,
+                      encoding="utf-8-sig" if first else "utf-8")
+            first = False
+            n_rows += len(df)
+            installations.update(df["Installation"].dropna())
+            batch = []
+    return n_rows, len(installations)
+
+def run_monthly_summary(pdf_path: Path, out_dir: Path, stream: Optional[bool] = None):
+    print("🔍 Extracting Monthly Summary (v12.8) ...")
+    out_csv = out_dir / f"{pdf_path.stem}_monthly_summary_master.csv"
+    if stream is None:
+        stream = MONTHLY_STREAM
+    if stream:
+        # Parse pages as pdftotext produces them instead of waiting for the whole report;
+        # a saved page index narrows the stream to the Monthly Summary pages
+        index = page_index.read_saved_index(pdf_path)
+        pages = page_index.section_pages(index, "monthly_summary") if index else None
+        raw_lines = pdftext_stream.iter_lines(pdftext_stream.iter_pages(pdf_path, pages=pages))
+        rows = iter_monthly_rows(ln.strip() for ln in raw_lines if ln.strip())
+    else:
+        # Only the Monthly Summary pages, located through the saved page index (the full text without one)
+        text, section_pages = routed_text(pdf_path, "monthly_summary")
+        # Installation blocks unchanged since the last run are carried over from the page manifest
+        units = installation_units(text, section_pages)
+        rows = (row for block_rows in page_manifest.run_units(out_csv, units) for row in block_rows)
+
+    # Rows are cleaned and written one installation / Loc# group at a time
+    n_rows, n_inst = write_monthly_summary(rows, out_csv)
+    return out_csv, n_rows, n_inst
+
+# =========================================================
+# ---------------------- ALL REPORTS ----------------------
+# =========================================================
+# Master summary category of each slot/NAFI table
+TABLE_CATEGORIES = {"slot": "Slot Revenue", "nafi": "NAFI Reimbursement"}
+MONTHLY_KEY = ["Installation", "Loc#", "Location", "Month"]
+
+class ReportResult(NamedTuple):
+    pdf: Path
+    slot_csv: Path
+    nafi_csv: Path
+    monthly_csv: Path
+    monthly_rows: int
+    installations: int
+    seconds: float
+
+def process_report(pdf_path: Path, out_dir: Path = OUT_DIR, backend=None,
+                   stream: Optional[bool] = None) -> ReportResult:
+    """Part A (slot + NAFI) and Part B (monthly summary) of one report; stream=None → MONTHLY_STREAM."""
+    t0 = time.perf_counter()
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    slot_out, nafi_out = run_slot_nafi(Path(pdf_path), out_dir, backend=backend)
+    monthly_out, n_rows, n_inst = run_monthly_summary(Path(pdf_path), out_dir, stream=stream)
+    return ReportResult(Path(pdf_path), slot_out, nafi_out, monthly_out, n_rows, n_inst, time.perf_counter() - t0)
+
+def resolve_jobs(jobs: Optional[int], reports: int) -> int:
+    """None → one process per report (up to the CPU count); 0 or less → one per CPU core."""
+    cpus = os.cpu_count() or 1
+    if jobs is None:
+        return max(1, min(reports, cpus))
+    return cpus if jobs <= 0 else jobs
+
+def merge_summary_tables(results: List[ReportResult]) -> pd.DataFrame:
+    """
+    Slot and NAFI tables of every report in one table: Country, Installation,
+    Category, then the FY columns of all reports. Each value comes from the
+    last report that has it. The stray "$" some installations carry in the
+    layout text ("Chin Hae $") is dropped, and so are rows without values.
+    """
+    frames, all_cols = [], set()
+    for kind, category in TABLE_CATEGORIES.items():
+        merged, cols = None, set()
+        for res in results:
+            df = pd.read_csv(getattr(res, f"{kind}_csv"))
+            if df.empty:
+                continue
+            df["Installation"] = df["Installation"].str.replace(r"\s*\$$", "", regex=True)
+            df = df.drop_duplicates(["Country", "Installation"], keep="last").set_index(["Country", "Installation"])
+            cols.update(df.columns)
+            # Rows keep the order they first appear in
+            merged = df if merged is None else df.combine_first(merged).reindex(merged.index.append(df.index).unique())
+        if merged is None:
+            continue
+        merged = merged.reindex(columns=ordered_columns(cols)[2:]).dropna(how="all").reset_index()
+        merged.insert(2, "Category", category)
+        frames.append(merged)
+        all_cols |= cols
+    if not frames:
+        return pd.DataFrame()
+    return pd.concat(frames, ignore_index=True).reindex(
+        columns=["Country", "Installation", "Category"] + ordered_columns(all_cols)[2:])
+
+def merge_monthly_tables(results: List[ReportResult]) -> pd.DataFrame:
+    """Monthly summaries of every report, one row per location and month (the last report's row wins)."""
+    frames = [pd.read_csv(res.monthly_csv, dtype=str, keep_default_na=False, encoding="utf-8-sig")
+              for res in results if res.monthly_rows]
+    if not frames:
+        return pd.DataFrame()
+    df = pd.concat(frames, ignore_index=True).drop_duplicates(MONTHLY_KEY, keep="last")
+    df["MonthDate"] = months_to_dates(df["Month"])
+    df = df.sort_values(["Installation", "Loc#", "Location", "MonthDate"], kind="stable")
+    return df.drop(columns=["MonthDate"]).reset_index(drop=True)
+
+def run_navy_reports(pdf_paths: Iterable[Path], jobs: Optional[int] = None, out_dir: Path = OUT_DIR,
+                     backend=None, master: bool = True, stream: Optional[bool] = None) -> List[ReportResult]:
+    """
+    Extract every report in `pdf_paths` in parallel worker processes, then
+    (unless `master` is False) write the master CSVs merged across them.
+    Returns the results of the reports that succeeded, in input order.
+    """
+    order = []
+    for pdf_path in map(Path, pdf_paths):
+        if not pdf_path.exists():
+            print(f"🚨 Error: PDF file not found at {pdf_path}. Skipping.")
+        elif pdf_path not in order:
+            order.append(pdf_path)
+    if not order:
+        print("⚠️  No Navy reports to process.")
+        return []
+
+    jobs = resolve_jobs(jobs, len(order))
+    print(f"\n⚙️  Processing {len(order)} Navy report(s) with {min(jobs, len(order))} worker process(es)...")
+    t0 = time.perf_counter()
+    done = {}
+
+    def record(res: ReportResult) -> None:
+        done[res.pdf] = res
+        print(f"✅ {res.pdf.name}: {res.monthly_rows} monthly rows, {res.installations} installations ({res.seconds:.1f}s)")
+
+    if jobs <= 1:
+        for pdf_path in order:
+            try:
+                record(process_report(pdf_path, out_dir, backend, stream))
+            except Exception as e:
+                print(f"❌ {pdf_path.name} failed: {e}")
+    else:
+        with ProcessPoolExecutor(max_workers=min(jobs, len(order))) as pool:
+            futures = {pool.submit(process_report, pdf_path, out_dir, backend, stream): pdf_path
+                       for pdf_path in order}
+            for future in as_completed(futures):
+                try:
+                    record(future.result())
+                except Exception as e:
+                    print(f"❌ {futures[future].name} failed: {e}")
+    results = [done[p] for p in order if p in done]
+
+    if master and results:
+        summary = merge_summary_tables(results)
+        summary.to_csv(Path(out_dir) / SUMMARY_MASTER, index=False)
+        monthly = merge_monthly_tables(results)
+        monthly.to_csv(Path(out_dir) / MONTHLY_MASTER, index=False, encoding="utf-8-sig")
+        print(f"\n📚 Master CSVs from {len(results)} report(s):")
+        print(f" - Revenue & Reimbursement: {Path(out_dir) / SUMMARY_MASTER} ({len(summary)} rows)")
+        print(f" - Monthly Summary:         {Path(out_dir) / MONTHLY_MASTER} ({len(monthly)} rows)")
+    print(f"⏱️  {len(results)} report(s) in {time.perf_counter() - t0:.1f}s")
+    return results
+
+def default_reports() -> List[Path]:
+    return sorted(PDF_DIR.glob("Navy Revenue Report*.pdf"))
+
+def main(argv: Optional[List[str]] = None) -> int:
+    ap = argparse.ArgumentParser(description="Extract Navy Revenue Report PDFs in parallel and merge them into master CSVs.")
+    ap.add_argument("pdfs", nargs="*", type=Path,
+                    help=f"Navy report PDFs, later ones winning where they overlap "
+                         f"(default: every Navy Revenue Report*.pdf in {PDF_DIR}, by name)")
+    ap.add_argument("--jobs", type=int, default=None,
+                    help="worker processes (default: one per report; 0 = one per CPU core; 1 = serial)")
+    ap.add_argument("--out-dir", type=Path, default=OUT_DIR, help=f"output folder (default: {OUT_DIR})")
+    ap.add_argument("--backend", choices=("text", "bbox"), default=None,
+                    help="slot/NAFI table backend (default: NAVY_TABLE_BACKEND, else text); bbox is "
+                         "experimental, only validated on synthetic pages")
+    ap.add_argument("--stream", action=argparse.BooleanOptionalAction, default=None,
+                    help="parse the Monthly Summary pages as pdftotext converts them, without the page "
+                         "manifest (default: NAVY_MONTHLY_STREAM=1, else off)")
+    ap.add_argument("--no-master", action="store_true", help="only write each report's own CSVs")
+    args = ap.parse_args(argv)
+
+    pdfs = args.pdfs or default_reports()
+    results = run_navy_reports(pdfs, jobs=args.jobs, out_dir=args.out_dir, backend=args.backend,
+                               master=not args.no_master, stream=args.stream)
+    return 0 if results and len(results) == len(set(pdfs)) else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Number-token normalization shared by the text parsers.
+
+Each parser used to carry its own cleanup for the numbers it reads off a page:
+numCleanup in parseFinancialStatements.py, parse_value / clean_number /
+extract_number_tokens in navy_revenue.py and parse_int_token in
+FY2022_Asset_Report_Extraction.py. They now live here, with unchanged results,
+in two forms:
+
+  * per token: num_cleanup and parse_int_token are memoized, since a page
+    repeats the same few thousand tokens ("-", "0.00", column totals...), so
+    each distinct string is cleaned once per process (lru_cache of
+    TOKEN_CACHE entries). parse_value is not: its amounts are mostly
+    distinct and the cache lookup costs more than the parse
+  * per column: `num_cleanup_column`, `parse_values` and `clean_numbers` take
+    a whole column, find its distinct tokens (pd.factorize) and clean those
+    with pandas string ops / str.translate tables, then scatter the results
+    back to every row
+
+    num_cleanup(" 1,234.S6-")                  → "-1234.56"
+    num_cleanup_column(["12,3O4.00", None])    → ["12304.00", None]
+    parse_value("(1,234.50)")                  → -1234.5
+    parse_int_token("12-")                     → 12
+
+OCR fixes applied by num_cleanup: L l J → 1, Q O D o → 0, S s → 5; a minus
+at the end of the token ("1,234.56-") makes the value negative, other
+minus signs and the separators + : ; , . _ · " ' and whitespace are dropped,
+and the decimal point goes back in before the last two digits.
+
+benchmarks/bench_num_tokens.py measures tokens per second against the
+original per-token functions and checks the results are identical.
+"""
+import os
+import re
+from functools import lru_cache
+from typing import Iterable, List, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+# ============================= CONFIGURATION =============================
+TOKEN_CACHE = int(os.environ.get("NUM_TOKEN_CACHE", "65536"))   # distinct tokens memoized per function
+
+# numCleanup: separators dropped before the trailing-minus test, then minus signs dropped and OCR letters fixed
+CLEANUP_DROP = str.maketrans("", "", "+:;,._·\"'")
+CLEANUP_DIGITS = str.maketrans({"L": "1", "l": "1", "J": "1", "Q": "0", "O": "0", "D": "0", "o": "0",
+                                "S": "5", "s": "5", "-": None})
+RE_CLEANUP_DROP = re.compile(r"[\s+:;,._·\"']")
+
+RE_NUMS = re.compile(r"\(?-?\d{1,3}(?:,\d{3})*(?:\.\d+)?\)?")   # number tokens in a line's tail
+RE_NUMBER_TEXT = re.compile(r"\(?-?\d+(?:\.\d+)?\)?")          # numeric-looking text kept as printed
+RE_INT = re.compile(r"\d+")
+RE_INT_MINUS = re.compile(r"\d+-")
+
+
+# =============================== TOKENS ==============================
+@lru_cache(maxsize=TOKEN_CACHE)
+def num_cleanup(token: str) -> str:
+    """Financial Statements amount text as printed → "[-]digits.dd" (see the module docstring)."""
+    digits = "".join(token.split()).translate(CLEANUP_DROP)
+    minus = "-" if digits[-1] == "-" else ""   # IndexError on a token with no characters left, as before
+    digits = digits.translate(CLEANUP_DIGITS)
+    return minus + digits[:-2] + "." + digits[-2:]
+
+
+def parse_value(val: str):
+    """Money text → float ("(1,234)" is negative, "$" ignored); "" for blank, "-" or non-numbers."""
+    val = val.strip().replace("$", "")
+    if not val or val == "-":
+        return ""
+    neg = val.startswith("(") and val.endswith(")")
+    if neg:
+        val = val[1:-1]
+    try:
+        num = float(val.replace(",", ""))
+        return -num if neg else num
+    except ValueError:
+        return ""
+
+
+@lru_cache(maxsize=TOKEN_CACHE)
+def parse_int_token(tok: str) -> Optional[int]:
+    """Count text → int ("12" or "12-"); None for "-", "--", blank or anything else."""
+    tok = tok.strip()
+    if tok in ("-", "--", ""):
+        return None
+    if RE_INT.fullmatch(tok):
+        return int(tok)
+    if RE_INT_MINUS.fullmatch(tok):
+        return int(tok[:-1])
+    return None
+
+
+def clean_number(x):
+    """Keep parentheses as printed; return numeric-looking fields as the same text (no commas)."""
+    if pd.isna(x):
+        return pd.NA
+    s = str(x).strip().replace(",", "").replace("$", "")
+    if RE_NUMBER_TEXT.fullmatch(s):
+        return s
+    try:
+        return float(s)
+    except ValueError:
+        return s
+
+
+def extract_number_tokens(tail: str) -> List[str]:
+    """Number tokens of a line's tail, commas removed ("(1,234.50)" → "(1234.50)")."""
+    return [t.replace(",", "") for t in RE_NUMS.findall(tail)]
+
+
+def parse_int_tokens(tokens: Iterable[str]) -> List[Optional[int]]:
+    return [parse_int_token(tok) for tok in tokens]
+
+
+# =============================== COLUMNS ==============================
+def _distinct(values) -> tuple:
+    """(column as an object Series, mask of non-null cells, codes into uniques, distinct non-null values)."""
+    col = values.astype(object) if isinstance(values, pd.Series) else pd.Series(list(values), dtype=object)
+    present = col.notna().to_numpy()
+    codes, uniques = pd.factorize(col[present])
+    return col, present, codes, pd.Series(np.asarray(uniques, dtype=object), dtype=object)
+
+
+def _scatter(col: pd.Series, present: np.ndarray, codes: np.ndarray, cleaned) -> pd.Series:
+    out = col.to_numpy(dtype=object, copy=True)
+    out[present] = np.asarray(cleaned, dtype=object)[codes]
+    return pd.Series(out, index=col.index, name=col.name, dtype=object)
+
+
+def num_cleanup_column(values: Union[pd.Series, Iterable[str]]) -> pd.Series:
+    """num_cleanup over a whole column, each distinct token cleaned once; null cells stay null."""
+    col, present, codes, uniques = _distinct(values)
+    if not len(uniques):
+        return _scatter(col, present, codes, [])
+    text = uniques.str.replace(RE_CLEANUP_DROP, "", regex=True)
+    if (text.str.len() == 0).any():
+        num_cleanup(uniques[(text.str.len() == 0).to_numpy()].iloc[0])   # raises like the per-token version
+    minus = np.where(text.str.endswith("-").to_numpy(dtype=bool), "-", "").astype(object)
+    digits = text.str.translate(CLEANUP_DIGITS)
+    cleaned = minus + (digits.str[:-2] + "." + digits.str[-2:]).to_numpy(dtype=object)
+    return _scatter(col, present, codes, cleaned)
+
+
+def parse_values(values: Union[pd.Series, Iterable[str]]) -> pd.Series:
+    """parse_value over a whole column, each distinct token parsed once; null cells stay null."""
+    col, present, codes, uniques = _distinct(values)
+    return _scatter(col, present, codes, [parse_value(v) for v in uniques])
+
+
+def clean_numbers(col: pd.Series) -> pd.Series:
+    """clean_number over a whole column: numeric-looking text is kept as text, the rest goes through clean_number."""
+    text = col.astype("string").str.strip().str.replace(",", "", regex=False).str.replace("$", "", regex=False)
+    out = text.astype(object).where(text.notna(), pd.NA)
+    odd = text.notna() & ~text.str.fullmatch(RE_NUMBER_TEXT).fillna(False).astype(bool)
+    if odd.any():
+        out[odd] = col[odd].map(clean_number)
+    return out
@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""
+Persisted page-section index for the report PDFs.
+
+One pass over the page texts records, for every page, which report sections
+it belongs to and which report month it falls in. Parsers then receive only
+their own pages instead of rescanning the whole document.
+
+The index is saved next to the PDF as `<pdf stem>.index.json` and keyed by the
+PDF's SHA-256, so it is rebuilt automatically when the PDF changes.
+
+Each page entry looks like:
+
+    {"page": 12,
+     "headers": ["site_status"],                 sections whose title is on this page
+     "sections": ["asset_details", "site_status"], plus the section carried in from the previous page
+     "month": null,                              month named in a "... for month of" title on this page
+     "report_month": "October 2021"}             latest such month at or before this page
+
+A section runs from the page with its title up to the page where the next
+title appears. That boundary page belongs to both sections, so a parser still
+sees the line that ends its block.
+"""
+import json
+import re
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence
+
+import pdftext_cache
+
+# ============================= CONFIGURATION =============================
+INDEX_VERSION = 1
+
+# Section name → title pattern (searched per page, multi-line)
+SECTION_PATTERNS: Dict[str, "re.Pattern"] = {
+    # Asset reports
+    "region_service":      re.compile(r"(?:Assets|EGMs)\s+by\s+Region,?\s*Service", re.I),
+    "field_office":        re.compile(r"EGMs\s+by\s+Field\s+Office", re.I),
+    "installed_assets":    re.compile(r"Installed\s+Assets\s+by\s+Location,\s*Manufacture", re.I),
+    "asset_details":       re.compile(r"Installed\s+Assets\s+by\s+Location(?!,\s*Manufacture)"
+                                      r"|^\s*REGION\s+FONUM\s+FOSHORT\s+Loc\s+LNAME", re.I | re.M),
+    "years_in_storage":    re.compile(r"Years\s+in\s+Storage\s+\(EGMs\s+Only\)", re.I),
+    "site_status":         re.compile(r"Site\s+Operational\s+Status"
+                                      r"|^\s*Loc\s+LNAME\s+PLACE\s+Open\s+Closed", re.I | re.M),
+    "floor_details":       re.compile(r"^\s*Loc\s+PLACE\s+REGION\s+SVC", re.I | re.M),
+    "floor_rows":          re.compile(r"^\s*\d.*Floor", re.M),   # row marker, see ROW_SECTIONS
+    # Navy revenue reports
+    "slot_results":        re.compile(r"Slot Machine Results - Navy"),
+    "nafi":                re.compile(r"NAFI Reimbursement from ARMP"),
+    "monthly_summary":     re.compile(r"^\s*Monthly Summary by Location\s*$", re.M),
+    # Financial statements
+    "financial_condition": re.compile(r"Statement of Financial Condition"),
+    "operating_budget":    re.compile(r"\A(?=[\s\S]*Operating Results)(?=[\s\S]*Actual vs Budget)"),
+    "operating_branch":    re.compile(r"\A(?=[\s\S]*Operating Results)(?=[\s\S]*Branch of Service)"),
+    "gaming_revenue":      re.compile(r"Statement of Gaming Revenue"),
+    # District revenues
+    "district_revenue":    re.compile(r"Slot\s+Revenue\s*&\s*NAFI\s+Reimb(?:\.|ursement)?\s+by\s+Month", re.I),
+}
+
+# Tagged by their data rows rather than a title; they never carry over to the next page
+ROW_SECTIONS = {"floor_rows"}
+
+# Month title of the monthly asset report blocks
+RE_REPORT_MONTH = re.compile(
+    r"(?:Assets|EGMs)\s+by\s+Region,?\s*Service\s+for month of\s+([A-Za-z]+\s+\d{4})",
+    re.IGNORECASE,
+)
+
+
+# =============================== BUILDING ==============================
+def _page_headers(text: str) -> List[str]:
+    """Sections whose title appears on the page, in order of first appearance."""
+    found = []
+    for name, pattern in SECTION_PATTERNS.items():
+        m = pattern.search(text)
+        if m:
+            found.append((m.start(), name))
+    return [name for _, name in sorted(found)]
+
+
+def build_index(pages: Sequence[str]) -> List[dict]:
+    """Index a list of page texts (page 1 first) in a single pass."""
+    entries: List[dict] = []
+    carried: Optional[str] = None
+    report_month: Optional[str] = None
+    for num, text in enumerate(pages, start=1):
+        headers = _page_headers(text)
+        sections = ([carried] if carried and carried not in headers else []) + headers
+        m = RE_REPORT_MONTH.search(text)
+        month = m.group(1).strip() if m else None
+        report_month = month or report_month
+        entries.append({
+            "page": num,
+            "headers": headers,
+            "sections": sections,
+            "month": month,
+            "report_month": report_month,
+        })
+        titles = [h for h in headers if h not in ROW_SECTIONS]
+        if titles:
+            carried = titles[-1]
+    return entries
+
+
+# =============================== PERSISTENCE ==============================
+def index_path(pdf_path: Path) -> Path:
+    return Path(pdf_path).with_suffix(".index.json")
+
+
+def read_saved_index(pdf_path: Path, mode: str = "layout") -> Optional[List[dict]]:
+    """The saved index if it exists and matches the current PDF, else None."""
+    path = index_path(pdf_path)
+    if not path.exists():
+        return None
+    try:
+        saved = json.loads(path.read_text(encoding="utf-8"))
+        if (saved.get("sha256") == pdftext_cache.pdf_sha256(pdf_path) and saved.get("mode") == mode
+                and saved.get("version") == INDEX_VERSION):
+            return saved["pages"]
+    except (ValueError, KeyError):
+        pass  # unreadable index → rebuild
+    return None
+
+
+def load_index(pdf_path: Path, pages: Optional[Sequence[str]] = None,
+               mode: str = "layout", workers: Optional[int] = None) -> List[dict]:
+    """
+    Return the page index for a PDF, building and saving it when missing or stale.
+    Pass `pages` when the caller already holds the page texts, to skip reloading them.
+    """
+    pdf_path = Path(pdf_path)
+    saved = read_saved_index(pdf_path, mode)
+    if saved is not None:
+        return saved
+
+    path = index_path(pdf_path)
+    sha = pdftext_cache.pdf_sha256(pdf_path)
+    if pages is None:
+        pages = pdftext_cache.extract_pages(pdf_path, mode, workers=workers)
+    entries = build_index(pages)
+    try:
+        path.write_text(json.dumps({"version": INDEX_VERSION, "sha256": sha, "mode": mode,
+                                    "pages": entries}), encoding="utf-8")
+    except OSError as e:
+        print(f"⚠️  Could not save page index {path.name}: {e}")
+    return entries
+
+
+# =============================== QUERIES ==============================
+def section_pages(index: List[dict], *sections: str, with_month_pages: bool = True,
+                  headers_only: bool = False) -> List[int]:
+    """
+    Page numbers belonging to any of `sections`, in document order.
+    with_month_pages also keeps the page whose month title each selected page
+    falls under, so month-tracking parsers keep their context. headers_only
+    restricts the match to pages that carry the section title itself.
+    """
+    wanted = set(sections)
+    key = "headers" if headers_only else "sections"
+    selected = set()
+    month_page = None
+    for entry in index:
+        if entry["month"]:
+            month_page = entry["page"]
+        if wanted.intersection(entry[key]):
+            selected.add(entry["page"])
+            if with_month_pages and month_page is not None:
+                selected.add(month_page)
+    return sorted(selected)
+
+
+def section_text(pages: Sequence[str], index: List[dict], *sections: str,
+                 with_month_pages: bool = True) -> str:
+    """Text of the section pages, joined with form feeds like the full pdftotext output."""
+    nums = section_pages(index, *sections, with_month_pages=with_month_pages)
+    return "".join(pages[p - 1] + "\f" for p in nums)
+
+
+def month_map(index: List[dict]) -> Dict[int, str]:
+    """
+    Page → report month. Each month starts at the first page carrying its
+    title (later repeats are ignored) and runs until the next month starts;
+    pages before the first month title are left out.
+    """
+    month_start_pages = []
+    seen = set()
+    for entry in index:
+        month = entry["month"]
+        if month and month not in seen:
+            month_start_pages.append((entry["page"], month))
+            seen.add(month)
+
+    mapping: Dict[int, str] = {}
+    last_end = len(index)
+    for start, month in reversed(month_start_pages):
+        for p in range(start, last_end + 1):
+            mapping[p] = month
+        last_end = start - 1
+    return mapping
+
+
+def pages_by_section(index: Iterable[dict]) -> Dict[str, List[int]]:
+    """Section name → page numbers, for a quick overview of a report."""
+    out: Dict[str, List[int]] = {}
+    for entry in index:
+        for name in entry["sections"]:
+            out.setdefault(name, []).append(entry["page"])
+    return out
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Per-page hash manifests for incremental re-extraction.
+
+An extractor cuts its input into units: a single page, or a group of pages
+the parser has to read together. Each unit gets a key, which is a hash of the
+unit's text, any context the parser reads (e.g. the report month) and the
+extractor's source code. run_units() keeps what every unit produced next to
+the output CSV:
+
+    <csv stem>.manifest.json   {"version": 1, "units": [{"key": ..., "pages": [3, 4], "rows": 12}, ...]}
+    <csv stem>.rows.pkl        unit key → rows of that unit
+
+On the next run (e.g. a revised or extended report) a unit whose key is
+unchanged gets its rows back without being parsed; only new or changed units
+are parsed. Rows are stored as the parser produced them, before any
+whole-table cleanup (sorting, de-duplication, fix-ups), so the extractor's
+final steps still see every row and the CSV matches a full run.
+
+    units = [Unit(unit_key(CODE_VERSION, month, text), (page,), partial(parse_page, text))
+             for page, text in ...]
+    rows = [row for unit_rows in run_units(out_csv, units) for row in unit_rows]
+
+Set INCREMENTAL_EXTRACTION=0 to ignore saved rows and parse everything.
+"""
+import hashlib
+import inspect
+import json
+import os
+import pickle
+import tempfile
+from pathlib import Path
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+# ============================= CONFIGURATION =============================
+MANIFEST_VERSION = 1
+INCREMENTAL = os.environ.get("INCREMENTAL_EXTRACTION", "1") != "0"
+
+
+class Unit(NamedTuple):
+    key: str                 # content hash of everything the parse depends on
+    pages: Tuple[int, ...]   # pages the unit covers (recorded in the manifest)
+    parse: Callable[[], Any]
+
+
+# =============================== KEYS ==============================
+def unit_key(*parts: object) -> str:
+    """SHA-256 over the parts (text, month, version ...), order-sensitive."""
+    h = hashlib.sha256()
+    for part in parts:
+        h.update(str(part).encode("utf-8", errors="surrogatepass"))
+        h.update(b"\0")
+    return h.hexdigest()
+
+
+def source_version(*paths: Path) -> str:
+    """Hash of source files, so editing a parser invalidates the rows it produced."""
+    h = hashlib.sha256()
+    for path in paths:
+        h.update(Path(path).read_bytes())
+    return h.hexdigest()[:16]
+
+
+def function_version(*funcs: Callable) -> str:
+    """Hash of functions' source, for keys only an edit to those functions should invalidate."""
+    h = hashlib.sha256()
+    for func in funcs:
+        h.update(inspect.getsource(func).encode("utf-8"))
+        h.update(b"\0")
+    return h.hexdigest()[:16]
+
+
+# =============================== STORAGE ==============================
+def manifest_path(out_csv: Path) -> Path:
+    return Path(out_csv).with_suffix(".manifest.json")
+
+
+def rows_path(out_csv: Path) -> Path:
+    return Path(out_csv).with_suffix(".rows.pkl")
+
+
+def _atomic_write_bytes(path: Path, data: bytes) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.unlink(tmp)
+        raise
+
+
+def load_rows(out_csv: Path) -> Dict[str, Any]:
+    """Unit key → rows saved by the last run, or {} when missing or unreadable."""
+    try:
+        manifest = json.loads(manifest_path(out_csv).read_text(encoding="utf-8"))
+        if manifest.get("version") != MANIFEST_VERSION:
+            return {}
+        with open(rows_path(out_csv), "rb") as f:
+            saved = pickle.load(f)
+    except (OSError, ValueError, pickle.UnpicklingError, EOFError):
+        return {}
+    return saved if isinstance(saved, dict) else {}
+
+
+def save_rows(out_csv: Path, units: Sequence[Unit], results: Sequence[Any]) -> None:
+    store = {unit.key: rows for unit, rows in zip(units, results)}
+    manifest = {
+        "version": MANIFEST_VERSION,
+        "units": [{"key": unit.key, "pages": list(unit.pages),
+                   "rows": len(rows) if hasattr(rows, "__len__") else None}
+                  for unit, rows in zip(units, results)],
+    }
+    try:
+        _atomic_write_bytes(rows_path(out_csv), pickle.dumps(store, protocol=pickle.HIGHEST_PROTOCOL))
+        _atomic_write_bytes(manifest_path(out_csv), json.dumps(manifest, indent=1).encode("utf-8"))
+    except OSError as e:
+        print(f"⚠️  Could not save page manifest for {Path(out_csv).name}: {e}")
+
+
+# =============================== RUN ==============================
+def run_units(out_csv: Optional[Path], units: Sequence[Unit], incremental: Optional[bool] = None,
+              parse_units: Optional[Callable[[Sequence[Unit]], List[Any]]] = None) -> List[Any]:
+    """
+    Rows of every unit, in order: carried over from the last run when the
+    unit's key is unchanged, parsed otherwise. Saves the new manifest.
+    out_csv=None parses every unit and saves nothing.
+
+    parse_units(units) → their rows, in order, parses the units that were not
+    carried over in one call (e.g. in batches on a process pool); by default
+    each unit's parse() runs here, one after another.
+    """
+    if parse_units is None:
+        parse_units = _parse_each
+    if out_csv is None:
+        return list(parse_units(units))
+    if incremental is None:
+        incremental = INCREMENTAL
+    saved = load_rows(out_csv) if incremental else {}
+
+    stale = [unit for unit in units if unit.key not in saved]
+    parsed = dict(zip((unit.key for unit in stale), parse_units(stale)))
+    results: List[Any] = [saved[unit.key] if unit.key in saved else parsed[unit.key] for unit in units]
+    save_rows(out_csv, units, results)
+
+    if saved:
+        parsed_pages = {page for unit in stale for page in unit.pages}
+        print(f"♻️  {Path(out_csv).name}: {len(units) - len(stale)}/{len(units)} units unchanged, "
+              f"{len(stale)} re-parsed ({len(parsed_pages)} new or changed pages)")
+    return results
+
+
+def _parse_each(units: Sequence[Unit]) -> List[Any]:
+    return [unit.parse() for unit in units]
@@ -1,5 +1,7 @@
 import datetime
+import math
 import subprocess
+import time
 from dateutil import parser
 from decimal import Decimal
 from pathlib import Path
@@ -8,18 +10,34 @@ import pandas as pd
 import numpy as np
 import re
 import csv
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from functools import partial
 
-# File is ready to run as is. 
+import num_tokens
+import page_manifest
+
+# File is ready to run as is (python parseFinancialStatements.py), or import it and call runProcess(pdf, jobs=N).
 # Output CSV files can be found at \fa25-team-b\CSVs
+# FS_PARSER_JOBS=N parses page batches in N worker processes (0 = one per CPU core, 1 = serial, the default).
 
 root_dir = str(Path(__file__).resolve().parent.parent)
 pdf = r"\pdf\Financial Statements.pdf"
 outPath = r'\CSVs\Financial Statements'
 csvs = [r'\FinancialStatement.csv', r'\ActualVsBudget.csv', r'\BranchBudget.csv', r'\GamingRevenue.csv']
-badDates = [datetime.datetime(2021, 1, 31), datetime.datetime(2020, 5, 31)]
+parserJobs = int(os.environ.get("FS_PARSER_JOBS", "1"))
+batchPages = int(os.environ.get("FS_BATCH_PAGES", "16")) #most pages a worker parses per task
+#pages with these dates are skipped by the budget and revenue parsers (Jan 2020 used to be appended by parseTotalBudget,
+#which left it in the list for every parser run after it)
+badDates = [datetime.datetime(2021, 1, 31), datetime.datetime(2020, 5, 31), datetime.datetime(2020, 1, 31)]
 with open(root_dir + r'\pdf\categoryMap.csv', 'r') as f:
     reader = csv.reader(f)
     categoryMap = dict(reader)
+assets = {"Revenue": "Revenue", 
+          "Operating Expenses": "Expenses", 
+          "Interest Revenue": "Net"} #budget section titles → AssetType
+budgetFixes = {'-242631.91': '-24263.91'} #misprinted budget amounts → corrected value
+word2num = {"Two": "2", "Three": "3", "Four": "4", "Five": "5", "Six": "6", "Seven": "7", 
+            "Eight": "8", "Nine": "9", "Ten": "10", "Eleven": "11", "Twelve": "12"} #found a library for this that doesn't work.
 
 #Getting page type from title
 def determinePageType(page: str) -> str:
@@ -45,32 +63,136 @@ def parseDate(line: list[str]) -> datetime:
 
     return parser.parse(" ".join(line[-3:]).strip())
 
-#Clean number strings that have been improperly parsed
-def numCleanup(numStr: str) -> str:
-    trailingMinus = ''
-
-    removeSpace = re.sub(r'[\s+]', '', numStr.strip()) #remove spaces
-    badChars = re.sub(r'[:;,._·\"\']', '', removeSpace) #remove characters that we don't want (add back in decimal later)
-    if badChars[-1] == '-': #we need to remove erroneous characters so we can check if minus is in expected place
-        trailingMinus = '-' #save trailing minus before we erase all instances of character
+#Clean the number cells (row[start:stop]) of a page's rows in place; num_tokens.num_cleanup is memoized, so each
+#distinct token is cleaned once per process. fixes maps a cleaned value to its correction
+def cleanNumberCells(data: list[list[str]], start: int, stop: int = None, fixes: dict = None) -> list[list[str]]:
+    fixes = fixes or {}
+    for row in data:
+        for i in range(len(row))[start:stop]:
+            cell = num_tokens.num_cleanup(row[i])
+            row[i] = fixes.get(cell, cell)
+    return data
 
-    removeMinus = re.sub(r'[-]', '', badChars) #now we can remove all minus instances
-    letterTransposition = re.sub(r'[LlJ]', '1', removeMinus) #fixes num->letter transposition error 
-    zeroTransposition = re.sub(r'[QODo]', '0', letterTransposition) #fixes letter->number transposition error for 0 and 5
-    fiveTransposition = re.sub(r'[Ss]', "5", zeroTransposition)
-    
-    return trailingMinus + fiveTransposition[:-2] + '.' + fiveTransposition[-2:] #add back in decimal point and put minus in front for excel (if needed)
-    
 #convert to DataFrame for easy csv export
 def exportCSV(data: list[list[str]], file: str, headers: list[str]):
     df = pd.DataFrame(data)
     df.columns = headers
     df.to_csv(root_dir + outPath + file, index=False)
 
+#Split a page into its non-blank lines
+def pageLines(page: str) -> list[str]:
+    page = os.linesep.join([s for s in page.splitlines() if s]) #remove blank lines
+    return page.splitlines() #split page into lines
+
+#Read the page header: (date, location, number of months covered)
+def pageHeader(pageType: str, lines: list[str]) -> tuple:
+    if pageType == "RevenueStatement":
+        return parseDate(lines[2].strip().split()), "", "1"
+
+    months = "1"
+    if pageType == "OperatingBranchBudget" and 'Months' in lines[3].strip(): #If we're dealing with a multiple month consolidated report
+        months = word2num[lines[3].strip().split()[2]]
+
+    date = parseDate(lines[3].strip().split()) #parse date from header
+    location = "" if pageType == "FinancialStatement" else lines[1].split()[0] #get location (Korea, Europe, Japan or Consolidated)
+    return date, location, months
+
+#Page fixups: each repairs one known bad page and returns its fixed lines. pageFixups pairs each fixup with
+#the header fields of the page(s) it applies to (year, month, location, months)
+
+def fixFinancialMay2020(lines):
+    lines[11] = lines[11].strip()[:-1] + '-'
+    return lines
+
+def fixBudgetKorea2019(lines):
+    lines[34] = lines[34][:70] + lines[32].strip() + lines[34][70:]
+    return lines[:32] + lines[34:]
+
+def fixBranchEuropeJan2020(lines):
+    lines[12] = "Operating Expenses"
+    return lines
+
+def fixBranchConsolidatedQ1_2019(lines):
+    lines[16] = lines[16][:35] + '4' + lines[16][36:]
+    return lines
+
+def fixBranchJapanQ1_2019(lines):
+    lines[24] = lines[24][:79] + lines[24][80:]
+    return lines
+
+def fixRevenueJan2020(lines):
+    lines[40] = lines[40] + lines[42]
+    return lines[:42]
+
+def fixRevenueDec2019(lines):
+    lines[7] = lines[5] + lines[7]
+    return lines[0:5] + lines[6:]
+
+pageFixups = {"FinancialStatement": [({"year": 2020, "month": 5}, fixFinancialMay2020)],
+              "OperatingBudget": [({"year": 2019, "location": "Korea"}, fixBudgetKorea2019)],
+              "OperatingBranchBudget": [({"year": 2020, "month": 1, "location": "Europe"}, fixBranchEuropeJan2020),
+                                        ({"year": 2019, "months": "3", "location": "Consolidated"}, fixBranchConsolidatedQ1_2019),
+                                        ({"year": 2019, "months": "3", "location": "Japan"}, fixBranchJapanQ1_2019)],
+              "RevenueStatement": [({"year": 2020, "month": 1}, fixRevenueJan2020),
+                                   ({"year": 2019, "month": 12}, fixRevenueDec2019)]}
+
+#The page type's fixups that apply to a page with this header, in order
+def pageFixupsFor(pageType: str, header: tuple) -> list:
+    date, location, months = header
+    fields = {"year": date.year, "month": date.month, "location": location, "months": months}
+    return [fix for match, fix in pageFixups[pageType] if all(fields[k] == v for k, v in match.items())]
+
+#Rows of one page, from its raw text and header: fixups, the page type's row parser, then number cleanup,
+#so the page manifest saves finished rows
+def parsePage(pageType: str, page: str, header: tuple) -> list[list[str]]:
+    lines = pageLines(page)
+    for fix in pageFixupsFor(pageType, header):
+        lines = fix(list(lines))
+    rows = pageParsers[pageType](*header, lines)
+    return cleanNumberCells(rows, *numberCells[pageType])
+
+#Header of each page, memoized per page text next to the CSV (<file>.headers.*), so a reused page skips dateutil
+def pageHeaders(pages: list[str], pageType: str, file: str) -> list[tuple]:
+    headerVersion = page_manifest.function_version(pageLines, pageHeader, parseDate)
+    context = page_manifest.unit_key(sorted(word2num.items()))
+    units = [page_manifest.Unit(page_manifest.unit_key(page, pageType, headerVersion, context), (i,),
+                                partial(pageHeader, pageType, pageLines(page)))
+             for i, page in enumerate(pages)]
+    return page_manifest.run_units(Path(root_dir + outPath + file).with_suffix(".headers.csv"), units)
+
+#Rows of each page, re-parsing only pages whose text, header, parser or fixups changed since the last export of that file.
+#Memo key: raw page text, page type, its header (see pageHeaders), parser version (source of the row parsing code of
+#this page type, with num_tokens), the source and header fields of the fixups that apply to this page, and the lookup
+#tables. Editing a fixup re-parses only the pages it fixes; a reused page costs a hash.
+#parseUnits parses the changed pages in one call (see parseInPool); by default they are parsed here, in order.
+def parsePages(pages: list[str], pageType: str, file: str, parseUnits=None) -> list[list[str]]:
+    parserVersion = page_manifest.function_version(parsePage, pageLines, pageFixupsFor, buildFinancialRow, buildBudgetRow,
+                                                   buildRevenueRow, pageParsers[pageType], cleanNumberCells)
+    parserVersion += page_manifest.source_version(Path(num_tokens.__file__))
+    context = page_manifest.unit_key(badDates, sorted(categoryMap.items()), sorted(assets.items()), numberCells[pageType])
+    fixupKeys = {fix: page_manifest.unit_key(sorted(match.items()), page_manifest.function_version(fix))
+                 for match, fix in pageFixups[pageType]}
+    units = []
+    for i, (page, header) in enumerate(zip(pages, pageHeaders(pages, pageType, file))):
+        fixups = [fixupKeys[fix] for fix in pageFixupsFor(pageType, header)]
+        key = page_manifest.unit_key(page, pageType, header, parserVersion, context, fixups)
+        units.append(page_manifest.Unit(key, (i,), partial(parsePage, pageType, page, header)))
+    return [row for pageRows in page_manifest.run_units(Path(root_dir + outPath + file), units, parse_units=parseUnits)
+            for row in pageRows]
+
+#Worker task: rows of each page in a batch
+def parseBatch(parses: list) -> list[list[list[str]]]:
+    return [parse() for parse in parses]
+
+#Parse page units in batches of up to batchPages on a worker pool; rows come back in page order
+def parseInPool(pool: ProcessPoolExecutor, workers: int, units: list) -> list[list[list[str]]]:
+    size = max(1, min(batchPages, math.ceil(len(units) / workers)))
+    batches = [[unit.parse for unit in units[i:i + size]] for i in range(0, len(units), size)]
+    return [pageRows for batch in pool.map(parseBatch, batches) for pageRows in batch]
+
 #Build row for the FinancialStatements.csv file
 def buildFinancialRow(date: datetime, category: str, cols: list[str]) -> list[str]:
     assetType = re.sub(r'[.]', '', ' '.join(cols[0:-1]))
-    cols[-1] = numCleanup(cols[-1])
     return [date, assetType, cols[-1], category]
 
 #Build row for the ActualVsBudget.csv and BranchBudget file
@@ -92,11 +214,7 @@ def buildBudgetRow(date: datetime, location: str, assetType: str, cols: list[str
             else:
                 budgetRow.append(cols[i]) #append row category
         else:
-            cols[i] = numCleanup(cols[i])
-            if cols[i] == '-242631.91': 
-                cols[i] = '-24263.91'
-                
-            budgetRow.append(cols[i])
+            budgetRow.append(cols[i]) #number text as printed, cleaned by cleanNumberCells
 
     return budgetRow
 
@@ -119,157 +237,141 @@ def buildRevenueRow(date: datetime, cols: list[str]) -> list[str]:
             else:
                 revenueRow.append(re.sub("S ", "S", cols[i])) #append row category
         else:
-            cols[i] = numCleanup(cols[i])
-            revenueRow.append(cols[i]) #TODO: Get regex parser to ensure number, otherwise append np.nan!
+            revenueRow.append(cols[i]) #number text as printed, cleaned by cleanNumberCells. TODO: Get regex parser to ensure number, otherwise append np.nan!
 
     return revenueRow
 
 #Parse all Statement of Financial Condition pages
-def parseFinancials(pages: list[str]) -> None:
+def parseFinancials(pages: list[str], parseUnits=None) -> None:
     header = ['Date', 'AssetType', 'Balance', 'Category']
-    data = []
+    data = parsePages(pages, "FinancialStatement", csvs[0], parseUnits)
 
-    for page in pages:
-        page = os.linesep.join([s for s in page.splitlines() if s]) #remove blank lines
-        lines = page.splitlines() #split page into lines
-        date = parseDate(lines[3].strip().split())
-        category = ""
+    exportCSV(data, csvs[0], header) #export to csv file
 
-        start = [idx for idx, val in enumerate(lines) if "Balance" in val][0] + 1 #find starting index for asset data
+#Parse one Statement of Financial Condition page (lines already fixed up)
+def parseFinancialPage(date: datetime, location: str, months: str, lines: list[str]) -> list[list[str]]:
+    data = []
+    category = ""
 
-        if date.year == 2020 and date.month == 5:
-            lines[11] = lines[11].strip()[:-1] + '-'
+    start = [idx for idx, val in enumerate(lines) if "Balance" in val][0] + 1 #find starting index for asset data
 
-        for line in lines[start:-1]:
-            line = line.strip()
-            cols = re.split(r'[\s]{2,}', line) #split by multiple whitespace delimiter
-
-            if len(cols) == 1 and '--' not in cols[0] and '==' not in cols[0]:
-                category = cols[0]
-            elif "EQUITY" in cols[0]:
-                category = "EQUITY"
-                if re.match(r'[\w]', ' '.join(cols[0:-1])) :
-                    data.append(buildFinancialRow(date, category, cols))
-            else:
-                if re.match(r'[\w]', ' '.join(cols[0:-1])) :
-                    data.append(buildFinancialRow(date, category, cols))
+    for line in lines[start:-1]:
+        line = line.strip()
+        cols = re.split(r'[\s]{2,}', line) #split by multiple whitespace delimiter
 
-    exportCSV(data, csvs[0], header) #export to csv file
+        if len(cols) == 1 and '--' not in cols[0] and '==' not in cols[0]:
+            category = cols[0]
+        elif "EQUITY" in cols[0]:
+            category = "EQUITY"
+            if re.match(r'[\w]', ' '.join(cols[0:-1])) :
+                data.append(buildFinancialRow(date, category, cols))
+        else:
+            if re.match(r'[\w]', ' '.join(cols[0:-1])) :
+                data.append(buildFinancialRow(date, category, cols))
+
+    return data
 
 #Parse all Actual Vs Budget pages
-def parseTotalBudget(pages: list[str]) -> None:
+def parseTotalBudget(pages: list[str], parseUnits=None) -> None:
     header = ['Date', 'Location', "AssetType", 'Category', 'Month_Actual', 'Month_Budget', 
               'Month_Variance', 'YTD_Actual', 'YTD_Budget', 'YTD_Variance']
-    data = []
-    assets = {"Revenue": "Revenue", 
-              "Operating Expenses": "Expenses", 
-              "Interest Revenue": "Net"}
-    
-    tbBadDates = badDates
-    tbBadDates.append(datetime.datetime(2020, 1, 31))
 
-    for page in pages:
-        page = os.linesep.join([s for s in page.splitlines() if s]) #remove blank lines
-        lines = page.splitlines() #split page into lines
-        date = parseDate(lines[3].strip().split()) #parse date from header
-        location = lines[1].split()[0] #get location (Korea, Europe, Japan or Consolidated)
-        assetType = ""
+    data = parsePages(pages, "OperatingBudget", csvs[1], parseUnits)
+
+    exportCSV(data, csvs[1], header) #csv export
 
-        if date.year == 2019 and location == "Korea":
-            lines[34] = lines[34][:70] + lines[32].strip() + lines[34][70:]
-            lines = lines[:32] + lines[34:]
+#Parse one Actual Vs Budget page (lines already fixed up)
+def parseTotalBudgetPage(date: datetime, location: str, months: str, lines: list[str]) -> list[list[str]]:
+    data = []
+    assetType = ""
 
-        if date not in badDates:
-            for line in lines[4:-1]: #for lines with data
-                line = line.strip()
-                cols = re.split(r'[\s]{2,}', line) #split into columns by multiple whitespace delimiter
+    if date not in badDates:
+        for line in lines[4:-1]: #for lines with data
+            line = line.strip()
+            cols = re.split(r'[\s]{2,}', line) #split into columns by multiple whitespace delimiter
 
-                if not re.match(r'[-=_]{3,}', cols[0]): #if the current line isn't a section delimiter (denoted by --- or ===)
-                    if cols[0] in assets: #if beginning maps to assettype we will update the assetType column
-                        assetType = assets[cols[0]]
+            if not re.match(r'[-=_]{3,}', cols[0]): #if the current line isn't a section delimiter (denoted by --- or ===)
+                if cols[0] in assets: #if beginning maps to assettype we will update the assetType column
+                    assetType = assets[cols[0]]
 
-                    if len(cols) > 1 and assetType != "": #if we have an assettype and a line with budget data build row
-                        data.append(buildBudgetRow(date, location, assetType, cols, 7))
+                if len(cols) > 1 and assetType != "": #if we have an assettype and a line with budget data build row
+                    data.append(buildBudgetRow(date, location, assetType, cols, 7))
 
-    exportCSV(data, csvs[1], header) #csv export
+    return data
 
 #Parse all Branch Operating Results pages
-def parseBranchBudget(pages: list[str]) -> None:
+def parseBranchBudget(pages: list[str], parseUnits=None) -> None:
     header = ['Date', 'Location', "AssetType", 'Category', 'ARMP', 'Army', 'Navy', 'USMC', 'MonthCount']
-    data = []
-    assets = {"Revenue": "Revenue", 
-              "Operating Expenses": "Expenses", 
-              "Interest Revenue": "Net"}
-    word2num = {"Two": "2", "Three": "3", "Four": "4", "Five": "5", "Six": "6", "Seven": "7", 
-                "Eight": "8", "Nine": "9", "Ten": "10", "Eleven": "11", "Twelve": "12"} #found a library for this that doesn't work.
-
-    for page in pages:
-        page = os.linesep.join([s for s in page.splitlines() if s]) #remove blank lines
-        lines = page.splitlines() #split page into lines
-        months = "1"
-        if 'Months' in lines[3].strip(): #If we're dealing with a multiple month consolidated report
-            months = word2num[lines[3].strip().split()[2]]
-        
-        date = parseDate(lines[3].strip().split())
-        location = lines[1].split()[0] #get location (Korea, Europe, Japan or Consolidated)
-        assetType = ""
-
-        #specific fix for pages with minor error
-        if date.month == 1 and date.year == 2020 and location == 'Europe':
-            lines[12] = "Operating Expenses"
-
-        if date.year == 2019 and months == "3":
-            if location == "Consolidated":
-                lines[16] = lines[16][:35] + '4' + lines[16][36:]
-            elif location == "Japan":
-                lines[24] = lines[24][:79] + lines[24][80:]
-
-        if date not in badDates:
-            for line in lines[4:-1]: #for lines with data
-                line = line.strip()
-                cols = re.split(r'[\s]{2,}', line)
-
-                if not re.match(r'[-=_]{3,}', cols[0]): #if the current line isn't a section delimiter (denoted by --- or ===)
-                    if cols[0] in assets: #if beginning maps to assettype we will update the assetType column
-                        assetType = assets[cols[0]]
-
-                    if len(cols) > 1 and assetType != "": #if we have an assettype and a line with budget data build row
-                        data.append(buildBudgetRow(date, location, assetType, cols, 5))
-                        data[-1].append(months)
+    data = parsePages(pages, "OperatingBranchBudget", csvs[2], parseUnits)
 
     exportCSV(data, csvs[2], header) #csv export
 
+#Parse one Branch Operating Results page (lines already fixed up)
+def parseBranchBudgetPage(date: datetime, location: str, months: str, lines: list[str]) -> list[list[str]]:
+    data = []
+    assetType = ""
+
+    if date not in badDates:
+        for line in lines[4:-1]: #for lines with data
+            line = line.strip()
+            cols = re.split(r'[\s]{2,}', line)
+
+            if not re.match(r'[-=_]{3,}', cols[0]): #if the current line isn't a section delimiter (denoted by --- or ===)
+                if cols[0] in assets: #if beginning maps to assettype we will update the assetType column
+                    assetType = assets[cols[0]]
+
+                if len(cols) > 1 and assetType != "": #if we have an assettype and a line with budget data build row
+                    data.append(buildBudgetRow(date, location, assetType, cols, 5))
+                    data[-1].append(months)
+
+    return data
+
 #Parse all Statement of Gaming Revenue pages
-def parseRevenue(pages: list[str]) -> None:
+def parseRevenue(pages: list[str], parseUnits=None) -> None:
     header = ['Date', 'Base_Location', 'Europe', 'Korea', 'Japan', 'YTD Europe', 'YTD Korea', 'YTD Japan']
+    data = parsePages(pages, "RevenueStatement", csvs[3], parseUnits)
+
+    exportCSV(data, csvs[3], header) #csv export
+
+#Parse one Statement of Gaming Revenue page (lines already fixed up)
+def parseRevenuePage(date: datetime, location: str, months: str, lines: list[str]) -> list[list[str]]:
     data = []
 
-    for page in pages:
-        page = os.linesep.join([s for s in page.splitlines() if s]) #remove blank lines
-        lines = page.splitlines() #split page into lines
-        date = parseDate(lines[2].strip().split())
+    if date not in badDates:
+        for line in lines[5:-1]: #for lines with data
+            line = line.strip()
+            cols = re.split(r'[\s]{2,}', line)
 
-        #specific fix for pages with minor error
-        if date.year == 2020 and date.month == 1:
-            lines[40] = lines[40] + lines[42]
-            lines = lines[:42]
+            if not re.match(r'[-=_]{3,}', cols[0]) and len(cols) > 1: #if the current line isn't a section delimiter (denoted by --- or ===)
+                data.append(buildRevenueRow(date, cols))
 
-        if date.year == 2019 and date.month == 12:
-            lines[7] = lines[5] + lines[7]
-            lines = lines[0:5] + lines[6:]
+    return data
 
-        if date not in badDates:
-            for line in lines[5:-1]: #for lines with data
-                line = line.strip()
-                cols = re.split(r'[\s]{2,}', line)
+pageParsers = {"FinancialStatement": parseFinancialPage,
+               "OperatingBudget": parseTotalBudgetPage,
+               "OperatingBranchBudget": parseBranchBudgetPage,
+               "RevenueStatement": parseRevenuePage}
 
-                if not re.match(r'[-=_]{3,}', cols[0]) and len(cols) > 1: #if the current line isn't a section delimiter (denoted by --- or ===)
-                    data.append(buildRevenueRow(date, cols))
+#Number cells of each page type's rows, cleaned by cleanNumberCells: (start, stop, fixes)
+numberCells = {"FinancialStatement": (2, 3, None), #Balance
+               "OperatingBudget": (4, None, budgetFixes),
+               "OperatingBranchBudget": (4, -1, budgetFixes), #MonthCount is not a number cell
+               "RevenueStatement": (2, None, None)}
 
-    exportCSV(data, csvs[3], header) #csv export
+#Page type → function that parses and exports all pages of that type
+typeParsers = {"FinancialStatement": parseFinancials,
+               "OperatingBudget": parseTotalBudget,
+               "OperatingBranchBudget": parseBranchBudget,
+               "RevenueStatement": parseRevenue}
+
+#None → FS_PARSER_JOBS; 0 or less → one worker per CPU core
+def resolveJobs(jobs: int = None) -> int:
+    jobs = parserJobs if jobs is None else jobs
+    return (os.cpu_count() or 1) if jobs <= 0 else jobs
 
-#Run the parser
-def runProcess(pdf: str) -> None:
+#Run the parser. jobs > 1 parses page batches of every type in that many worker processes;
+#each CSV is exported as soon as all pages of its type are parsed, rows in page order either way.
+def runProcess(pdf: str, jobs: int = None) -> None:
 
     pageType = {"FinancialStatement" : [],
                 "OperatingBudget" : [],
@@ -288,10 +390,22 @@ def runProcess(pdf: str) -> None:
         if len(pages[i]) != 0: 
             pageType[determinePageType(pages[i])].append(pages[i]) #otherwise append page to its list in dict
 
-    #call to parse each type of page
-    parseFinancials(pageType["FinancialStatement"])
-    parseTotalBudget(pageType["OperatingBudget"])
-    parseBranchBudget(pageType["OperatingBranchBudget"])
-    parseRevenue(pageType["RevenueStatement"])
-
-runProcess(pdf)
\ No newline at end of file
+    jobs = resolveJobs(jobs)
+    t0 = time.perf_counter()
+    if jobs <= 1:
+        #call to parse each type of page
+        for name, parseType in typeParsers.items():
+            parseType(pageType[name])
+    else:
+        #one thread per page type hands its page batches to the shared worker pool and exports when they are all back
+        print(f"⚙️  Parsing {sum(len(pageType[name]) for name in typeParsers)} pages in {jobs} worker processes...")
+        with ProcessPoolExecutor(max_workers=jobs) as pool, ThreadPoolExecutor(max_workers=len(typeParsers)) as threads:
+            futures = {threads.submit(parseType, pageType[name], partial(parseInPool, pool, jobs)): name
+                       for name, parseType in typeParsers.items()}
+            for future in as_completed(futures):
+                future.result()
+                print(f"✅ {futures[future]}: exported after {time.perf_counter() - t0:.2f}s")
+    print(f"⏱️  {len(pages)} pages parsed and exported in {time.perf_counter() - t0:.2f}s")
+
+if __name__ == "__main__":
+    runProcess(pdf)
@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+"""
+Character → line → word grouping for pdfplumber pages, on NumPy arrays.
+
+The Marine notebook rebuilds words from `page.chars` on every pass over a
+page. Its grouping loops were per-character Python; here a page's chars are
+loaded once into arrays (top, x0, x1, text) and grouped with vectorized
+sorts and `np.diff` gap thresholds:
+
+    lines_words = chars_to_line_words(page.chars)                 # Summary Table
+    words = chars_to_words(page.chars, x_tol=4.0, y_tol=3.0)      # Detail Table
+    lines = group_by_y(words, y_tol=3.0)
+
+  * chars_to_lines / line_to_words – the Summary Table grouping: a line
+        follows a running average of its chars' tops; words split where the
+        gap to the previous char exceeds `gap`, and span min(x0)..max(x1)
+  * chars_to_line_words            – both of the above for a whole page in
+        one pass (one sort and one gap test for every line at once)
+  * chars_to_words / group_by_y    – the Detail Table grouping: a line is
+        every char (or word) within `y_tol` of the line's first top
+
+Results are identical to the notebook's original loops, including the order
+of chars with equal coordinates (all sorts are stable). Line grouping stays
+a scan, since each line depends on where the previous one ended, but it
+steps over runs of equal tops (running average) or whole lines (first-top
+anchor) rather than single chars.
+
+benchmarks/bench_pdfplumber_chars.py times both against the original loops
+per page and checks that the output is the same.
+"""
+from typing import Dict, List, NamedTuple, Sequence
+
+import numpy as np
+
+
+class CharArrays(NamedTuple):
+    top: np.ndarray
+    x0: np.ndarray
+    x1: np.ndarray
+    text: List[str]
+
+
+def char_arrays(chars: Sequence[Dict]) -> CharArrays:
+    """A page's (or line's) chars as coordinate arrays plus their texts."""
+    n = len(chars)
+    return CharArrays(
+        np.fromiter((c["top"] for c in chars), float, n),
+        np.fromiter((c["x0"] for c in chars), float, n),
+        np.fromiter((c["x1"] for c in chars), float, n),
+        [c["text"] for c in chars],
+    )
+
+
+# =============================== LINES ==============================
+def _running_line_starts(tops: np.ndarray, y_tol: float) -> List[int]:
+    """
+    Line starts in tops sorted ascending, where a line's y is the running
+    average `y = (y + top) / 2` of its members and a top farther than
+    `y_tol` from it starts a new line.
+
+    Only the first of a run of equal tops can start a line (the average only
+    moves towards the run's top), so the scan visits runs, not chars; within
+    a run the average is stepped until it stops changing.
+    """
+    if not len(tops):
+        return []
+    run_starts = np.concatenate(([0], np.flatnonzero(np.diff(tops)) + 1))
+    run_lengths = np.diff(np.append(run_starts, len(tops)))
+    starts: List[int] = []
+    y = None
+    for start, length, top in zip(run_starts.tolist(), run_lengths.tolist(), tops[run_starts].tolist()):
+        if y is None or not abs(top - y) <= y_tol:
+            starts.append(start)
+            y = top
+            continue
+        for _ in range(length):
+            nxt = (y + top) / 2
+            if nxt == y:
+                break
+            y = nxt
+    return starts
+
+
+def _anchored_line_starts(tops: np.ndarray, keys: np.ndarray, y_tol: float) -> List[int]:
+    """
+    Line starts in items sorted by (round(top, 1), x0), where a line takes
+    every following item within `y_tol` of its first item's top.
+
+    Items whose rounded top is past `top + y_tol + 0.1` are certainly beyond
+    the tolerance, so each line only tests the window before them.
+    """
+    starts: List[int] = []
+    i, n = 0, len(tops)
+    while i < n:
+        starts.append(i)
+        hi = int(np.searchsorted(keys, tops[i] + y_tol + 0.1, side="right"))
+        far = np.flatnonzero(np.abs(tops[i + 1:hi] - tops[i]) > y_tol)
+        i = i + 1 + int(far[0]) if len(far) else max(hi, i + 1)
+    return starts
+
+
+def _bounds(starts: Sequence[int], n: int) -> List[int]:
+    return list(starts) + [n]
+
+
+def chars_to_lines(chars: Sequence[Dict], y_tol: float = 3) -> List[List[Dict]]:
+    """Chars sorted by (top, x0) and grouped into lines by running-average top."""
+    if not len(chars):
+        return []
+    a = char_arrays(chars)
+    order = np.lexsort((a.x0, a.top))
+    bounds = _bounds(_running_line_starts(a.top[order], y_tol), len(chars))
+    order = order.tolist()
+    return [[chars[i] for i in order[s:e]] for s, e in zip(bounds, bounds[1:])]
+
+
+# =============================== WORDS ==============================
+def _split_words(x0: np.ndarray, x1: np.ndarray, line_breaks: np.ndarray, gap: float) -> np.ndarray:
+    """Word starts in chars sorted by line then x0: a new line, or a gap to the previous char over `gap`."""
+    new_word = np.ones(len(x0), dtype=bool)
+    new_word[1:] = line_breaks[1:] | ~(x0[1:] - x1[:-1] <= gap)
+    return np.flatnonzero(new_word)
+
+
+def _merged_words(a: CharArrays, order: np.ndarray, word_starts: np.ndarray) -> List[Dict]:
+    """{"text", "x0": min x0, "x1": max x1} for each word (the notebook's _merge_chars)."""
+    text = [a.text[i] for i in order.tolist()]
+    bounds = _bounds(word_starts.tolist(), len(text))
+    x0 = np.minimum.reduceat(a.x0[order], word_starts).tolist()
+    x1 = np.maximum.reduceat(a.x1[order], word_starts).tolist()
+    return [{"text": "".join(text[s:e]), "x0": lo, "x1": hi}
+            for s, e, lo, hi in zip(bounds, bounds[1:], x0, x1)]
+
+
+def line_to_words(line_chars: Sequence[Dict], gap: float = 3) -> List[Dict]:
+    """One line's chars, left to right, merged into words where they sit within `gap` of each other."""
+    if not len(line_chars):
+        return []
+    a = char_arrays(line_chars)
+    order = np.argsort(a.x0, kind="stable")
+    no_breaks = np.zeros(len(order), dtype=bool)
+    return _merged_words(a, order, _split_words(a.x0[order], a.x1[order], no_breaks, gap))
+
+
+def chars_to_line_words(chars: Sequence[Dict], y_tol: float = 3, gap: float = 3) -> List[List[Dict]]:
+    """`[line_to_words(ln, gap) for ln in chars_to_lines(chars, y_tol)]` in one pass over the page."""
+    if not len(chars):
+        return []
+    a = char_arrays(chars)
+    by_top = np.lexsort((a.x0, a.top))
+    line_id = np.zeros(len(chars), dtype=np.intp)
+    line_id[_running_line_starts(a.top[by_top], y_tol)[1:]] = 1
+    line_id = np.cumsum(line_id)
+
+    # Within each line, left to right (stable, so equal x0 keep their (top, x0) order)
+    within = np.lexsort((a.x0[by_top], line_id))
+    order, line_id = by_top[within], line_id[within]
+    line_breaks = np.ones(len(order), dtype=bool)
+    line_breaks[1:] = np.diff(line_id) != 0
+    word_starts = _split_words(a.x0[order], a.x1[order], line_breaks, gap)
+    words = _merged_words(a, order, word_starts)
+
+    # Regroup the page's words by line
+    word_line = line_id[word_starts]
+    bounds = _bounds([0] + (np.flatnonzero(np.diff(word_line)) + 1).tolist(), len(words))
+    return [words[s:e] for s, e in zip(bounds, bounds[1:])]
+
+
+def _rounded(tops: np.ndarray) -> np.ndarray:
+    """round(top, 1) for every top, as Python rounds it."""
+    keys = np.round(tops, 1)
+    # np.round scales by 10 in floating point, so at (near) ties it can differ from
+    # Python's correctly rounded round(); those few are rounded by Python
+    tenths = tops * 10
+    near_tie = np.flatnonzero(np.abs(tenths - np.floor(tenths) - 0.5) < 1e-6)
+    for i in near_tie.tolist():
+        keys[i] = round(float(tops[i]), 1)
+    return keys
+
+
+def chars_to_words(chars: Sequence[Dict], x_tol: float, y_tol: float) -> List[Dict]:
+    """
+    Words {"text", "x0", "x1", "top"} of a page, lines top to bottom and each
+    line left to right.
+
+    Chars are sorted by (round(top, 1), x0) and grouped into lines around the
+    first char's top (every word of a line carries that top); a gap over
+    `x_tol` to the previous char starts a new word, which spans its first
+    char's x0 to its last char's x1.
+    """
+    if not len(chars):
+        return []
+    a = char_arrays(chars)
+    keys = _rounded(a.top)
+    by_key = np.lexsort((a.x0, keys))
+    line_starts = _anchored_line_starts(a.top[by_key], keys[by_key], y_tol)
+    line_id = np.zeros(len(chars), dtype=np.intp)
+    line_id[line_starts[1:]] = 1
+    line_id = np.cumsum(line_id)
+    line_top = a.top[by_key][line_starts]
+
+    within = np.lexsort((a.x0[by_key], line_id))
+    order, line_id = by_key[within], line_id[within]
+    line_breaks = np.ones(len(order), dtype=bool)
+    line_breaks[1:] = np.diff(line_id) != 0
+    x0, x1 = a.x0[order], a.x1[order]
+    word_starts = _split_words(x0, x1, line_breaks, x_tol)
+    word_ends = np.append(word_starts[1:], len(order)) - 1
+
+    text = [a.text[i] for i in order.tolist()]
+    bounds = _bounds(word_starts.tolist(), len(text))
+    return [{"text": "".join(text[s:e]), "x0": lo, "x1": hi, "top": top}
+            for s, e, lo, hi, top in zip(bounds, bounds[1:], x0[word_starts].tolist(),
+                                         x1[word_ends].tolist(), line_top[line_id[word_starts]].tolist())]
+
+
+def group_by_y(words: Sequence[Dict], y_tol: float) -> List[Dict]:
+    """Words sorted by (round(top, 1), x0) and grouped as {"y", "tokens"} around each line's first top."""
+    if not len(words):
+        return []
+    a = char_arrays(words)
+    keys = _rounded(a.top)
+    order = np.lexsort((a.x0, keys))
+    tops = a.top[order]
+    bounds = _bounds(_anchored_line_starts(tops, keys[order], y_tol), len(words))
+    order = order.tolist()
+    return [{"y": words[order[s]]["top"], "tokens": [words[i] for i in order[s:e]]}
+            for s, e in zip(bounds, bounds[1:])]
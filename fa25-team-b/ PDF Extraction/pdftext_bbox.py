@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+Word coordinates from `pdftotext -bbox-layout`, for coordinate-aware table parsing.
+
+The layout-text parsers split each table row on whitespace and then guess
+which number belongs to which column. With word boxes the columns can be read
+off the page instead:
+
+    rows = page_rows(pdftext_cache.extract_pages(pdf, "bbox", first=p, last=p)[0])
+    bins = ColumnBins(header_columns(header_rows, label_of))
+    label_words, cells = bins.split_row(row)
+
+  * page_rows     – the page's words grouped into visual rows (top to bottom,
+                    each row left to right); pdftotext's own <line> grouping
+                    is not used, since it splits a table row across blocks
+  * header_columns– stacked or adjacent header words merged into column
+                    labels, with the x-range of each column
+  * ColumnBins    – bin edges halfway between neighbouring columns; each word
+                    goes to its column by binary search on its x-center, so a
+                    row is one O(words · log columns) pass with no padding or
+                    truncation
+
+A word left of the first column is part of the row label (e.g. country and
+installation). Converted pages are cached by pdftext_cache.py in "bbox" mode.
+"""
+import bisect
+import html
+import re
+import statistics
+from typing import Callable, List, NamedTuple, Optional, Sequence, Tuple
+
+# ============================= CONFIGURATION =============================
+ROW_TOLERANCE = 0.5    # words whose vertical centers differ by less than this × word height share a row
+LABEL_GAP = 0.6        # header words closer than this × word height belong to the same label
+
+RE_WORD = re.compile(
+    r'<word xMin="([-\d.]+)" yMin="([-\d.]+)" xMax="([-\d.]+)" yMax="([-\d.]+)">(.*?)</word>', re.S
+)
+
+
+class Word(NamedTuple):
+    x0: float
+    y0: float
+    x1: float
+    y1: float
+    text: str
+
+    @property
+    def xc(self) -> float:
+        return (self.x0 + self.x1) / 2
+
+    @property
+    def yc(self) -> float:
+        return (self.y0 + self.y1) / 2
+
+    @property
+    def height(self) -> float:
+        return self.y1 - self.y0
+
+
+class Row(NamedTuple):
+    y0: float
+    y1: float
+    words: Tuple[Word, ...]   # left to right
+
+    @property
+    def text(self) -> str:
+        """Words joined with single spaces (what the row's markers are tested against)."""
+        return " ".join(w.text for w in self.words)
+
+
+class Column(NamedTuple):
+    label: str
+    x0: float
+    x1: float
+
+    @property
+    def xc(self) -> float:
+        return (self.x0 + self.x1) / 2
+
+
+# =============================== PAGE ==============================
+def page_words(page_xhtml: str) -> List[Word]:
+    """Every <word> of one -bbox-layout page."""
+    return [Word(float(x0), float(y0), float(x1), float(y1), html.unescape(text))
+            for x0, y0, x1, y1, text in RE_WORD.findall(page_xhtml)]
+
+
+def group_rows(words: Sequence[Word]) -> List[Row]:
+    """Group words into visual rows by vertical center, top to bottom."""
+    rows: List[Row] = []
+    current: List[Word] = []
+    row_y = 0.0
+    for w in sorted(words, key=lambda w: w.yc):
+        if current and abs(w.yc - row_y) > ROW_TOLERANCE * max(w.height, current[0].height):
+            rows.append(_row(current))
+            current = []
+        if not current:
+            row_y = w.yc
+        current.append(w)
+    if current:
+        rows.append(_row(current))
+    return rows
+
+
+def _row(words: List[Word]) -> Row:
+    return Row(min(w.y0 for w in words), max(w.y1 for w in words), tuple(sorted(words, key=lambda w: w.x0)))
+
+
+def page_rows(page_xhtml: str) -> List[Row]:
+    return group_rows(page_words(page_xhtml))
+
+
+def line_height(rows: Sequence[Row]) -> float:
+    """Typical row height on a page (median), used to spot blank-line gaps."""
+    return statistics.median(r.y1 - r.y0 for r in rows) if rows else 0.0
+
+
+# =============================== COLUMNS ==============================
+def header_columns(header_rows: Sequence[Row], label_of: Callable[[str], Optional[str]],
+                   min_x: float = float("-inf")) -> List[Column]:
+    """
+    Columns named in the header rows, left to right.
+
+    Words right of `min_x` are merged into labels when they overlap
+    horizontally (stacked labels such as "FY22" over "thru SEP") or sit
+    closer than LABEL_GAP × word height (a label on one line). Each merged
+    label is read top to bottom, left to right, and passed through
+    `label_of`; labels it maps to None are not columns.
+    """
+    words = sorted((w for r in header_rows for w in r.words if w.x0 >= min_x), key=lambda w: w.x0)
+    groups: List[List[Word]] = []
+    right = float("-inf")
+    for w in words:
+        if groups and w.x0 <= right + LABEL_GAP * w.height:
+            groups[-1].append(w)
+            right = max(right, w.x1)
+        else:
+            groups.append([w])
+            right = w.x1
+
+    columns: List[Column] = []
+    for group in groups:
+        text = " ".join(w.text for w in sorted(group, key=lambda w: (round(w.yc), w.x0)))
+        label = label_of(text)
+        if label is not None:
+            columns.append(Column(label, min(w.x0 for w in group), max(w.x1 for w in group)))
+    return columns
+
+
+class ColumnBins:
+    """Assigns words to columns by binary search on x (edges halfway between neighbouring columns)."""
+
+    def __init__(self, columns: Sequence[Column]):
+        self.columns = list(columns)
+        centers = [c.xc for c in self.columns]
+        self.edges = [(a + b) / 2 for a, b in zip(centers, centers[1:])]
+        if self.columns:
+            # Row labels end half a column spacing before the first column's center
+            first = self.columns[0]
+            spacing = centers[1] - centers[0] if len(centers) > 1 else first.x1 - first.x0
+            self.label_edge = first.xc - spacing / 2
+        else:
+            self.label_edge = float("inf")
+
+    def column_of(self, x: float) -> int:
+        return bisect.bisect_right(self.edges, x)
+
+    def split_row(self, row: Row) -> Tuple[List[Word], List[str]]:
+        """(label words left of the first column, text of each column; "" where the row has none)."""
+        label: List[Word] = []
+        cells: List[List[str]] = [[] for _ in self.columns]
+        for w in row.words:
+            if w.xc < self.label_edge:
+                label.append(w)
+            else:
+                cells[self.column_of(w.xc)].append(w.text)
+        return label, ["".join(parts) for parts in cells]
@@ -0,0 +1,266 @@
+#!/usr/bin/env python3
+"""
+Content-addressed page cache for Poppler `pdftotext` output.
+
+Every extractor in this folder converts its PDF with `pdftotext`. This module
+keeps the converted text on disk, one file per page, keyed by the SHA-256 of
+the PDF bytes, the page number and the extraction mode. A page is therefore
+converted exactly once across all scripts, and re-runs are pure cache hits.
+
+Cache layout (default: fa25-team-b/.pdftext_cache, override with the
+PDFTEXT_CACHE_DIR environment variable):
+
+    <cache>/<pdf sha256>/meta.json          {"pages": N}
+    <cache>/<pdf sha256>/<mode>/00001.txt   text of page 1 in that mode
+
+Modes map to pdftotext flags:
+    "layout" → -layout   (what most parsers use)
+    "raw"    → -raw
+    "plain"  → no flag   (pdftotext default reading order)
+    "bbox"   → -bbox-layout (XHTML with word coordinates, one <page> element
+               per cached page; read through pdftext_bbox.py)
+
+Cache misses can be converted in parallel: with workers > 1 the missing pages
+are split into -f/-l page-range shards that run as concurrent pdftotext
+processes, and the pages are reassembled in document order. Set the default
+with PDFTEXT_WORKERS (0 = one worker per CPU core; default 1 = serial).
+"""
+import hashlib
+import json
+import math
+import os
+import re
+import subprocess
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+# ============================= CONFIGURATION =============================
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+CACHE_DIR = Path(os.environ.get("PDFTEXT_CACHE_DIR", PROJECT_ROOT / ".pdftext_cache"))
+
+MODE_FLAGS: Dict[str, List[str]] = {
+    "layout": ["-layout"],
+    "raw": ["-raw"],
+    "plain": [],
+    "bbox": ["-bbox-layout"],
+}
+
+DEFAULT_WORKERS = int(os.environ.get("PDFTEXT_WORKERS", "1"))
+MIN_SHARD_PAGES = 8   # below this, a pdftotext start-up costs more than it saves
+
+# In-process memo so a PDF is hashed once per (path, size, mtime)
+_SHA_MEMO: Dict[Tuple[str, int, int], str] = {}
+
+
+# =============================== HELPERS ==============================
+def pdf_sha256(pdf_path: Path) -> str:
+    """SHA-256 of the PDF bytes (memoized per path/size/mtime)."""
+    pdf_path = Path(pdf_path)
+    st = pdf_path.stat()
+    memo_key = (str(pdf_path.resolve()), st.st_size, st.st_mtime_ns)
+    digest = _SHA_MEMO.get(memo_key)
+    if digest is None:
+        h = hashlib.sha256()
+        with open(pdf_path, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                h.update(chunk)
+        digest = h.hexdigest()
+        _SHA_MEMO[memo_key] = digest
+    return digest
+
+
+def _doc_dir(pdf_path: Path) -> Path:
+    return CACHE_DIR / pdf_sha256(pdf_path)
+
+
+def _page_file(pdf_path: Path, mode: str, page: int) -> Path:
+    return _doc_dir(pdf_path) / mode / f"{page:05d}.txt"
+
+
+def _atomic_write(path: Path, text: str) -> None:
+    """Write via a temp file + rename so concurrent scripts never see half a page."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8", newline="") as f:
+            f.write(text)
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.unlink(tmp)
+        raise
+
+
+def _read_meta(pdf_path: Path) -> dict:
+    meta_path = _doc_dir(pdf_path) / "meta.json"
+    if meta_path.exists():
+        return json.loads(meta_path.read_text(encoding="utf-8"))
+    return {}
+
+
+def _write_meta(pdf_path: Path, **fields) -> None:
+    meta = _read_meta(pdf_path)
+    meta.update(fields)
+    _atomic_write(_doc_dir(pdf_path) / "meta.json", json.dumps(meta))
+
+
+def decode_output(raw: bytes) -> str:
+    """Decode like the scripts did (utf-8, errors ignored, universal newlines)."""
+    return raw.decode("utf-8", errors="ignore").replace("\r\n", "\n").replace("\r", "\n")
+
+
+def split_pages(text: str) -> List[str]:
+    """Split pdftotext output on form feeds; every page is terminated by '\\f'."""
+    pages = text.split("\f")
+    if pages and pages[-1] == "":
+        pages.pop()
+    return pages
+
+
+RE_BBOX_PAGE = re.compile(r"<page\b.*?</page>", re.S)
+
+
+def split_bbox_pages(text: str) -> List[str]:
+    """Split -bbox-layout XHTML into its <page> elements (the document wrapper is dropped)."""
+    return RE_BBOX_PAGE.findall(text)
+
+
+def split_output(text: str, mode: str) -> List[str]:
+    """Pages of one pdftotext output in `mode`."""
+    return split_bbox_pages(text) if mode == "bbox" else split_pages(text)
+
+
+def pdftotext_command(pdf_path: Path, mode: str = "layout",
+                      first: Optional[int] = None, last: Optional[int] = None) -> List[str]:
+    """argv for one pdftotext call writing to stdout."""
+    if mode not in MODE_FLAGS:
+        raise ValueError(f"Unknown pdftotext mode {mode!r}; expected one of {sorted(MODE_FLAGS)}")
+    cmd = ["pdftotext"] + MODE_FLAGS[mode]
+    if first is not None:
+        cmd += ["-f", str(first)]
+    if last is not None:
+        cmd += ["-l", str(last)]
+    return cmd + [str(pdf_path), "-"]
+
+
+def run_pdftotext(pdf_path: Path, mode: str = "layout",
+                  first: Optional[int] = None, last: Optional[int] = None) -> List[str]:
+    """Run pdftotext once (optionally on a -f/-l range) and return its pages."""
+    cmd = pdftotext_command(pdf_path, mode, first, last)
+    try:
+        raw = subprocess.check_output(cmd)
+    except FileNotFoundError:
+        print("🚨 Error: 'pdftotext' command not found. Ensure Poppler is installed and on your PATH.")
+        raise
+    return split_output(decode_output(raw), mode)
+
+
+# =============================== PUBLIC API ==============================
+def page_count(pdf_path: Path) -> int:
+    """Number of pages in the PDF (cached; falls back to `pdfinfo` once)."""
+    pdf_path = Path(pdf_path)
+    meta = _read_meta(pdf_path)
+    if "pages" in meta:
+        return int(meta["pages"])
+    info = subprocess.check_output(["pdfinfo", str(pdf_path)]).decode(errors="ignore")
+    for line in info.splitlines():
+        if line.strip().startswith("Pages:"):
+            n = int(line.split(":")[1])
+            _write_meta(pdf_path, pages=n)
+            return n
+    raise ValueError(f"pdfinfo did not report a page count for {pdf_path}")
+
+
+def _contiguous_runs(pages: List[int]) -> List[Tuple[int, int]]:
+    runs: List[Tuple[int, int]] = []
+    for p in pages:
+        if runs and runs[-1][1] == p - 1:
+            runs[-1] = (runs[-1][0], p)
+        else:
+            runs.append((p, p))
+    return runs
+
+
+def resolve_workers(workers: Optional[int] = None) -> int:
+    """None → PDFTEXT_WORKERS default; 0 or less → one worker per CPU core."""
+    if workers is None:
+        workers = DEFAULT_WORKERS
+    if workers <= 0:
+        workers = os.cpu_count() or 1
+    return workers
+
+
+def shard_runs(runs: List[Tuple[int, int]], workers: int) -> List[Tuple[int, int]]:
+    """Cut contiguous page runs into -f/-l shards of roughly equal size, one per worker."""
+    total = sum(end - start + 1 for start, end in runs)
+    size = max(MIN_SHARD_PAGES, math.ceil(total / max(1, workers)))
+    shards: List[Tuple[int, int]] = []
+    for start, end in runs:
+        for s in range(start, end + 1, size):
+            shards.append((s, min(end, s + size - 1)))
+    return shards
+
+
+def cached_page(pdf_path: Path, mode: str, page: int) -> Optional[str]:
+    """Text of one page if it is already in the cache, else None."""
+    path = _page_file(Path(pdf_path), mode, page)
+    return path.read_text(encoding="utf-8") if path.exists() else None
+
+
+def store_page(pdf_path: Path, mode: str, page: int, text: str) -> None:
+    """Put one converted page into the cache (used by producers that run pdftotext themselves)."""
+    _atomic_write(_page_file(Path(pdf_path), mode, page), text)
+
+
+def _convert_runs(pdf_path: Path, mode: str, runs: List[Tuple[int, int]], workers: int) -> None:
+    """Convert page runs (in parallel when workers > 1) and store each page in the cache."""
+    shards = shard_runs(runs, workers) if workers > 1 else runs
+    if len(shards) <= 1 or workers <= 1:
+        results = [run_pdftotext(pdf_path, mode, s, e) for s, e in shards]
+    else:
+        # Each shard is its own pdftotext process; threads only wait on them
+        with ThreadPoolExecutor(max_workers=min(workers, len(shards))) as pool:
+            results = list(pool.map(lambda se: run_pdftotext(pdf_path, mode, *se), shards))
+    for (start, _end), pages in zip(shards, results):
+        for num, text in enumerate(pages, start=start):
+            _atomic_write(_page_file(pdf_path, mode, num), text)
+
+
+def extract_pages(pdf_path: Path, mode: str = "layout",
+                  first: Optional[int] = None, last: Optional[int] = None,
+                  workers: Optional[int] = None) -> List[str]:
+    """
+    Return the text of pages first..last (1-based, inclusive; default: all pages).
+    Missing pages are converted with one pdftotext call per contiguous gap (or
+    per shard when workers > 1) and stored in the cache; cached pages are read
+    straight from disk.
+    """
+    pdf_path = Path(pdf_path)
+    meta = _read_meta(pdf_path)
+    workers = resolve_workers(workers)
+
+    # Cold cache on a serial whole-document request: one conversion also yields the page count.
+    if "pages" not in meta and first is None and last is None and workers == 1:
+        pages = run_pdftotext(pdf_path, mode)
+        for num, text in enumerate(pages, start=1):
+            _atomic_write(_page_file(pdf_path, mode, num), text)
+        _write_meta(pdf_path, pages=len(pages))
+        return pages
+
+    n = page_count(pdf_path)
+    first = max(1, first or 1)
+    last = min(n, last or n)
+    wanted = range(first, last + 1)
+
+    missing = [p for p in wanted if not _page_file(pdf_path, mode, p).exists()]
+    if missing:
+        _convert_runs(pdf_path, mode, _contiguous_runs(missing), workers)
+
+    return [_page_file(pdf_path, mode, p).read_text(encoding="utf-8") for p in wanted]
+
+
+def extract_text(pdf_path: Path, mode: str = "layout", workers: Optional[int] = None) -> str:
+    """Whole-document text, identical to what `pdftotext <flags> file -` used to return."""
+    return "".join(page + "\f" for page in extract_pages(pdf_path, mode, workers=workers))
@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+"""
+Streaming page producer: overlaps pdftotext conversion with parsing.
+
+Instead of waiting for the whole document text, pages are produced in small
+-f/-l chunks by `asyncio.create_subprocess_exec` and handed to the parser as
+they arrive. The next chunk's pdftotext process is already running while the
+parser works on the current one, and a bounded queue keeps at most `window`
+pages in memory at any time.
+
+Pages already in the shared cache (pdftext_cache.py) are read from disk;
+freshly converted pages are written back to it, so a streamed run also warms
+the cache for the batch scripts.
+
+    for page_no, text in iter_pages(pdf_path):        # plain generator
+        ...
+    for line in iter_lines(iter_pages(pdf_path)):     # same lines as text.split("\\n")
+        ...
+"""
+import asyncio
+import collections
+import queue
+import threading
+from pathlib import Path
+from typing import AsyncIterator, Iterable, Iterator, List, Optional, Tuple
+
+import pdftext_cache
+
+# ============================= CONFIGURATION =============================
+CHUNK_PAGES = 8      # pages per pdftotext process
+WINDOW_PAGES = 32    # max pages buffered between producer and parser
+PREFETCH_CHUNKS = 2  # conversions kept in flight ahead of the parser
+
+
+# =============================== PRODUCER ==============================
+async def _convert_chunk(pdf_path: Path, mode: str, first: int, last: int) -> List[str]:
+    """Return pages first..last, from the cache or from one async pdftotext call."""
+    cached = [pdftext_cache.cached_page(pdf_path, mode, p) for p in range(first, last + 1)]
+    if all(text is not None for text in cached):
+        return cached
+
+    proc = await asyncio.create_subprocess_exec(
+        *pdftext_cache.pdftotext_command(pdf_path, mode, first, last),
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.DEVNULL,
+    )
+    raw, _ = await proc.communicate()
+    if proc.returncode != 0:
+        raise RuntimeError(f"pdftotext failed on pages {first}-{last} of {pdf_path} (exit {proc.returncode})")
+
+    pages = pdftext_cache.split_output(pdftext_cache.decode_output(raw), mode)
+    for num, text in enumerate(pages, start=first):
+        pdftext_cache.store_page(pdf_path, mode, num, text)
+    return pages
+
+
+def _chunks(pages: Iterable[int], chunk_pages: int) -> List[Tuple[int, int]]:
+    """Group ascending page numbers into contiguous -f/-l ranges of at most chunk_pages."""
+    chunks: List[Tuple[int, int]] = []
+    for p in pages:
+        if chunks and chunks[-1][1] == p - 1 and p - chunks[-1][0] < chunk_pages:
+            chunks[-1] = (chunks[-1][0], p)
+        else:
+            chunks.append((p, p))
+    return chunks
+
+
+async def aiter_pages(pdf_path: Path, mode: str = "layout",
+                      first: Optional[int] = None, last: Optional[int] = None,
+                      chunk_pages: int = CHUNK_PAGES,
+                      prefetch: int = PREFETCH_CHUNKS,
+                      pages: Optional[Iterable[int]] = None) -> AsyncIterator[Tuple[int, str]]:
+    """
+    Async generator of (page number, page text) in document order.
+    `pages` restricts the stream to those page numbers (e.g. from page_index).
+    """
+    pdf_path = Path(pdf_path)
+    if pages is None:
+        n = pdftext_cache.page_count(pdf_path)
+        first = max(1, first or 1)
+        last = min(n, last or n)
+        pages = range(first, last + 1)
+    chunks = _chunks(sorted(pages), chunk_pages)
+
+    in_flight: List[Tuple[int, asyncio.Task]] = []
+    next_chunk = 0
+    try:
+        while next_chunk < len(chunks) or in_flight:
+            # Keep `prefetch` conversions running ahead of the consumer
+            while next_chunk < len(chunks) and len(in_flight) < max(1, prefetch):
+                start, end = chunks[next_chunk]
+                in_flight.append((start, asyncio.create_task(_convert_chunk(pdf_path, mode, start, end))))
+                next_chunk += 1
+            start, task = in_flight.pop(0)
+            for num, text in enumerate(await task, start=start):
+                yield num, text
+    finally:
+        for _, task in in_flight:
+            task.cancel()
+
+
+# =============================== SYNC BRIDGE ==============================
+_DONE = object()
+
+
+class _ProducerError:
+    def __init__(self, exc: BaseException):
+        self.exc = exc
+
+
+def iter_pages(pdf_path: Path, mode: str = "layout",
+               first: Optional[int] = None, last: Optional[int] = None,
+               chunk_pages: int = CHUNK_PAGES, window: int = WINDOW_PAGES,
+               prefetch: int = PREFETCH_CHUNKS,
+               pages: Optional[Iterable[int]] = None) -> Iterator[Tuple[int, str]]:
+    """
+    Generator of (page number, page text) for synchronous parsers.
+
+    The asyncio producer runs on a background thread with its own event loop,
+    so pdftotext keeps converting while the caller parses. At most `window`
+    pages wait in the hand-off queue.
+    """
+    handoff: "queue.Queue" = queue.Queue(maxsize=max(1, window))
+    stop = threading.Event()
+
+    def put(item) -> None:
+        while not stop.is_set():
+            try:
+                handoff.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                continue
+
+    async def produce() -> None:
+        try:
+            async for item in aiter_pages(pdf_path, mode, first, last, chunk_pages, prefetch, pages):
+                if stop.is_set():
+                    break
+                # Blocking put runs off-loop so in-flight conversions keep reading their pipes
+                await asyncio.to_thread(put, item)
+        except BaseException as exc:  # surfaced in the consumer thread
+            put(_ProducerError(exc))
+        finally:
+            put(_DONE)
+
+    worker = threading.Thread(target=lambda: asyncio.run(produce()), daemon=True)
+    worker.start()
+    try:
+        while True:
+            item = handoff.get()
+            if item is _DONE:
+                break
+            if isinstance(item, _ProducerError):
+                raise item.exc
+            yield item
+    finally:
+        stop.set()
+        worker.join()
+
+
+def iter_lines(pages: Iterable[Tuple[int, str]]) -> Iterator[str]:
+    """
+    Lines of the streamed document, identical to `full_text.split("\\n")` where
+    full_text joins every page with its trailing form feed. A line that spans a
+    page boundary is carried over to the next page, so nothing is split twice.
+    """
+    carry = ""
+    for _, text in pages:
+        parts = (carry + text + "\f").split("\n")
+        carry = parts.pop()
+        yield from parts
+    yield carry
+
+
+class PeekableLines:
+    """Iterator wrapper with bounded look-ahead, for state machines that peek a few lines ahead."""
+
+    def __init__(self, lines: Iterable[str]):
+        self._it = iter(lines)
+        self._buf: "collections.deque[str]" = collections.deque()
+
+    def _fill(self, n: int) -> None:
+        while len(self._buf) < n:
+            try:
+                self._buf.append(next(self._it))
+            except StopIteration:
+                return
+
+    def peek(self, offset: int = 1) -> Optional[str]:
+        """Line `offset` positions ahead (1 = the next line), or None past the end."""
+        self._fill(offset)
+        return self._buf[offset - 1] if len(self._buf) >= offset else None
+
+    def next(self) -> Optional[str]:
+        """Consume and return the next line, or None at the end."""
+        self._fill(1)
+        return self._buf.popleft() if self._buf else None
+
+    def skip(self, count: int) -> None:
+        for _ in range(count):
+            self.next()
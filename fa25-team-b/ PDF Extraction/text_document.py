@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+"""
+Shared line store for a converted report.
+
+The layout text of a PDF is held once in a TextDocument together with the
+offset of every page. Parsers ask for line views instead of calling
+`text.splitlines()` on their own copy: a LineView only keeps the start/end
+offsets of each line in compact arrays and slices a line out of the shared
+text when it is actually read.
+
+    doc = TextDocument.from_pdf(pdf_path)
+    for line in doc.lines():                      # same lines as text.splitlines()
+        ...
+    section = doc.section([3, 4, 5])              # pages 3-5 only
+    lines = section.lines("\\n")                   # same lines as text.split("\\n")
+
+Views over a page selection behave exactly like splitting the text of those
+pages joined with form feeds (what page_index.section_text returns), without
+building that text. A selection can also be a list of character spans (e.g.
+whole lines picked out by a dispatcher); its views split the concatenation of
+those spans.
+"""
+import re
+from array import array
+from bisect import bisect_right
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union, overload
+
+import pdftext_cache
+
+# Line terminators recognised by str.splitlines()
+RE_SPLITLINES = re.compile(r"\r\n|[\n\r\v\f\x1c\x1d\x1e\x85\u2028\u2029]")
+RE_NEWLINE = re.compile(r"\n")
+LINE_TERMINATORS = "\n\r\v\f\x1c\x1d\x1e\x85\u2028\u2029"
+
+Runs = Tuple[Tuple[int, int], ...]
+
+
+# =============================== LINE VIEW ==============================
+class LineView(Sequence):
+    """Read-only sequence of lines backed by offsets into one shared string."""
+
+    __slots__ = ("_text", "_starts", "_ends", "_joined")
+
+    def __init__(self, text: str, starts: array, ends: array, joined: Optional[Dict[int, str]] = None):
+        self._text = text
+        self._starts = starts
+        self._ends = ends
+        # Lines that straddle two non-adjacent pages are kept as real strings
+        self._joined = joined or {}
+
+    def __len__(self) -> int:
+        return len(self._starts)
+
+    @overload
+    def __getitem__(self, i: int) -> str: ...
+    @overload
+    def __getitem__(self, i: slice) -> "LineView": ...
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            start, stop, step = i.indices(len(self))
+            if step != 1:
+                return [self[k] for k in range(start, stop, step)]
+            joined = {k - start: v for k, v in self._joined.items() if start <= k < stop}
+            return LineView(self._text, self._starts[start:stop], self._ends[start:stop], joined)
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError("line index out of range")
+        if i in self._joined:
+            return self._joined[i]
+        return self._text[self._starts[i]:self._ends[i]]
+
+    def __iter__(self) -> Iterator[str]:
+        text, joined = self._text, self._joined
+        for i, (s, e) in enumerate(zip(self._starts, self._ends)):
+            yield joined[i] if i in joined else text[s:e]
+
+
+def _run_lines(text: str, start: int, end: int, sep: Optional[str]) -> Tuple[List[int], List[int]]:
+    """Line spans of text[start:end], as str.splitlines() (sep=None) or str.split(sep) would cut it."""
+    starts: List[int] = []
+    ends: List[int] = []
+    pos = start
+    if sep is None:
+        for m in RE_SPLITLINES.finditer(text, start, end):
+            starts.append(pos); ends.append(m.start())
+            pos = m.end()
+        if pos < end:  # splitlines drops the empty piece after a final terminator
+            starts.append(pos); ends.append(end)
+    else:
+        pattern = RE_NEWLINE if sep == "\n" else re.compile(re.escape(sep))
+        for m in pattern.finditer(text, start, end):
+            starts.append(pos); ends.append(m.start())
+            pos = m.end()
+        starts.append(pos); ends.append(end)
+    return starts, ends
+
+
+# =============================== DOCUMENT ==============================
+class TextDocument:
+    """The whole-document text of one PDF, with page offsets and cached line views."""
+
+    def __init__(self, text: str):
+        self.text = text
+        # page_starts[p - 1] .. page_starts[p] covers page p including its form feed
+        bounds = [0] + [m.end() for m in re.finditer("\f", text)]
+        if bounds[-1] != len(text):
+            bounds.append(len(text))
+        self.page_starts = array("q", bounds)
+        self._views: Dict[Tuple[Runs, Optional[str]], LineView] = {}
+
+    @classmethod
+    def from_pdf(cls, pdf_path: Path, mode: str = "layout", workers: Optional[int] = None) -> "TextDocument":
+        return cls(pdftext_cache.extract_text(Path(pdf_path), mode=mode, workers=workers))
+
+    @property
+    def page_count(self) -> int:
+        return len(self.page_starts) - 1
+
+    def page(self, page: int) -> str:
+        """Text of one page (1-based), without its form feed."""
+        start, end = self.page_starts[page - 1], self.page_starts[page]
+        if end > start and self.text[end - 1] == "\f":
+            end -= 1
+        return self.text[start:end]
+
+    def pages(self) -> "PageView":
+        """All pages as a lazy sequence (what split_pages(text) would return)."""
+        return PageView(self)
+
+    def page_of_offset(self, offset: int) -> int:
+        """1-based page number containing a character offset."""
+        return bisect_right(self.page_starts, offset)
+
+    def lines(self, sep: Optional[str] = None, pages: Optional[Iterable[int]] = None) -> LineView:
+        """
+        Line view over the whole document or over `pages` (1-based, any order;
+        duplicates ignored). sep=None splits like str.splitlines(), otherwise
+        like str.split(sep).
+        """
+        runs = self.page_runs(pages) if pages is not None else ((0, len(self.text)),)
+        return self.span_lines(runs, sep)
+
+    def span_lines(self, spans: Iterable[Tuple[int, int]], sep: Optional[str] = None) -> LineView:
+        """Line view over the concatenation of character spans (overlaps are merged)."""
+        runs = merge_spans(spans)
+        key = (runs, sep)
+        view = self._views.get(key)
+        if view is None:
+            view = self._build_view(runs, sep)
+            self._views[key] = view
+        return view
+
+    def section(self, pages: Iterable[int]) -> "TextSection":
+        return TextSection(self, pages)
+
+    def span_section(self, spans: Iterable[Tuple[int, int]]) -> "TextSection":
+        return TextSection(self, spans=spans)
+
+    def page_runs(self, pages: Iterable[int]) -> Runs:
+        """Character ranges of the pages (1-based), contiguous pages merged."""
+        return merge_spans((self.page_starts[p - 1], self.page_starts[p]) for p in set(pages))
+
+    def _build_view(self, runs: Runs, sep: Optional[str]) -> LineView:
+        starts, ends = array("q"), array("q")
+        joined: Dict[int, str] = {}
+        text = self.text
+        if not runs and sep is not None:
+            runs = ((0, 0),)  # "".split(sep) is [""]
+        prev_end = None
+        for start, end in runs:
+            if start == end and len(starts):
+                continue  # adds nothing to the joined text
+            run_starts, run_ends = _run_lines(text, start, end, sep)
+            # The joined text continues the previous line unless that run ended on a terminator
+            glue = len(starts) and (sep is not None or text[prev_end - 1] not in LINE_TERMINATORS)
+            if glue and run_starts:
+                last = len(starts) - 1
+                head = joined.pop(last, text[starts[last]:ends[last]])
+                joined[last] = head + text[run_starts[0]:run_ends[0]]
+                run_starts, run_ends = run_starts[1:], run_ends[1:]
+            starts.extend(run_starts)
+            ends.extend(run_ends)
+            prev_end = end
+        return LineView(text, starts, ends, joined)
+
+
+class PageView(Sequence):
+    """Read-only sequence of the document's pages, sliced out on access."""
+
+    __slots__ = ("_doc",)
+
+    def __init__(self, document: TextDocument):
+        self._doc = document
+
+    def __len__(self) -> int:
+        return self._doc.page_count
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[k] for k in range(*i.indices(len(self)))]
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError("page index out of range")
+        return self._doc.page(i + 1)
+
+
+class TextSection:
+    """A page (or character span) selection of a TextDocument, handed to a parser in place of a text string."""
+
+    def __init__(self, document: TextDocument, pages: Iterable[int] = (),
+                 spans: Optional[Iterable[Tuple[int, int]]] = None):
+        self.document = document
+        self.pages = tuple(sorted(set(pages)))
+        self.runs = merge_spans(spans) if spans is not None else document.page_runs(self.pages)
+
+    def lines(self, sep: Optional[str] = None) -> LineView:
+        return self.document.span_lines(self.runs, sep)
+
+    @property
+    def text(self) -> str:
+        """Materialized text of the section (pages joined with form feeds, or the spans concatenated)."""
+        return "".join(self.document.text[s:e] for s, e in self.runs)
+
+
+TextSource = Union[str, TextDocument, TextSection]
+
+
+def merge_spans(spans: Iterable[Tuple[int, int]]) -> Runs:
+    """Sort character spans and merge the ones that overlap or touch."""
+    runs: List[Tuple[int, int]] = []
+    for start, end in sorted(spans):
+        if runs and start <= runs[-1][1]:
+            if end > runs[-1][1]:
+                runs[-1] = (runs[-1][0], end)
+        else:
+            runs.append((start, end))
+    return tuple(runs)
+
+
+def as_lines(source: TextSource, sep: Optional[str] = None) -> Sequence[str]:
+    """Lines of a parser input: views for documents/sections, a plain split for strings."""
+    if isinstance(source, str):
+        return source.splitlines() if sep is None else source.split(sep)
+    return source.lines(sep)
@@ -1,16 +1,27 @@
 """
 Utility script that turns the cleaned CSV into a SQLite database that Datasette
 can serve. Run this after updating the CSV to refresh military_slots.db.
+
+The Financial Statements CSVs written by parseFinancialStatements.py (copied
+into data/financial_statements/) are loaded by load_financial_tables(), which
+can also be run on its own against an existing database.
+
+Money is stored as exact integer cents: every amount column `x` of a CSV
+becomes an INTEGER `x_cents` column (money.cents_column, so "(1,234.50)"
+is -123450 rather than NULL), and each table gets a `<table>_dollars` view
+exposing the amounts in dollars under their original names.
 """
 
 from __future__ import annotations
 
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence
 
 import pandas as pd
 import sqlite_utils
 
+from money import cents_column
+
 BASE_DIR = Path(__file__).parent
 CSV_PATH = BASE_DIR / "data" / "District_Revenue_FY20-FY24_with_lat_lon_clean.csv"
 MARINE_CSV_PATH = BASE_DIR / "data" / "Marine_Revenue_FY20-FY24_detail_with_gps.csv"
@@ -20,7 +31,100 @@ DB_PATH = BASE_DIR / "military_slots.db"
 TABLE_NAME = "slot_machine_revenue"
 MARINE_TABLE = "marine_revenue_detail"
 NAVY_SUMMARY_TABLE = "navy_revenue_summary"
-NAVY_MONTHLY_TABLE = "navy_revenue_monthly_summary"
+NAVY_MONTHLY_TABLE = "navy_monthly_summary"
+FINANCIAL_DIR = BASE_DIR / "data" / "financial_statements"
+CENTS_SUFFIX = "_cents"
+DOLLARS_VIEW_SUFFIX = "_dollars"
+
+
+class FinancialTable(NamedTuple):
+    csv_name: str
+    columns: Dict[str, str]  # CSV column -> table column
+    money: Sequence[str]  # table columns holding dollar amounts, stored as <column>_cents
+    index: Sequence[str]  # columns of the composite lookup index
+
+
+class YtdRollup(NamedTuple):
+    source: str  # financial table the months are derived from
+    keys: Sequence[str]  # columns identifying one line of the report
+    ytd: Dict[str, str]  # year-to-date money column -> monthly money column
+
+
+FINANCIAL_TABLES: Dict[str, FinancialTable] = {
+    "financial_condition": FinancialTable(
+        "FinancialStatement.csv",
+        {"Date": "date", "AssetType": "asset_type", "Balance": "balance", "Category": "category"},
+        money=["balance"],
+        index=["date", "asset_type", "category"],
+    ),
+    "financial_actual_vs_budget": FinancialTable(
+        "ActualVsBudget.csv",
+        {
+            "Date": "date",
+            "Location": "location",
+            "AssetType": "asset_type",
+            "Category": "category",
+            "Month_Actual": "month_actual",
+            "Month_Budget": "month_budget",
+            "Month_Variance": "month_variance",
+            "YTD_Actual": "ytd_actual",
+            "YTD_Budget": "ytd_budget",
+            "YTD_Variance": "ytd_variance",
+        },
+        money=["month_actual", "month_budget", "month_variance", "ytd_actual", "ytd_budget", "ytd_variance"],
+        index=["date", "location", "asset_type", "category"],
+    ),
+    "financial_branch_budget": FinancialTable(
+        "BranchBudget.csv",
+        {
+            "Date": "date",
+            "Location": "location",
+            "AssetType": "asset_type",
+            "Category": "category",
+            "ARMP": "armp",
+            "Army": "army",
+            "Navy": "navy",
+            "USMC": "usmc",
+            "MonthCount": "month_count",
+        },
+        money=["armp", "army", "navy", "usmc"],
+        index=["date", "location", "asset_type", "category"],
+    ),
+    "financial_gaming_revenue": FinancialTable(
+        "GamingRevenue.csv",
+        {
+            "Date": "date",
+            "Base_Location": "base_location",
+            "Europe": "europe",
+            "Korea": "korea",
+            "Japan": "japan",
+            "YTD Europe": "ytd_europe",
+            "YTD Korea": "ytd_korea",
+            "YTD Japan": "ytd_japan",
+        },
+        money=["europe", "korea", "japan", "ytd_europe", "ytd_korea", "ytd_japan"],
+        index=["date", "base_location"],
+    ),
+}
+
+# Monthly tables derived from the year-to-date columns at build time
+YTD_ROLLUPS: Dict[str, YtdRollup] = {
+    "financial_actual_vs_budget_monthly": YtdRollup(
+        "financial_actual_vs_budget",
+        ["location", "asset_type", "category"],
+        {"ytd_actual": "actual", "ytd_budget": "budget", "ytd_variance": "variance"},
+    ),
+    "financial_branch_budget_monthly": YtdRollup(
+        "financial_branch_budget",
+        ["location", "asset_type", "category"],
+        {"armp": "armp", "army": "army", "navy": "navy", "usmc": "usmc"},
+    ),
+    "financial_gaming_revenue_monthly": YtdRollup(
+        "financial_gaming_revenue",
+        ["base_location"],
+        {"ytd_europe": "europe", "ytd_korea": "korea", "ytd_japan": "japan"},
+    ),
+}
 
 MONTH_LOOKUP: Dict[str, int] = {
     "january": 1,
@@ -50,6 +154,110 @@ def month_to_fiscal_year(calendar_year: Optional[int], month_number: Optional[in
     return int(calendar_year) + (1 if month_number >= 10 else 0)
 
 
+def add_cents_columns(df: pd.DataFrame, money: Iterable[str]) -> pd.DataFrame:
+    """Replace each dollar column `x` with an Int64 `x_cents` column in the same position."""
+    for col in money:
+        df.insert(df.columns.get_loc(col), col + CENTS_SUFFIX, cents_column(df[col]))
+        df = df.drop(columns=col)
+    return df
+
+
+def cents_column_types(df: pd.DataFrame) -> Dict[str, type]:
+    return {col: int for col in df.columns if col.endswith(CENTS_SUFFIX)}
+
+
+def create_dollars_view(db: sqlite_utils.Database, table: str) -> str:
+    """(Re)create `<table>_dollars`: the table's columns with each `x_cents` shown as dollars `x`."""
+    select = [
+        f"[{col.name}] / 100.0 AS [{col.name[: -len(CENTS_SUFFIX)]}]"
+        if col.name.endswith(CENTS_SUFFIX)
+        else f"[{col.name}]"
+        for col in db[table].columns
+    ]
+    name = table + DOLLARS_VIEW_SUFFIX
+    db.create_view(name, f"SELECT {', '.join(select)} FROM [{table}]", replace=True)
+    return name
+
+
+def add_fiscal_columns(df: pd.DataFrame) -> pd.DataFrame:
+    """Normalize `date` to ISO text and add fiscal_year / fiscal_month (October = 1)."""
+    dates = pd.to_datetime(df["date"], errors="coerce")
+    df["date"] = dates.dt.strftime("%Y-%m-%d")
+    df["fiscal_year"] = (dates.dt.year + (dates.dt.month >= 10)).astype("Int64")
+    df["fiscal_month"] = ((dates.dt.month - 10) % 12 + 1).astype("Int64")
+    return df
+
+
+def read_financial_table(spec: FinancialTable) -> pd.DataFrame:
+    path = FINANCIAL_DIR / spec.csv_name
+    if not path.exists():
+        raise FileNotFoundError(f"Financial Statements CSV not found at {path}")
+    df = pd.read_csv(path, dtype=str)  # amounts stay text until they are converted to cents
+    df.columns = [c.strip() for c in df.columns]
+    df = df.rename(columns=spec.columns)[list(spec.columns.values())]
+    for col in df.columns:
+        if col == "month_count":
+            df[col] = pd.to_numeric(df[col], errors="coerce").astype("Int64")
+        elif col != "date" and col not in spec.money:
+            df[col] = df[col].astype("string").str.strip()
+    return add_fiscal_columns(add_cents_columns(df, spec.money))
+
+
+def monthly_from_ytd(df: pd.DataFrame, rollup: YtdRollup) -> pd.DataFrame:
+    """
+    One row per report line and month: each year-to-date amount minus the
+    same line's previous report in that fiscal year (October's YTD is its
+    month). `months` is the number of months the amounts cover, more than 1
+    when the previous report is missing. Amounts are integer cents, so the
+    differences are exact.
+    """
+    keys: List[str] = list(rollup.keys)
+    df = df.sort_values(keys + ["date"], kind="stable")
+    groups = df.groupby(keys + ["fiscal_year"], sort=False, dropna=False)
+    previous_month = groups["fiscal_month"].shift()
+    first = previous_month.isna()
+
+    out = df[["date", "fiscal_year", "fiscal_month"] + keys].copy()
+    out["months"] = (df["fiscal_month"] - previous_month.fillna(0)).astype("Int64")
+    for ytd_col, month_col in rollup.ytd.items():
+        ytd = df[ytd_col + CENTS_SUFFIX]
+        out[month_col + CENTS_SUFFIX] = ytd.where(first, ytd - groups[ytd_col + CENTS_SUFFIX].shift())
+    return out.sort_values(["date"] + keys, kind="stable")
+
+
+def write_table(db: sqlite_utils.Database, name: str, df: pd.DataFrame, index: Sequence[str]) -> int:
+    """(Re)create `name` with typed columns from `df` and a composite index on `index`."""
+    if name in db.table_names():
+        db[name].drop()
+    types = {
+        col: int if pd.api.types.is_integer_dtype(dtype) else float if pd.api.types.is_float_dtype(dtype) else str
+        for col, dtype in df.dtypes.items()
+    }
+    db[name].create(types, column_order=list(df.columns))
+    records = df.astype(object).where(pd.notnull(df), None).to_dict(orient="records")
+    db[name].insert_all(records, column_order=list(df.columns), batch_size=500)
+    db[name].create_index(list(index), if_not_exists=True)
+    create_dollars_view(db, name)
+    return len(records)
+
+
+def load_financial_tables(db: sqlite_utils.Database) -> None:
+    """Load the four Financial Statements tables and their monthly-from-YTD rollups."""
+    tables: Dict[str, pd.DataFrame] = {}
+    for name, spec in FINANCIAL_TABLES.items():
+        tables[name] = read_financial_table(spec)
+        rows = write_table(db, name, tables[name], spec.index)
+        print(f"Wrote {rows} {name} records to {DB_PATH}")
+
+    for name, rollup in YTD_ROLLUPS.items():
+        df = tables[rollup.source]
+        if rollup.source == "financial_branch_budget":
+            # Year-to-date pages cover every month since October; the others are single months
+            df = df[df["month_count"] == df["fiscal_month"]]
+        rows = write_table(db, name, monthly_from_ytd(df, rollup), FINANCIAL_TABLES[rollup.source].index)
+        print(f"Wrote {rows} {name} records to {DB_PATH}")
+
+
 def main() -> None:
     if not CSV_PATH.exists():
         raise FileNotFoundError(f"CSV not found at {CSV_PATH}")
@@ -60,12 +268,12 @@ def main() -> None:
     if not NAVY_MONTHLY_CSV_PATH.exists():
         raise FileNotFoundError(f"Navy monthly CSV not found at {NAVY_MONTHLY_CSV_PATH}")
 
-    df = pd.read_csv(CSV_PATH)
+    df = pd.read_csv(CSV_PATH, dtype={"Amount": str})
 
     df["month_name"] = df["Month"].astype(str).str.strip().str.title()
     df["month_number"] = df["month_name"].str.lower().map(MONTH_LOOKUP)
     df["calendar_year"] = pd.to_numeric(df["Year"], errors="coerce").astype("Int64")
-    df["revenue"] = pd.to_numeric(df["Amount"], errors="coerce").astype(float)
+    df["revenue_cents"] = cents_column(df["Amount"])
     df["fiscal_year"] = df.apply(
         lambda row: month_to_fiscal_year(row["calendar_year"], row["month_number"]), axis=1
     ).astype("Int64")
@@ -87,7 +295,7 @@ def main() -> None:
         "fiscal_year",
         "month_name",
         "month_number",
-        "revenue",
+        "revenue_cents",
         "base_latitude",
         "base_longitude",
     ]
@@ -121,7 +329,7 @@ def main() -> None:
         fiscal_year INTEGER,
         month_name TEXT,
         month_number INTEGER,
-        revenue REAL,
+        revenue_cents INTEGER,
         base_latitude REAL,
         base_longitude REAL
     )
@@ -137,9 +345,11 @@ def main() -> None:
     table = db[TABLE_NAME]
     for col in ("branch", "district", "fiscal_year", "installation_name"):
         table.create_index([col], if_not_exists=True)
+    create_dollars_view(db, TABLE_NAME)
 
     # Load Marine Corps detail CSV into its own table.
-    marine_df = pd.read_csv(MARINE_CSV_PATH)
+    money_columns = ["revenue", "nafi_amount", "annual_revenue", "annual_nafi"]
+    marine_df = pd.read_csv(MARINE_CSV_PATH, dtype=str)
     marine_df.columns = [c.strip() for c in marine_df.columns]
     marine_df = marine_df.rename(
         columns={
@@ -157,10 +367,7 @@ def main() -> None:
             "\tLatitude": "base_latitude",
         }
     )
-    marine_df["revenue"] = pd.to_numeric(marine_df["revenue"], errors="coerce")
-    marine_df["nafi_amount"] = pd.to_numeric(marine_df["nafi_amount"], errors="coerce")
-    marine_df["annual_revenue"] = pd.to_numeric(marine_df["annual_revenue"], errors="coerce")
-    marine_df["annual_nafi"] = pd.to_numeric(marine_df["annual_nafi"], errors="coerce")
+    marine_df = add_cents_columns(marine_df, money_columns)
     marine_df["base_latitude"] = pd.to_numeric(marine_df["base_latitude"], errors="coerce")
     marine_df["base_longitude"] = pd.to_numeric(marine_df["base_longitude"], errors="coerce")
     marine_df["loc_id"] = pd.to_numeric(marine_df["loc_id"], errors="coerce").astype("Int64")
@@ -174,10 +381,10 @@ def main() -> None:
         "base_name",
         "location_name",
         "month_label",
-        "revenue",
-        "nafi_amount",
-        "annual_revenue",
-        "annual_nafi",
+        "revenue_cents",
+        "nafi_amount_cents",
+        "annual_revenue_cents",
+        "annual_nafi_cents",
         "base_latitude",
         "base_longitude",
     ]
@@ -185,18 +392,20 @@ def main() -> None:
     db[MARINE_TABLE].insert_all(
         marine_records,
         column_order=marine_columns,
+        columns=cents_column_types(marine_df),
         batch_size=500,
         replace=True,
     )
     marine_table = db[MARINE_TABLE]
     for col in ("BASE_NAME", "LOCATION_NAME", "MONTH_LABEL"):
         marine_table.create_index([col], if_not_exists=True)
+    create_dollars_view(db, MARINE_TABLE)
 
     print(f"Wrote {len(records)} records to {DB_PATH}")
     print(f"Wrote {len(marine_records)} marine detail records to {DB_PATH}")
 
     # Load Navy revenue summary CSV.
-    navy_summary_df = pd.read_csv(NAVY_SUMMARY_CSV_PATH)
+    navy_summary_df = pd.read_csv(NAVY_SUMMARY_CSV_PATH, dtype=str)
     navy_summary_df.columns = [c.strip() for c in navy_summary_df.columns]
     navy_summary_df = navy_summary_df.rename(
         columns={
@@ -219,7 +428,7 @@ def main() -> None:
             "Longitude": "base_longitude",
         }
     )
-    numeric_cols = [
+    fiscal_year_cols = [
         "fy16",
         "fy17",
         "fy18",
@@ -232,28 +441,16 @@ def main() -> None:
         "annualized_fy23",
         "fy24_thru_apr",
         "annualized_fy24",
-        "base_latitude",
-        "base_longitude",
     ]
-    for col in numeric_cols:
+    navy_summary_df = add_cents_columns(navy_summary_df, fiscal_year_cols)
+    for col in ("base_latitude", "base_longitude"):
         navy_summary_df[col] = pd.to_numeric(navy_summary_df[col], errors="coerce")
     navy_summary_df = navy_summary_df.where(pd.notnull(navy_summary_df), None)
     navy_summary_columns = [
         "country",
         "installation",
         "category",
-        "fy16",
-        "fy17",
-        "fy18",
-        "fy19",
-        "fy20",
-        "fy21",
-        "fy22",
-        "fy23",
-        "fy23_thru_sep",
-        "annualized_fy23",
-        "fy24_thru_apr",
-        "annualized_fy24",
+        *(col + CENTS_SUFFIX for col in fiscal_year_cols),
         "base_latitude",
         "base_longitude",
     ]
@@ -261,14 +458,16 @@ def main() -> None:
     db[NAVY_SUMMARY_TABLE].insert_all(
         navy_summary_records,
         column_order=navy_summary_columns,
+        columns=cents_column_types(navy_summary_df),
         batch_size=500,
     )
     navy_summary_table = db[NAVY_SUMMARY_TABLE]
     for col in ("country", "installation", "category"):
         navy_summary_table.create_index([col], if_not_exists=True)
+    create_dollars_view(db, NAVY_SUMMARY_TABLE)
 
     # Load Navy monthly CSV.
-    navy_monthly_df = pd.read_csv(NAVY_MONTHLY_CSV_PATH)
+    navy_monthly_df = pd.read_csv(NAVY_MONTHLY_CSV_PATH, dtype=str)
     navy_monthly_df.columns = [c.strip() for c in navy_monthly_df.columns]
     navy_monthly_df = navy_monthly_df.rename(
         columns={
@@ -283,10 +482,7 @@ def main() -> None:
             "Status": "status",
         }
     )
-    navy_monthly_df["revenue"] = pd.to_numeric(navy_monthly_df["revenue"], errors="coerce")
-    navy_monthly_df["nafi_amount"] = pd.to_numeric(navy_monthly_df["nafi_amount"], errors="coerce")
-    navy_monthly_df["annual_revenue"] = pd.to_numeric(navy_monthly_df["annual_revenue"], errors="coerce")
-    navy_monthly_df["annual_nafi"] = pd.to_numeric(navy_monthly_df["annual_nafi"], errors="coerce")
+    navy_monthly_df = add_cents_columns(navy_monthly_df, money_columns)
     navy_monthly_df["loc_id"] = pd.to_numeric(navy_monthly_df["loc_id"], errors="coerce").astype("Int64")
     navy_monthly_df = navy_monthly_df.where(pd.notnull(navy_monthly_df), None)
     navy_monthly_columns = [
@@ -294,25 +490,29 @@ def main() -> None:
         "loc_id",
         "location_name",
         "month_label",
-        "revenue",
-        "nafi_amount",
-        "annual_revenue",
-        "annual_nafi",
+        "revenue_cents",
+        "nafi_amount_cents",
+        "annual_revenue_cents",
+        "annual_nafi_cents",
         "status",
     ]
     navy_monthly_records = navy_monthly_df[navy_monthly_columns].to_dict(orient="records")
     db[NAVY_MONTHLY_TABLE].insert_all(
         navy_monthly_records,
         column_order=navy_monthly_columns,
+        columns=cents_column_types(navy_monthly_df),
         batch_size=500,
     )
     navy_monthly_table = db[NAVY_MONTHLY_TABLE]
     for col in ("installation", "location_name", "month_label"):
         navy_monthly_table.create_index([col], if_not_exists=True)
+    create_dollars_view(db, NAVY_MONTHLY_TABLE)
 
     print(f"Wrote {len(navy_summary_records)} navy summary records to {DB_PATH}")
     print(f"Wrote {len(navy_monthly_records)} navy monthly records to {DB_PATH}")
 
+    load_financial_tables(db)
+
 
 if __name__ == "__main__":
     main()
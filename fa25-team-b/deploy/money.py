@@ -0,0 +1,55 @@
+"""
+Exact integer-cents money for convert_csv_to_db.py.
+
+The CSVs in data/ hold amounts as dollar text. `to_cents` reads one amount
+and `cents_column` a whole pandas column; military_slots.db stores the
+results in INTEGER `*_cents` columns.
+
+    to_cents("(1,234.50)")   → -123450
+    to_cents("1234.50-")     → -123450
+    to_cents("$1,234.567")   → 123457   (past the cent rounds half away from zero)
+    to_cents("n/a")          → None
+"""
+
+from __future__ import annotations
+
+import re
+from decimal import Decimal
+from functools import lru_cache
+from typing import Iterable, Optional, Union
+
+import pandas as pd
+
+MONEY_DROP = str.maketrans("", "", "$, \t")
+# (open paren, minus, dollars, decimals, trailing minus, close paren)
+RE_MONEY = re.compile(r"(\()?(-)?(\d*)(?:\.(\d*))?(-)?(\))?")
+
+
+@lru_cache(maxsize=65536)
+def to_cents(value) -> Optional[int]:
+    """
+    Money text → exact integer cents: "(1,234.50)", "-1234.5" and "1234.50-"
+    are all -123450, "$" and commas are ignored, decimals past the cent round
+    half away from zero. None for blanks, "-" and anything that isn't an amount.
+    """
+    if value is None or pd.isna(value):
+        return None
+    text = format(Decimal(str(value)), "f") if isinstance(value, float) else str(value)
+    m = RE_MONEY.fullmatch(text.translate(MONEY_DROP))
+    if m is None:
+        return None
+    open_paren, minus, dollars, decimals, trailing_minus, close_paren = m.groups()
+    decimals = decimals or ""
+    if bool(open_paren) != bool(close_paren) or (minus and trailing_minus) or not (dollars or decimals):
+        return None
+    cents = int(dollars or 0) * 100 + int((decimals + "00")[:2]) + (decimals[2:3] >= "5")
+    return -cents if open_paren or minus or trailing_minus else cents
+
+
+def cents_column(values: Union[pd.Series, Iterable[str]]) -> pd.Series:
+    """to_cents over a whole column as nullable int64 (pandas Int64), each distinct value converted once."""
+    col = values if isinstance(values, pd.Series) else pd.Series(list(values), dtype=object)
+    codes, uniques = pd.factorize(col, use_na_sentinel=True)
+    cents = [to_cents(v) for v in uniques]
+    out = [None if code < 0 else cents[code] for code in codes]
+    return pd.Series(pd.array(out, dtype="Int64"), index=col.index, name=col.name)